@@ -1,12 +1,198 @@
+import collections
+import collections.abc
+import heapq
+import itertools
+import sys
+import threading
+import time
 import typing
 
 from enum import Flag, auto
 
+import numpy as np
+
 from spdm.utils.uri_utils import URITuple, uri_split
 from spdm.utils.tags import _not_found_
 
 from spdm.core.pluggable import Pluggable
-from spdm.core.entry import Entry as EntryBase
+from spdm.core.path import Path, as_path
+from copy import deepcopy
+from spdm.core.query import Query
+from spdm.core.entry import Entry as EntryBase, _key_index, _merge_key_index, _projection_args, _projections
+
+
+def _nbytes(value) -> int:
+    """估计 value 占用的字节数，ndarray 按 nbytes 计算"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    elif isinstance(value, collections.abc.Mapping):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value.values())
+    elif isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value)
+    else:
+        return sys.getsizeof(value)
+
+
+class ReadCache:
+    """Document 的读缓存（read-through），由文档的所有 entry 共享。
+    以绝对路径（只含 str/int）为 key 保存 Document.read 的结果，与 entry 的缓存（写入、load）分开保存。
+
+    - policy: 超出容量时的淘汰策略，"lru"（最近最少使用）或 "lfu"（最不经常使用）
+    - max_bytes: 容量（字节数，ndarray 按 nbytes 计算），None 时不限
+    - ttl: 有效期（秒），过期后重新读取，用于实时（live）数据源；None 时不过期
+    - pin(path)/unpin(path): 固定 path 下的数据，不被淘汰
+    - hits/misses/evictions/nbytes: 命中、未命中、淘汰次数与当前字节数，见 stats()
+
+    按前缀索引缓存的 key（_below），put/invalidate/pop 只访问与 key 重叠的项，与缓存项总数无关；
+    lru 按 OrderedDict 的顺序淘汰，lfu 用堆（使用次数, 最近使用序号）淘汰，次数相同时先淘汰较久未用的，
+    堆中过期的项惰性删除。
+    """
+
+    def __init__(self, policy: str = "lru", max_bytes: int = None, ttl: float = None):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown cache policy {policy}!")
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._items: collections.OrderedDict = collections.OrderedDict()  # {key: [value, nbytes, count, time, seq]}
+        self._below: typing.Dict[tuple, typing.Set[tuple]] = {}  # {prefix: 以 prefix 为真前缀的 key}
+        self._heap: typing.List[tuple] = []  # lfu: [(count, seq, key)]
+        self._seq = itertools.count()
+        self._pinned: typing.Set[tuple] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> typing.Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "nbytes": self.nbytes,
+            "items": len(self._items),
+        }
+
+    def get(self, key: tuple) -> typing.Any:
+        """返回 key 处的数据，key 的某个前缀已缓存时从中取出。未命中返回 _not_found_"""
+        with self._lock:
+            for idx in range(len(key), -1, -1):
+                item = self._items.get(key[:idx], None)
+                if item is None:
+                    continue
+                if self.ttl is not None and time.monotonic() - item[3] > self.ttl:
+                    self._remove(key[:idx])
+                    break
+                value = Path(list(key[idx:])).get(item[0], _not_found_) if idx < len(key) else item[0]
+                if value is _not_found_:
+                    break
+                item[2] += 1
+                self._items.move_to_end(key[:idx])
+                if self.policy == "lfu":
+                    self._push(key[:idx], item)
+                self.hits += 1
+                return value
+            self.misses += 1
+            return _not_found_
+
+    def put(self, key: tuple, value: typing.Any) -> None:
+        with self._lock:
+            for k in self._overlap(key, prefixes=False):  # key 及被 key 覆盖的子路径
+                self._remove(k)
+            nbytes = _nbytes(value)
+            item = [value, nbytes, 1, time.monotonic(), None]
+            self._items[key] = item
+            for idx in range(len(key)):
+                self._below.setdefault(key[:idx], set()).add(key)
+            if self.policy == "lfu":
+                self._push(key, item)
+            self.nbytes += nbytes
+            self._evict()
+
+    def invalidate(self, key: tuple = ()) -> None:
+        """删除与 key 重叠（前缀或子路径）的缓存，key 为 () 时清空"""
+        with self._lock:
+            for k in self._overlap(key):
+                self._remove(k)
+
+    def pop(self, key: tuple) -> typing.Tuple[tuple, typing.Any]:
+        """删除与 key 重叠的缓存，返回覆盖 key 的最近前缀及其数据，不存在时为 ((), _not_found_)"""
+        with self._lock:
+            prefix, value = (), _not_found_
+            for idx in range(len(key), -1, -1):
+                item = self._items.get(key[:idx], None)
+                if item is not None:
+                    prefix, value = key[:idx], item[0]
+                    break
+            for k in self._overlap(key):
+                self._remove(k)
+            return prefix, value
+
+    def pin(self, path) -> None:
+        self._pinned.add(Path._static_prefix(as_path(path)))
+
+    def unpin(self, path) -> None:
+        self._pinned.discard(Path._static_prefix(as_path(path)))
+        with self._lock:
+            self._evict()
+
+    def _is_pinned(self, key: tuple) -> bool:
+        return any(key[: len(p)] == p or p[: len(key)] == key for p in self._pinned)
+
+    def _overlap(self, key: tuple, prefixes: bool = True) -> typing.List[tuple]:
+        """已缓存的 key 的前缀（prefixes 为 True 时）、key 本身及以 key 为前缀的子路径"""
+        res = [key[:idx] for idx in range(0 if prefixes else len(key), len(key) + 1) if key[:idx] in self._items]
+        res.extend(self._below.get(key, ()))
+        return res
+
+    def _push(self, key: tuple, item: list) -> None:
+        item[4] = next(self._seq)
+        heapq.heappush(self._heap, (item[2], item[4], key))
+        if len(self._heap) > 2 * len(self._items) + 64:  # 清理过期的堆项
+            self._heap = [(v[2], v[4], k) for k, v in self._items.items()]
+            heapq.heapify(self._heap)
+
+    def _remove(self, key: tuple) -> None:
+        item = self._items.pop(key)
+        self.nbytes -= item[1]
+        for idx in range(len(key)):
+            below = self._below[key[:idx]]
+            below.discard(key)
+            if len(below) == 0:
+                del self._below[key[:idx]]
+
+    def _evict(self) -> None:
+        if self.max_bytes is None or self.nbytes <= self.max_bytes:
+            return
+        if self.policy == "lru":
+            for _ in range(len(self._items)):
+                if self.nbytes <= self.max_bytes:
+                    break
+                k = next(iter(self._items))
+                if self._is_pinned(k):  # 固定的项移到末尾，不被淘汰
+                    self._items.move_to_end(k)
+                    continue
+                self._remove(k)
+                self.evictions += 1
+            return
+
+        skipped = []
+        while self.nbytes > self.max_bytes and len(self._heap) > 0:
+            count, seq, k = entry = heapq.heappop(self._heap)
+            item = self._items.get(k, None)
+            if item is None or item[4] != seq:  # 过期的堆项
+                continue
+            if self._is_pinned(k):
+                skipped.append(entry)
+                continue
+            self._remove(k)
+            self.evictions += 1
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
 
 
 class Document(Pluggable, plugin_prefix="spdm/plugins/data/"):
@@ -14,6 +200,10 @@ class Document(Pluggable, plugin_prefix="spdm/plugins/data/"):
 
     _plugin_registry = {}
 
+    _partial_write = False  # 是否支持按路径写入 write(path, value) 与删除 delete(path)，见 Entry.flush
+
+    _revision = 0  # 文档的版本，经 entry 修改或重新载入时增加，见 Entry.revision
+
     class Mode(Flag):
         """
         r       Readonly, file must exist (default)
@@ -46,12 +236,14 @@ class Document(Pluggable, plugin_prefix="spdm/plugins/data/"):
     }
 
     class Entry(EntryBase):
+        __slots__ = ("_doc", "_dirty")
 
         def __init__(self, doc, *args, **kwargs):
             super().__init__(_not_found_, *args, **kwargs)
             if doc is not _not_found_ and not isinstance(doc, Document):
                 raise TypeError(f"doc must be an instance of Document, not {type(doc)}")
             self._doc = doc
+            self._dirty: typing.Set[tuple] = set()  # 自上次 flush 以来修改过的路径，与 child() 派生的 entry 共享
 
         def __str__(self):
             return f"{self._doc.uri}#{self._path}"
@@ -59,22 +251,130 @@ class Document(Pluggable, plugin_prefix="spdm/plugins/data/"):
         def __copy__(self) -> typing.Self:
             other = super().__copy__()
             other._doc = self._doc
+            other._dirty = self._dirty
             return other
 
+        def _touch(self) -> None:
+            self._dirty.add(Path._static_prefix(self._path))
+            self._bump()
+
+        def _bump(self) -> None:
+            if self._doc is not _not_found_:
+                self._doc._revision += 1
+
+        @property
+        def revision(self) -> typing.Hashable:
+            return self._doc._revision if self._doc is not _not_found_ else None
+
+        def key_index(self) -> tuple | int:
+            """合并缓存与文档中的子节点索引，文档的索引由 Document.key_index 一次读取"""
+            res = _not_found_
+            if self._cache is not _not_found_:
+                res = _key_index(self._path.get(self._cache, _not_found_))
+            if self._doc is not _not_found_:
+                res = _merge_key_index(res, self._doc.key_index(self._path))
+            return res
+
+        def _lock_root(self) -> typing.Any:
+            return self._doc
+
+        def _cache_key(self, path: Path, *args, **kwargs) -> tuple | None:
+            """读缓存的 key，路径只含 str/int 且没有投影参数时可缓存"""
+            if len(args) + len(kwargs) > 0 or self._doc is _not_found_:
+                return None
+            key = Path._static_prefix(path)
+            return key if len(key) == len(path) else None
+
         def find(self, *args, default_value=_not_found_, **kwargs) -> typing.Any:
             res = _not_found_
             if self._cache is not _not_found_:
                 res = super().find(*args, default_value=_not_found_, **kwargs)
 
+            if res is _not_found_ and len(args) > 0 and args[0] in Document._aggregations:
+                res = self._doc.aggregate(self._path, *args, default_value=default_value, **kwargs)
+            elif res is _not_found_:
+                key = self._cache_key(self._path, *args, **kwargs)
+                if key is not None:
+                    res = self._doc.cache.get(key)
+                if res is _not_found_:
+                    res = self._doc.read(self._path, *args, default_value=_not_found_, **kwargs)
+                    if key is not None and res is not _not_found_:
+                        self._doc.cache.put(key, res)
+
+            return res if res is not _not_found_ else default_value
+
+        def find_many(
+            self, paths, *args, projection=None, default_value=_not_found_, **kwargs
+        ) -> typing.List[typing.Any]:
+            paths = [self._path.extend(as_path(p)) for p in paths]
+            projection = _projections(projection, len(paths))
+            batch = [q for q in projection if q is not None]
+
+            if self._cache is _not_found_:
+                res = [_not_found_] * len(paths)
+            elif len(batch) == 0:
+                res = Path.find_many(self._cache, paths, *args, default_value=_not_found_, **kwargs)
+            else:
+                res = [
+                    p.find(self._cache, *_projection_args(q), *args, default_value=_not_found_, **kwargs)
+                    for p, q in zip(paths, projection)
+                ]
+
+            keys = [self._cache_key(p, *_projection_args(q), *args, **kwargs) for p, q in zip(paths, projection)]
+
+            for idx, key in enumerate(keys):
+                if res[idx] is _not_found_ and key is not None:
+                    res[idx] = self._doc.cache.get(key)
+
+            missing = [idx for idx, v in enumerate(res) if v is _not_found_]
+
+            if len(missing) > 0:
+                values = self._doc.read_many(
+                    [paths[idx] for idx in missing],
+                    *args,
+                    projection=[projection[idx] for idx in missing] if len(batch) > 0 else None,
+                    default_value=_not_found_,
+                    **kwargs,
+                )
+                for idx, value in zip(missing, values):
+                    if value is _not_found_:
+                        res[idx] = default_value
+                        continue
+                    res[idx] = value
+                    if keys[idx] is not None:
+                        self._doc.cache.put(keys[idx], value)
+
+            return res
+
+        def gather(self, path=None, *args, default_value=_not_found_, **kwargs) -> typing.Any:
+            path = self._path.extend(as_path(path))
+
+            res = _not_found_
+            if self._cache is not _not_found_:
+                res = path.gather(self._cache, *args, default_value=_not_found_, **kwargs)
+
             if res is _not_found_:
-                res = self._doc.read(self._path, *args, default_value=default_value, **kwargs)
-                if len(args) + len(kwargs) == 0:
-                    self._cache = self._path.update(self._cache, res)
+                res = self._doc.gather(path, *args, default_value=default_value, **kwargs)
 
             return res
 
+        def _own(self) -> None:
+            """写入前，将读缓存中覆盖本路径的数据移入 entry 的缓存，使写入与已读出的数据合并"""
+            if self._doc is _not_found_:
+                return
+            prefix, value = self._doc.cache.pop(Path._static_prefix(self._path))
+            if value is not _not_found_ and Path(list(prefix)).get(self._cache, _not_found_) is _not_found_:
+                self._cache = Path(list(prefix)).update(self._cache, deepcopy(value))
+
         def update(self, *args, **kwargs) -> None:
-            return super().update(*args, **kwargs)
+            self._own()
+            super().update(*args, **kwargs)
+            self._touch()
+
+        def delete(self, *args, **kwargs) -> None:
+            self._own()
+            super().delete(*args, **kwargs)
+            self._touch()
 
         def read(self, *args, **kwargs) -> typing.Any:
             return self.find(*args, **kwargs)
@@ -84,27 +384,61 @@ class Document(Pluggable, plugin_prefix="spdm/plugins/data/"):
             self.flush()
 
         def flush(self):
-            """将缓存内的数据写入持久存储（文件）"""
-            self._doc.write(self._path, self._cache)
+            """将缓存内修改过的数据写入持久存储（文件）。
+            文档支持按路径写入（_partial_write）时，只写入本 entry 路径下自上次 flush 以来修改过的子树（delta），
+            被父路径覆盖的子路径不重复写入，已删除的路径交由 doc.delete 删除；
+            否则有修改时将整个缓存交由 doc.write 写入。
+            """
+            prefix = Path._static_prefix(self._path)
+            paths = sorted((p for p in self._dirty if p[: len(prefix)] == prefix), key=len)
+            self._dirty.difference_update(paths)
+
+            if len(paths) == 0:
+                return
+            elif not self._doc._partial_write:
+                self._doc.write(self._cache)
+                return
+
+            written = set()
+            for path in paths:
+                if any(path[:idx] in written for idx in range(len(path) + 1)):
+                    continue
+                written.add(path)
+                value = Path(list(path)).get(self._cache, _not_found_)
+                if value is _not_found_:
+                    self._doc.delete(Path(list(path)))
+                else:
+                    self._doc.write(Path(list(path)), value)
             # self._cache = _not_found_
 
         def load(self):
             """将持久存储（文件）导入缓存"""
             self._cache = self._path.update(self._cache, self._doc.read(self._path))
+            self._doc.cache.invalidate(Path._static_prefix(self._path))
+            self._bump()
 
-    def __init__(self, uri, mode: typing.Any = Mode.read, **kwargs):
+    def __init__(self, uri, mode: typing.Any = Mode.read, cache: ReadCache | dict = None, **kwargs):
         """
         r       Readonly, file must exist (default)
         rw      Read/write, file must exist
         w       Create file, truncate if exists
         x       Create file, fail if exists
         a       Read/write if exists, create otherwise
+
+        cache: 读缓存策略，ReadCache 或其参数，例如 {"policy": "lfu", "max_bytes": 2**30, "ttl": 10}；
+               默认不限容量
         """
 
         self._uri = uri_split(uri)
         self._mode = Document.INV_MOD_MAP[mode] if isinstance(mode, str) else mode
+        self._cache = cache if isinstance(cache, ReadCache) else ReadCache(**(cache or {}))
         self._metadata = kwargs
 
+    @property
+    def cache(self) -> ReadCache:
+        """读缓存，见 ReadCache"""
+        return self._cache
+
     def __str__(self):
         return f"<{self.__class__.__name__}  {self._uri} >"
 
@@ -175,5 +509,39 @@ class Document(Pluggable, plugin_prefix="spdm/plugins/data/"):
         "读取"
         return NotImplemented
 
+    _aggregations = (Query.tags.reduce, Query.tags.sort, Query.tags.count)
+
+    def aggregate(self, path: Path, projection: Query.tags, *args, **kwargs) -> typing.Any:
+        """在 path 处执行聚合/排序（Query.tags.reduce, sort, count）。
+        默认读取数据后在内存中计算，插件可重载以在后端完成计算，避免读入全部数据"""
+        return Path._project(self.read(path), projection, *args, **kwargs)
+
+    def gather(self, path: Path, *args, **kwargs) -> typing.Any:
+        """收集通配路径匹配的值并堆叠为 ndarray。
+        默认读取第一个通配符之前的数据后在内存中收集，插件可重载以批量读取匹配的数据"""
+        pos = Path._wildcard(path)
+        if pos is None:
+            pos = len(path)
+        return Path(path[pos:]).gather(self.read(Path(path[:pos])), *args, **kwargs)
+
+    def key_index(self, path: Path) -> tuple | int:
+        """path 处的子节点索引（key 的元组或元素个数，见 Entry.key_index）。
+        默认读取数据后计算，插件可重载以直接列出子节点，不读取数据"""
+        try:
+            return _key_index(self.read(path))
+        except KeyError:
+            return _not_found_
+
+    def read_many(self, paths: typing.List[Path], *args, projection=None, **kwargs) -> typing.List[typing.Any]:
+        """批量读取，按请求顺序返回。默认逐个调用 read，插件可重载以一次完成整批读取
+        projection: 与 paths 等长的 list，作为对应 read 的第一个参数（None 时省略），见 Entry.find_many
+        """
+        projection = _projections(projection, len(paths))
+        return [self.read(p, *_projection_args(q), *args, **kwargs) for p, q in zip(paths, projection)]
+
     def write(self, *args, **kwargs) -> None:
         "写入"
+
+    def delete(self, path: Path) -> None:
+        "删除 path 处的数据，_partial_write 为 True 的插件需实现"
+        raise NotImplementedError(f"{self.__class__.__name__} does not support deleting {path}!")
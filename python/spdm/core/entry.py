@@ -1,16 +1,69 @@
 """ Entry class to manage data."""
 
+import asyncio
+import collections.abc
 import pathlib
 import typing
+import weakref
 from copy import copy
 
 from functools import singledispatch
 
 from spdm.utils.tags import _not_found_, _undefined_
 from spdm.utils.uri_utils import URITuple, uri_split
-from spdm.core.path import Path, as_path, Query
+from spdm.core.path import Path, PathLike, FrozenPath, as_path, Query
 
 from spdm.utils.logger import logger
+from spdm.utils.rwlock import lock_table
+
+_root_path = FrozenPath()  # 根路径，不可变，所有 Entry 共享
+
+
+def _key_index(value) -> tuple | int:
+    """子节点索引：mapping 返回 key 的元组，sequence 返回元素个数，其他返回 _not_found_"""
+    if isinstance(value, collections.abc.Mapping):
+        return tuple(value.keys())
+    elif isinstance(value, collections.abc.Sequence) and not isinstance(value, str):
+        return len(value)
+    else:
+        return _not_found_
+
+
+def _projections(projection, num: int) -> list:
+    """将 find_many 的 projection 展开为与 paths 等长的 list"""
+    return list(projection) if isinstance(projection, list) else [projection] * num
+
+
+def _projection_args(projection) -> tuple:
+    return () if projection is None else (projection,)
+
+
+def _merge_key_index(first, second) -> tuple | int:
+    """合并两个子节点索引：key 按出现顺序取并集，元素个数取最大值"""
+    if first is _not_found_:
+        return second
+    elif isinstance(first, tuple) and isinstance(second, tuple):
+        return first + tuple(k for k in second if k not in first)
+    elif isinstance(first, int) and isinstance(second, int):
+        return max(first, second)
+    else:
+        return first
+
+
+class _Version:
+    """数据的修改计数，按根对象（见 Entry._new_root）共享：包装同一数据的 entry 使用同一个计数。
+    计数只被 entry 引用，entry 同时引用根对象，计数存活期间根对象的 id 不会被复用"""
+
+    __slots__ = ("value", "__weakref__")
+
+    _table: weakref.WeakValueDictionary = weakref.WeakValueDictionary()  # {id(root): _Version}
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    @staticmethod
+    def of(root) -> "_Version":
+        return _Version._table.setdefault(id(root), _Version())
 
 
 class Entry:  # pylint: disable=R0904
@@ -45,22 +98,66 @@ class Entry:  # pylint: disable=R0904
 
     """
 
+    __slots__ = ("_cache", "_path", "_root", "_version")
+
     def __init__(self, *args, _plugin_name=None):
         self._cache = _not_found_ if len(args) == 0 else args[0]
-        self._path: Path = as_path(*args[1:])
+        self._path: FrozenPath = as_path(*args[1:]).freeze() if len(args) > 1 else _root_path
+        self._root = Entry._new_root(self._cache)
+        self._version = _Version.of(self._root)
+
+    @staticmethod
+    def _new_root(cache) -> typing.Any:
+        """加锁的根对象：创建时的缓存，包装同一缓存的 entry 共享同一组锁；
+        没有缓存时为新的 object()，不与其他没有缓存的 entry 共享"""
+        return cache if cache is not _not_found_ and cache is not None else object()
 
     def __copy__(self) -> typing.Self:
         other = object.__new__(self.__class__)
         other._cache = self._cache
-        other._path = copy(self._path)
+        other._path = self._path
+        other._root = self._root
+        other._version = self._version
         return other
 
+    def __getstate__(self) -> dict:
+        state = dict(getattr(self, "__dict__", {}))
+        for cls in self.__class__.__mro__:
+            for k in cls.__dict__.get("__slots__", ()):
+                if k not in ("_root", "_version") and hasattr(self, k):
+                    state[k] = getattr(self, k)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for k, v in state.items():
+            setattr(self, k, v)
+        self._root = Entry._new_root(getattr(self, "_cache", _not_found_))
+        self._version = _Version.of(self._root)
+
     def __str__(self) -> str:
         return f'<{self.__class__.__name__} path="{self._path}" />'
 
     def __repr__(self) -> str:
         return str(self._path)
 
+    def _lock_keys(self) -> list:
+        root = id(self._lock_root())
+        prefix = Path._static_prefix(self._path)
+        return [(root, prefix[:idx]) for idx in range(len(prefix) + 1)]
+
+    def _lock_root(self) -> typing.Any:
+        """加锁时的根对象，共享同一根对象的 entry 使用同一组锁。
+        创建时确定，由 child()/copy 派生的 entry 共享，缓存重新赋值（例如 update 创建容器）后不变"""
+        return self._root
+
+    def reading(self):
+        """读锁（共享），锁住 entry 所指的子树，与 HTreeNode.reading 相同（见 spdm.utils.rwlock）"""
+        return lock_table.locking(self._lock_keys(), exclusive=False)
+
+    def writing(self):
+        """写锁（独占），锁住 entry 所指的子树"""
+        return lock_table.locking(self._lock_keys(), exclusive=True)
+
     @property
     def path(self) -> Path:
         return self._path
@@ -72,7 +169,7 @@ class Entry:  # pylint: disable=R0904
     @property
     def root(self) -> typing.Self:
         other = copy(self)
-        other._path = []  # pylint: disable=W0212
+        other._path = _root_path  # pylint: disable=W0212
         return other
 
     @property
@@ -94,7 +191,7 @@ class Entry:  # pylint: disable=R0904
             self._cache = []
 
         other = copy(self)
-        other._path.append(path)  # pylint: disable=W0212
+        other._path = self._path.extend(path)  # pylint: disable=W0212
         return other
 
     ###########################################################
@@ -107,15 +204,54 @@ class Entry:  # pylint: disable=R0904
     def update(self, *args, **kwargs):
         """更新 entry 所指定位置的数据。 TODO: 返回修改处的entry"""
         self._cache = self._path.update(self._cache, *args, **kwargs)
+        self._version.value += 1
 
     def delete(self, *args, **kwargs):
         """删除 entry 所指定位置的数据"""
-        self._path.delete(self._cache, *args, **kwargs)
+        res = self._path.delete(self._cache, *args, **kwargs)
+        self._version.value += 1
+        return res
 
     def find(self, *p_args, **p_kwargs) -> typing.Any:
         """返回 entry 所指定位置的数据"""
         return self._path.find(self._cache, *p_args, **p_kwargs)
 
+    def find_many(
+        self, paths: typing.Iterable[PathLike], *p_args, projection=None, **p_kwargs
+    ) -> typing.List[typing.Any]:
+        """批量返回 entry 所指定位置下多个路径的数据，按请求顺序返回。
+        projection: 作用于每个结果的 projection（find 的第一个参数），与 paths 等长的 list 时逐个对应
+        backend 可以重载此函数，一次完成整批读取（默认逐个路径调用 find）。
+        """
+        paths = list(paths)
+        projection = _projections(projection, len(paths))
+        if all(q is None for q in projection):
+            return Path.find_many(self._cache, [self._path.extend(as_path(p)) for p in paths], *p_args, **p_kwargs)
+        return [
+            self.child(p).find(*_projection_args(q), *p_args, **p_kwargs)
+            for p, q in zip(paths, projection)
+        ]
+
+    def gather(self, path: PathLike = None, *p_args, **p_kwargs) -> typing.Any:
+        """收集 entry 所指定位置下通配路径（例如 "time_slice/*/global_quantities/ip"）匹配的值，
+        堆叠为一个 ndarray。backend 可以重载此函数，批量读取匹配的数据。
+        """
+        return self._path.extend(as_path(path)).gather(self._cache, *p_args, **p_kwargs)
+
+    def key_index(self) -> tuple | int:
+        """子节点索引，一次返回：mapping 返回 key 的元组，sequence 返回元素个数，不存在时返回 _not_found_。
+        backend 可以重载此函数，直接列出子节点（例如 HDF5 group、XML 节点），不读取数据。
+        """
+        return _key_index(self.find())
+
+    @property
+    def revision(self) -> typing.Hashable:
+        """数据的版本，数据改变（修改、重新载入）时随之改变。HTreeNode 按版本缓存 key_index，EntryChain 按版本缓存查找结果。
+        内存中的数据为经本 entry 及 child()/copy 派生的 entry 修改（update/insert/delete）的次数；
+        不经 entry 直接修改数据时版本不变。返回 None 表示不缓存。
+        """
+        return self._version.value
+
     def search(self, *p_args, **p_kwargs) -> typing.Generator[typing.Self, None, None]:
         """搜索 entry 所指定位置处符合条件的节点
 
@@ -132,6 +268,27 @@ class Entry:  # pylint: disable=R0904
         """
         yield from self._path.search(self._cache, *p_args, **p_kwargs)
 
+    # -----------------------------------------------------------
+    # 异步 API：默认在线程池（asyncio.to_thread）中调用同步的 find/find_many/search，
+    # 同步的 backend 无需修改即可并发读取；异步的 backend 可以直接重载。
+
+    async def afind(self, *args, **kwargs) -> typing.Any:
+        """find 的异步版本"""
+        return await asyncio.to_thread(self.find, *args, **kwargs)
+
+    async def afind_many(self, paths: typing.Iterable[PathLike], *args, **kwargs) -> typing.List[typing.Any]:
+        """find_many 的异步版本"""
+        return await asyncio.to_thread(self.find_many, list(paths), *args, **kwargs)
+
+    async def asearch(self, *args, **kwargs) -> typing.AsyncGenerator[typing.Any, None]:
+        """search 的异步版本，逐个在线程池中取出结果"""
+        it = self.search(*args, **kwargs)
+        while True:
+            res = await asyncio.to_thread(next, it, _undefined_)
+            if res is _undefined_:
+                break
+            yield res
+
     # -----------------------------------------------------------
     # alias
     @typing.final
@@ -141,11 +298,11 @@ class Entry:  # pylint: disable=R0904
 
     @typing.final
     def keys(self) -> typing.Generator[str, None, None]:
-        yield from self.search(None, Query.tags.get_key)  # type:ignore
+        yield from self.search(Query.tags.get_key)  # type:ignore
 
     @typing.final
     def values(self) -> typing.Generator[typing.Any, None, None]:
-        yield from self.search(None, Query.tags.get_value)  # type:ignore
+        yield from self.search(Query.tags.get_value)  # type:ignore
 
     @typing.final
     def for_each(self) -> typing.Generator[typing.Self, None, None]:
@@ -218,6 +375,8 @@ class EntryChain(Entry):
     ==================================================
     """
 
+    __slots__ = ("_entries", "_resolved")
+
     def __init__(self, *args, **kwargs):
         super().__init__()
         self._entries: typing.List[Entry] = [
@@ -225,12 +384,81 @@ class EntryChain(Entry):
             for v in args
             if v is not _not_found_ and v is not _undefined_ and v is not None
         ]
+        # 查找结果的缓存 {key: 命中的 entry 序号，未命中时为 -1}，与 child() 派生的 entry 共享，见 _lookup
+        self._resolved: dict = {}
 
     def __copy__(self) -> typing.Self:
         other = super().__copy__()
         other._entries = copy(self._entries)
+        other._resolved = self._resolved
         return other
 
+    def _resolution(self) -> dict:
+        """查找结果的缓存。各 entry 的 revision 改变（修改、文档重新载入）时清空。
+        有 entry 的 revision 为 None（版本未知）时不缓存，返回临时的 dict"""
+        resolved = self._resolved
+        revision = tuple(e.revision for e in self._entries)
+        if None in revision:
+            return {}
+        elif resolved.get(None, _not_found_) != revision:
+            resolved.clear()
+            resolved[None] = revision
+        return resolved
+
+    def _lookup(self, key, probe: typing.Callable[[Entry], typing.Any]) -> typing.Any:
+        """依次在各 entry 上调用 probe，返回第一个不为 _not_found_ 的结果。
+        命中的 entry（未命中时为 -1，即负缓存）按 key 记录，之后重复查找只探查一个 entry 或不探查。
+        key 不可 hash 时（例如路径中含查询条件）不缓存。
+        """
+        resolved = self._resolution()
+        try:
+            idx = resolved.get(key, None)
+        except TypeError:
+            key = idx = None
+
+        if idx == -1:
+            return _not_found_
+        elif idx is not None:
+            res = probe(self._entries[idx])
+            if res is not _not_found_:
+                return res
+
+        res = _not_found_
+        for idx, e in enumerate(self._entries):
+            res = probe(e)
+            if res is not _not_found_:
+                break
+        else:
+            idx = -1
+
+        if key is not None:
+            resolved[key] = idx
+        return res
+
+    def _members(self) -> typing.List[Entry]:
+        """在 self._path 处有数据的 entry，按路径缓存"""
+        resolved = self._resolution()
+        key = ("exists", self._path)
+        try:
+            indices = resolved.get(key, None)
+        except TypeError:
+            key = indices = None
+
+        if indices is None:
+            indices = tuple(idx for idx, e in enumerate(self._entries) if e.child(self._path).exists)
+            if key is not None:
+                resolved[key] = indices
+
+        return [self._entries[idx].child(self._path) for idx in indices]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._resolved.clear()
+
+    def delete(self, *args, **kwargs):
+        super().delete(*args, **kwargs)
+        self._resolved.clear()
+
     def __str__(self) -> str:
         return ",".join([str(e) for e in self._entries if e._cache is None])
 
@@ -250,18 +478,112 @@ class EntryChain(Entry):
                 if res is not _not_found_ and res != 0:
                     break
         else:
-            # res = super().find(*args, default_value=_not_found_, **kwargs)
-            for e in self._entries:
-                e_child = e.child(self._path)
-                res = e_child.find(*args, default_value=_not_found_, **kwargs)
-                if res is not _not_found_:
-                    break
+            res = self._lookup(
+                ("find", self._path, args, tuple(kwargs.items())),
+                lambda e: e.child(self._path).find(*args, default_value=_not_found_, **kwargs),
+            )
 
         if res is _not_found_:
             res = default_value
 
         return res
 
+    def find_many(
+        self, paths: typing.Iterable[PathLike], *args, projection=None, default_value=_not_found_, **kwargs
+    ) -> typing.List[typing.Any]:
+        """批量查找，每个 entry 只调用一次 find_many。
+        已缓存命中 entry 的路径先交给该 entry，其余路径依次交给各 entry，直到全部找到。
+        """
+        paths = [as_path(p) for p in paths]
+        projection = _projections(projection, len(paths))
+
+        if self._cache is not _not_found_:
+            res = [
+                Entry.find(self.child(p), *_projection_args(q), *args, default_value=_not_found_, **kwargs)
+                for p, q in zip(paths, projection)
+            ]
+        else:
+            res = [_not_found_] * len(paths)
+
+        resolved = self._resolution()
+        keys = []
+        for p, q in zip(paths, projection):
+            key = ("find", self._path.extend(p), _projection_args(q) + args, tuple(kwargs.items()))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+            keys.append(key)
+
+        def _probe(idx: int, indices: typing.List[int]) -> typing.List[int]:
+            """在第 idx 个 entry 中查找 indices 对应的路径，返回未找到的部分"""
+            values = self._entries[idx].child(self._path).find_many(
+                [paths[i] for i in indices],
+                *args,
+                projection=[projection[i] for i in indices],
+                default_value=_not_found_,
+                **kwargs,
+            )
+            missing = []
+            for i, value in zip(indices, values):
+                if value is _not_found_:
+                    missing.append(i)
+                else:
+                    res[i] = value
+                    if keys[i] is not None:
+                        resolved[keys[i]] = idx
+            return missing
+
+        pending = []
+        hinted: typing.Dict[int, typing.List[int]] = {}
+        for i, key in enumerate(keys):
+            if res[i] is not _not_found_:
+                continue
+            idx = resolved.get(key, None) if key is not None else None
+            if idx is None:
+                pending.append(i)
+            elif idx >= 0:
+                hinted.setdefault(idx, []).append(i)
+
+        for idx, indices in hinted.items():
+            pending.extend(_probe(idx, indices))  # 缓存已失效时重新查找
+
+        for idx in range(len(self._entries)):
+            if len(pending) == 0:
+                break
+            pending = _probe(idx, sorted(pending))
+
+        for i in pending:
+            if keys[i] is not None:
+                resolved[keys[i]] = -1
+
+        return [(v if v is not _not_found_ else default_value) for v in res]
+
+    def key_index(self) -> tuple | int:
+        """合并各 entry 的子节点索引"""
+        res = super().key_index() if self._cache is not _not_found_ else _not_found_
+        for e in self._members():
+            res = _merge_key_index(res, e.key_index())
+        return res
+
+    @property
+    def revision(self) -> typing.Hashable:
+        revisions = (self._version.value, *(e.revision for e in self._entries))
+        return None if None in revisions else revisions
+
+    def gather(self, path: PathLike = None, *args, default_value=_not_found_, **kwargs) -> typing.Any:
+        """返回第一个有匹配值的 entry 的收集结果"""
+        res = super().gather(path, *args, default_value=_not_found_, **kwargs)
+        if res is not _not_found_:
+            return res
+
+        res = self._lookup(
+            ("gather", self._path, as_path(path).freeze(), args, tuple(kwargs.items())),
+            lambda e: e.child(self._path).gather(path, *args, default_value=_not_found_, **kwargs),
+        )
+
+        return res if res is not _not_found_ else default_value
+
     def search(self, *args, **kwargs) -> typing.Generator[typing.Any, None, None]:
         """逐个遍历子节点，不判断重复 id
 
@@ -274,8 +596,8 @@ class EntryChain(Entry):
         if self._cache is not _not_found_:
             yield from super().search(*args, **kwargs)
 
-        for root_entry in self._entries:
-            yield from root_entry.child(self._path).search(*args, **kwargs)
+        for entry in self._members():
+            yield from entry.search(*args, **kwargs)
 
             # 根据第一个有效 entry 中的序号，在其他 entry 中的检索子节点
 
@@ -290,11 +612,160 @@ class EntryChain(Entry):
             #         entry_list.append(t)
             # yield k, ChainEntry(*entry_list)
 
+    async def afind(self, *args, default_value=_not_found_, **kwargs) -> typing.Any:
+        """异步查找：命中过的 entry 直接查找，否则同时查找所有 entry，按顺序返回第一个结果。
+        耗时接近最慢的 entry，而不是各 entry 之和"""
+        if self._cache is not _not_found_ or (len(args) > 0 and args[0] is Query.count):
+            return await super().afind(*args, default_value=default_value, **kwargs)
+        res = await self.afind_many([[]], *args, projection=[None], default_value=default_value, **kwargs)
+        return res[0]
+
+    async def afind_many(
+        self, paths: typing.Iterable[PathLike], *args, projection=None, default_value=_not_found_, **kwargs
+    ) -> typing.List[typing.Any]:
+        """异步批量查找，未缓存命中 entry 的路径同时交给所有 entry"""
+        paths = [as_path(p) for p in paths]
+        projection = _projections(projection, len(paths))
+
+        if self._cache is not _not_found_:
+            return await super().afind_many(paths, *args, projection=projection, default_value=default_value, **kwargs)
+
+        resolved = self._resolution()
+        keys = []
+        for p, q in zip(paths, projection):
+            key = ("find", self._path.extend(p), _projection_args(q) + args, tuple(kwargs.items()))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+            keys.append(key)
+
+        hints = [(resolved.get(key, None) if key is not None else None) for key in keys]
+        pending = [i for i, idx in enumerate(hints) if idx != -1]
+
+        async def _probe(idx: int, indices: typing.List[int]) -> typing.List[typing.Any]:
+            if len(indices) == 0:
+                return []
+            return await self._entries[idx].child(self._path).afind_many(
+                [paths[i] for i in indices],
+                *args,
+                projection=[projection[i] for i in indices],
+                default_value=_not_found_,
+                **kwargs,
+            )
+
+        # 命中过的 entry 只查找对应的路径，其余路径交给所有 entry
+        requests = [
+            [i for i in pending if hints[i] is None or hints[i] == idx] for idx in range(len(self._entries))
+        ]
+        results = await asyncio.gather(*[_probe(idx, indices) for idx, indices in enumerate(requests)])
+
+        found = [dict(zip(indices, values)) for indices, values in zip(requests, results)]
+
+        res = [_not_found_] * len(paths)
+        stale = []
+        for i in pending:
+            for idx, values in enumerate(found):
+                value = values.get(i, _not_found_)
+                if value is not _not_found_:
+                    res[i] = value
+                    break
+            else:
+                idx = -1
+                if hints[i] is not None:
+                    stale.append(i)  # 缓存已失效，重新查找所有 entry
+            if keys[i] is not None and idx != -1:
+                resolved[keys[i]] = idx
+            elif keys[i] is not None and hints[i] is None:
+                resolved[keys[i]] = -1
+
+        if len(stale) > 0:
+            for key in [keys[i] for i in stale]:
+                resolved.pop(key, None)
+            values = await self.afind_many(
+                [paths[i] for i in stale], *args, projection=[projection[i] for i in stale], **kwargs
+            )
+            for i, value in zip(stale, values):
+                res[i] = value
+
+        return [(v if v is not _not_found_ else default_value) for v in res]
+
+    async def asearch(self, *args, **kwargs) -> typing.AsyncGenerator[typing.Any, None]:
+        """同时遍历所有 entry，按 entry 的顺序返回结果"""
+        if self._cache is not _not_found_:
+            async for res in super().asearch(*args, **kwargs):
+                yield res
+
+        async def _collect(entry: Entry) -> list:
+            return [res async for res in entry.asearch(*args, **kwargs)]
+
+        members = await asyncio.to_thread(self._members)
+
+        for values in await asyncio.gather(*[_collect(e) for e in members]):
+            for res in values:
+                yield res
+
     @property
     def exists(self) -> bool:
-        res = [super().find(Query.exists)]
-        res.extend([e.child(self._path).find(Query.exists) for e in self._entries])
-        return any(res)
+        return super().find(Query.exists) or len(self._members()) > 0
+
+
+def _overlay(values: list) -> typing.Any:
+    """按优先级从高到低合并 values：mapping 逐个 key 递归合并，遇到非 mapping 的值为止，其他值取优先级最高的。
+    返回新的 dict，不修改 values 中的数据"""
+    mappings = []
+    for v in values:
+        if not isinstance(v, collections.abc.Mapping):
+            break
+        mappings.append(v)
+
+    if len(mappings) == 0:
+        return values[0]
+    elif len(mappings) == 1:
+        return mappings[0]
+
+    res = {}
+    for k in dict.fromkeys(k for m in reversed(mappings) for k in m):
+        items = [m[k] for m in mappings if k in m]
+        res[k] = _overlay(items) if len(items) > 1 else items[0]
+    return res
+
+
+class EntryOverlay(EntryChain):
+    """只读的覆盖层
+    ==================================================
+    与 EntryChain 相同，依次在各 entry 中查找，前面的 entry 优先；
+    找到的值为 mapping 时与后面 entry 中同一路径的 mapping 逐个 key 递归合并（见 _overlay），而不是只返回第一个。
+    """
+
+    __slots__ = ()
+
+    def find(self, *args, default_value=_not_found_, **kwargs):
+        if len(args) + len(kwargs) > 0 or self._cache is not _not_found_:
+            return super().find(*args, default_value=default_value, **kwargs)
+
+        values = []
+        for e in self._entries:
+            value = e.child(self._path).find(default_value=_not_found_)
+            if value is _not_found_:
+                continue
+            values.append(value)
+            if not isinstance(value, collections.abc.Mapping):
+                break
+
+        return _overlay(values) if len(values) > 0 else default_value
+
+    def find_many(
+        self, paths: typing.Iterable[PathLike], *args, projection=None, default_value=_not_found_, **kwargs
+    ) -> typing.List[typing.Any]:
+        paths = [as_path(p) for p in paths]
+        return [
+            self.child(p).find(*_projection_args(q), *args, default_value=default_value, **kwargs)
+            for p, q in zip(paths, _projections(projection, len(paths)))
+        ]
+
+    async def afind_many(self, paths: typing.Iterable[PathLike], *args, **kwargs) -> typing.List[typing.Any]:
+        return await asyncio.to_thread(self.find_many, paths, *args, **kwargs)
 
 
 def open_entry(uri: str | URITuple | Path | pathlib.Path, *args, _plugin_name=None, **kwargs):
@@ -392,7 +863,7 @@ def _as_entrychain(uris, **kwargs):
     for uri in uris:
         if uri is None or uri is _not_found_:
             continue
-        elif isinstance(uri, EntryChain):
+        elif uri.__class__ is EntryChain:  # EntryOverlay 按层合并，不展开
             entries.extend([e.child(uri._path) for e in uri._entries])
         elif isinstance(uri, (list, tuple)):
             entries.extend(uri)
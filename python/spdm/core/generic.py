@@ -103,6 +103,7 @@ class _GenericAlias(typing._GenericAlias, _root=True):
                 "__module__": orig_cls.__module__,
                 "__package__": getattr(orig_cls, "__package__", None),
                 "__args__": alias.__args__,
+                "__slots__": (),
             },
         )
 
@@ -116,6 +117,8 @@ class Generic(typing.Generic[*_Ts]):
     - 类参数未被特化时，依然返回._GenericAlias
     """
 
+    __slots__ = ()
+
     @typing._tp_cache
     def __class_getitem__(cls, item):
         alias = super().__class_getitem__(item)
@@ -370,27 +370,27 @@ class GeoObject(Pluggable, SpTree, plugin_prefix="spdm/geometry/"):
     def reflect(self, point0, point1) -> typing.Self:
         """reflect  by line"""
         other = copy(self)
-        other._metadata["name"] = f"{self.name}_reflect"
+        other._metadata = {**self._metadata, "name": f"{self.name}_reflect"}
         other.bbox.reflect(point0, point1)
         return other
 
     def rotate(self, angle, axis=None) -> typing.Self:
         """rotate  by angle and axis"""
         other = copy(self)
-        other._metadata["name"] = f"{self.name}_rotate"
+        other._metadata = {**self._metadata, "name": f"{self.name}_rotate"}
         other.bbox.rotate(angle, axis=axis)
         return other
 
     def scale(self, *s, point=None) -> typing.Self:
         """scale self by *s, point"""
         other = copy(self)
-        other._metadata["name"] = f"{self.name}_scale"
+        other._metadata = {**self._metadata, "name": f"{self.name}_scale"}
         other.bbox.scale(*s, point=point)
         return other
 
     def translate(self, *shift) -> typing.Self:
         other = copy(self)
-        other._metadata["name"] = f"{self.name}_translate"
+        other._metadata = {**self._metadata, "name": f"{self.name}_translate"}
         other.bbox.translate(*shift)
         return other
 
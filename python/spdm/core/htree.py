@@ -2,21 +2,176 @@
  store a group of data or objects, such as lists, dictionaries, etc.  """
 
 import collections.abc
+import functools
+import threading
+import weakref
 import typing
 import inspect
 from copy import deepcopy, copy
+import numpy as np
 from spdm.utils.logger import logger
+from spdm.utils.rwlock import lock_table
 from spdm.utils.tags import _not_found_
 from spdm.utils.type_hint import ArrayType, as_array, primary_type, PrimaryType, type_convert
 
 from spdm.core.entry import Entry, as_entry
 from spdm.core.query import Query
 from spdm.core.path import Path, PathLike, as_path
+from spdm.core.sparse_list import SparseList
+from spdm.core.indexed_list import IndexedList
 from spdm.core.generic import Generic
 
 
+class NodeSchema(typing.NamedTuple):
+    """子节点的类型描述，由 type_hint 解析一次后缓存"""
+
+    type_hint: typing.Any = None
+    origin: typing.Any = None  # typing.get_origin(type_hint) or type_hint
+    is_node: bool = False  # origin 是否为 HTreeNode 的子类
+    default_value: typing.Any = _not_found_
+    metadata: dict | None = None
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_type_hint_cached(type_hint) -> NodeSchema:
+    if isinstance(type_hint, tuple):
+        type_hint = type_hint[-1]
+    orig_tp = typing.get_origin(type_hint) or type_hint
+    return NodeSchema(type_hint, orig_tp, inspect.isclass(orig_tp) and issubclass(orig_tp, HTreeNode))
+
+
+def resolve_type_hint(type_hint) -> NodeSchema:
+    """解析 type_hint，返回 NodeSchema。可 hash 的 type_hint 只解析一次"""
+    try:
+        return _resolve_type_hint_cached(type_hint)
+    except TypeError:  # unhashable
+        return _resolve_type_hint_cached.__wrapped__(type_hint)
+
+
+def _is_node_of(node, type_hint) -> bool:
+    schema = resolve_type_hint(type_hint)
+    return schema.is_node and isinstance(node, schema.origin)
+
+
+_merged_metadata: collections.OrderedDict = collections.OrderedDict()
+_merged_metadata_lock = threading.Lock()
+_MERGED_METADATA_MAXSIZE = 1024
+
+
+def merge_metadata(base: dict | None, metadata: dict) -> dict:
+    """合并 base 与 metadata。结果按 (base, metadata) 驻留（intern），同一属性的所有节点共享同一个 dict，
+    不再为每个节点 deepcopy 一份。共享的结果应视为只读，需要修改时替换为新的 dict。
+
+    - 驻留表为 LRU，最多保留 _MERGED_METADATA_MAXSIZE 项，被淘汰的项只是不再共享
+    - 表项保存 base, metadata 的引用（id 在表项存活期间不会被复用）及其快照；
+      命中时与快照比较，base 或 metadata 被原地修改过则重新合并
+    """
+    key = (id(base), id(metadata))
+    with _merged_metadata_lock:
+        res = _merged_metadata.get(key, None)
+        if res is not None:
+            try:
+                unchanged = bool(res[2] == base and res[3] == metadata)
+            except ValueError:  # 含 ndarray 等无法直接比较的值，视为已修改
+                unchanged = False
+            if unchanged:
+                _merged_metadata.move_to_end(key)
+                return res[4]
+            del _merged_metadata[key]
+
+    res = (base, metadata, deepcopy(base), deepcopy(metadata), Path().update(deepcopy(base or {}), metadata))
+
+    with _merged_metadata_lock:
+        _merged_metadata[key] = res
+        if len(_merged_metadata) > _MERGED_METADATA_MAXSIZE:
+            _merged_metadata.popitem(last=False)
+    return res[4]
+
+
+def class_type_hints(cls) -> typing.Dict[str, typing.Any]:
+    """typing.get_type_hints(cls) 的缓存，每个类只解析一次"""
+    hints = cls.__dict__.get("__type_hints__", None)
+    if hints is None:
+        hints = typing.get_type_hints(cls)
+        type.__setattr__(cls, "__type_hints__", hints)
+    return hints
+
+
 class HTreeNode:
-    """Hierarchical Tree Structured Data: HTreeNode is a node in the hierarchical tree."""
+    """Hierarchical Tree Structured Data: HTreeNode is a node in the hierarchical tree.
+
+    节点属性保存在 __slots__ 中，不创建实例 __dict__（子类未声明 __slots__ 时仍会有 __dict__）：
+    - _cache: 缓存数据
+    - _entry: 数据入口，未指定时为 None，不创建空的 Entry
+    - _parent: 父节点，以弱引用保存（_parent_ref），子树与父节点不构成引用循环，删除后由引用计数直接回收。
+      只持有子节点时，父节点不会因此保持存活
+    - _node_cache: 子节点缓存 {key: node}，弱引用，惰性创建
+    - _metadata: 节点的元数据，未设置时不存在（使用 getattr(node, "_metadata", {}) 访问）
+    - _dirty: 自上次 flush 以来修改过的路径，无修改时为 None，见 _touch/flush
+    - _cow: 写时复制（copy-on-write）状态，缓存未与其他节点共享时为 None，见 __copy__/_own
+    - _entry_index: entry 的子节点索引 (revision, key_index)，未缓存时为 None，见 _index
+    """
+
+    __slots__ = ("_cache", "_entry", "_parent_ref", "_node_cache", "_metadata", "_dirty", "_cow", "_entry_index", "__weakref__")
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        try:
+            cls.__schema__()
+        except NameError:  # 前向引用（forward reference）尚未定义，推迟到首次访问时
+            pass
+
+    @classmethod
+    def __schema__(cls) -> typing.Dict[str | None, NodeSchema]:
+        """子节点类型表 {key: NodeSchema}，在创建类时构建一次。
+        key 为 None 的项对应 Generic 类型参数（例如 List[Dict] 中的 Dict），用作元素的默认类型。
+        """
+        schema = cls.__dict__.get("__node_schema__", None)
+        if schema is not None:
+            return schema
+
+        schema = {}
+        for key, type_hint in class_type_hints(cls).items():
+            if key.startswith("_"):
+                continue
+            node_schema = resolve_type_hint(type_hint)
+            prop = getattr(cls, key, None)
+            if getattr(prop.__class__, "is_property", False):
+                node_schema = node_schema._replace(default_value=prop.default_value, metadata=prop.metadata)
+            schema[key] = node_schema
+
+        args = getattr(cls, "__args__", None)
+        schema[None] = resolve_type_hint(args) if args is not None else NodeSchema()
+
+        type.__setattr__(cls, "__node_schema__", schema)
+        return schema
+
+    @classmethod
+    def __prefetch__(cls) -> typing.List[Path]:
+        """预取路径，由属性的 prefetch 元数据声明，例如 annotation(prefetch=True)。
+        - prefetch=True: 叶节点预取该属性；子节点类型若声明了预取路径，则预取其下的这些路径，否则预取整个子树
+        - prefetch=[path,...]: 预取属性下的指定路径
+        节点从 entry 创建时，以 fetch(projection=...) 一次批量读取缓存中缺失的预取路径。
+        """
+        paths = cls.__dict__.get("__prefetch_paths__", None)
+        if paths is not None:
+            return paths
+
+        paths = []
+        type.__setattr__(cls, "__prefetch_paths__", paths)  # 先占位，避免递归类型无限展开
+
+        for key, node_schema in cls.__schema__().items():
+            prefetch = (node_schema.metadata or {}).get("prefetch", False) if key is not None else False
+            if not prefetch:
+                continue
+            elif prefetch is not True:
+                paths.extend(Path([key]).extend(as_path(p)) for p in prefetch)
+            elif node_schema.is_node and len(sub_paths := node_schema.type_hint.__prefetch__()) > 0:
+                paths.extend(Path([key]).extend(p) for p in sub_paths)
+            else:
+                paths.append(Path([key]))
+
+        return paths
 
     def __init__(
         self, cache=_not_found_, /, _entry: Entry = None, _parent: typing.Self = None
@@ -24,16 +179,128 @@ class HTreeNode:
         """Initialize a HTreeNode object."""
 
         self._cache = cache
-        self._entry = as_entry(_entry)
-        self._parent: HTreeNode = _parent
+        self._entry = as_entry(_entry) if _entry is not None and _entry is not _not_found_ else None
+        self._parent = _parent
+        self._node_cache: weakref.WeakValueDictionary | None = None
+        # 初始数据尚未写入 entry，首次 flush 时写入整个节点
+        self._dirty: dict | None = {(): None} if self._entry is not None and cache is not _not_found_ else None
+        self._cow: dict | None = None
+        self._entry_index: tuple | None = None
         super().__init__()
 
     def __copy__(self) -> typing.Self:
+        """写时复制（copy-on-write）快照，O(1)。
+        快照与 self 共享缓存，之后任一方通过节点写入（update/insert/delete/__setitem__/属性赋值）时，
+        只复制写入路径上的容器和子节点（见 _own），内存只随修改量增长。
+        以 dict/list/ndarray 读出的子数据（非节点）在首次读出时复制（见 __as_node__），可以直接修改。
+        """
         other = object.__new__(self.__class__)
-        other._cache = deepcopy(self._cache)
+        other._cache = self._cache
         other._entry = copy(self._entry)
+        other._parent = None
+        other._node_cache = None
+        other._dirty = None
+        other._cow = {}
+        other._entry_index = self._entry_index
+        self._share()
         return other
 
+    def _share(self) -> None:
+        """标记本节点及已创建的子节点的缓存与快照共享，此后写入时复制"""
+        self._cow = {}
+        if self._node_cache is not None:
+            for node in self._node_cache.values():
+                node._share()
+
+    def _adopt(self, node: typing.Self) -> typing.Self:
+        """返回本节点可写入的子节点。与快照共享的子节点先复制（O(1)，见 __copy__）"""
+        owned = self._cow
+        if owned is None or id(node) in owned or (node._parent is self and node._cow is not None):
+            return node
+        node = copy(node)
+        node._parent = self
+        owned[id(node)] = node
+        return node
+
+    _cow_types = (dict, list, SparseList, np.ndarray)
+
+    def _own(self, path=()) -> None:
+        """写时复制：在写入 path 之前，复制 path 上与快照共享的容器（dict/list/ndarray）和子节点。
+        复制出的对象记录在 _cow 中，每个只复制一次。"""
+        owned = self._cow
+        if owned is None:
+            return
+
+        target = self._cache
+        if id(target) not in owned and isinstance(target, HTreeNode._cow_types):
+            target = self._cache = copy(target)
+            owned[id(target)] = target
+
+        prefix = Path._static_prefix(path)
+
+        for idx, key in enumerate(prefix):
+            if isinstance(target, collections.abc.Mapping):
+                child = target.get(key, _not_found_)
+            elif isinstance(target, collections.abc.Sequence) and isinstance(key, int) and -len(target) <= key < len(target):
+                child = target[key]
+            else:
+                break
+
+            if isinstance(child, HTreeNode):
+                node = self._adopt(child)
+                if node is not child:
+                    target[key] = node
+                node._own(prefix[idx + 1 :])
+                break
+            elif id(child) in owned:
+                pass
+            elif isinstance(child, HTreeNode._cow_types):
+                child = copy(child)
+                owned[id(child)] = child
+                target[key] = child
+            else:
+                break
+
+            target = child
+
+    @property
+    def _parent(self) -> typing.Self | None:
+        ref = self._parent_ref
+        return ref() if ref.__class__ is weakref.ref else ref
+
+    @_parent.setter
+    def _parent(self, parent) -> None:
+        if parent is None:
+            self._parent_ref = None
+        else:
+            try:
+                self._parent_ref = weakref.ref(parent)
+            except TypeError:  # 不支持弱引用的对象
+                self._parent_ref = parent
+
+    def _lock_keys(self) -> typing.List[int]:
+        keys = []
+        node = self
+        while node is not None:
+            keys.append(id(node))
+            node = getattr(node, "_parent", None)
+        return keys[::-1]
+
+    def reading(self):
+        """读锁（共享），锁住以本节点为根的子树。可选的并发约定（opt-in），例如：
+        ```python
+            with eq.time_slice[0].reading():      # 多个读线程可以并行
+                ip = eq.time_slice[0].global_quantities.ip
+        ```
+        与子树及祖先上的写锁互斥，与兄弟子树上的读写锁互不阻塞（见 spdm.utils.rwlock）。
+        读取时创建子节点是安全的（SpProperty 的实例锁）。
+        """
+        return lock_table.locking(self._lock_keys(), exclusive=False)
+
+    def writing(self):
+        """写锁（独占），锁住以本节点为根的子树，与该子树上的读写及祖先上的读互斥"""
+        return lock_table.locking(self._lock_keys(), exclusive=True)
+
     @property
     def is_leaf(self) -> bool:
         """只读属性，返回节点是否为叶节点"""
@@ -88,7 +355,7 @@ class HTreeNode:
                 "$type": f"{self.__class__.__module__}.{self.__class__.__name__}",
                 # "$path": ".".join(self.__path__),
                 # "$name": self.__name__,
-                "$entry": self._entry.__getstate__(),
+                "$entry": self._entry.__getstate__() if self._entry is not None else None,
             }
         )
 
@@ -97,10 +364,15 @@ class HTreeNode:
     def __delstate__(self, *args, **kwargs) -> None:
         # self._entry = None
         self._cache = _not_found_
+        self._node_cache = None
 
     def __setstate__(self, *args, **kwargs) -> None:
         self._entry = None
         self._cache = _not_found_
+        self._node_cache = None
+        self._dirty = None
+        self._cow = None
+        self._entry_index = None
         for state in [*args, kwargs]:
             if isinstance(state, dict):
                 self._entry = as_entry(
@@ -156,18 +428,109 @@ class HTreeNode:
         return res.__value__ if isinstance(res, HTreeNode) else res
 
     def update(self, *args, **kwargs):
-        self._cache = Path(*args[:-1]).update(self._cache, *args[-1:], **kwargs)
+        self._invalidate()
+        path = Path(*args[:-1])
+        self._own(path)
+        self._cache = path.update(self._cache, *args[-1:], **kwargs)
+        self._touch(path)
+
+    def fetch(self, projection: typing.Iterable[PathLike] = None, missing_only: bool = False):
+        """fetch data from  entry to cache
+        projection: 需要读取的路径，为 None 时读取整个子树（entry.dump）；
+            否则只读取这些路径，交由 entry.find_many 一次批量读取
+        missing_only: 只读取缓存中不存在的路径
+        """
+        if self._entry is None:
+            return self
 
-    def fetch(self):
-        """fetch data from  entry to cache"""
-        if self._entry is not None:
+        self._invalidate()
+        self._entry_index = None
+
+        if projection is None:
             self._cache = Path().update(self._cache, self._entry.dump)
+            return self
+
+        paths = [as_path(p) for p in projection]
+
+        if missing_only:
+            paths = [p for p in paths if p.get(self._cache, _not_found_) is _not_found_]
+
+        if len(paths) > 0:
+            for path, value in zip(paths, self._entry.find_many(paths)):
+                if value is not _not_found_:
+                    self._cache = path.update(self._cache, value)
+
         return self
 
+    def _invalidate(self, key=None) -> None:
+        """使子节点缓存失效，key 为 None 时清空全部"""
+        if self._node_cache is None:
+            pass
+        elif key is not None and (key.__class__ is str or key.__class__ is int):
+            self._node_cache.pop(key, None)
+        else:
+            self._node_cache = None
+
+    def _touch(self, path=(), node: typing.Self = None) -> None:
+        """记录修改过的路径（相对于本节点，() 表示整个节点）或已修改的子节点 node，
+        并通知父节点。只在本节点由干净变为已修改时向上传递，开销与修改量成正比，与树的大小无关。
+        """
+        self._entry_index = None
+        dirty = self._dirty
+        if dirty is None:
+            dirty = self._dirty = {}
+            if isinstance(self._parent, HTreeNode):
+                self._parent._touch(node=self)
+
+        if node is not None:
+            dirty[id(node)] = node
+            return
+
+        dirty[Path._static_prefix(path)] = None
+
+    def _index(self) -> tuple | int:
+        """entry 的子节点索引（entry.key_index），按 entry.revision 缓存在节点上，
+        本节点修改（_touch）或重新读取（fetch）时失效。revision 为 None 的 entry 不缓存。"""
+        entry = self._entry
+        if entry is None:
+            return _not_found_
+
+        revision = entry.revision
+        cached = self._entry_index
+        if revision is not None and cached is not None and cached[0] == revision:
+            return cached[1]
+
+        index = entry.key_index()
+        if revision is not None:
+            self._entry_index = (revision, index)
+        return index
+
     def flush(self) -> None:
-        """flush data from cache to entry"""
-        if self._entry is not None:
-            self._entry.update(self._cache)
+        """将缓存中修改过的数据写入 entry。
+        只写入自上次 flush 以来修改过的子树（delta），已修改的子节点各自写入其 entry。
+        """
+        dirty, self._dirty = self._dirty, None
+        if dirty is None or self._entry is None:
+            return
+
+        for node in dirty.values():
+            if node is not None:
+                node.flush()
+
+        paths = sorted((k for k in dirty if isinstance(k, tuple)), key=len)
+        written = set()
+        for path in paths:
+            if any(path[:idx] in written for idx in range(len(path) + 1)):
+                continue  # 已被父路径覆盖
+            written.add(path)
+            if len(path) == 0:
+                self._entry.update(self._cache)
+                continue
+            value = Path(list(path)).get(self._cache, _not_found_)
+            if value is _not_found_:
+                self._entry.child(list(path)).delete()
+            else:
+                self._entry.child(list(path)).update(value)
 
     @typing.final
     def parent(self) -> typing.Self:
@@ -262,9 +625,11 @@ class HTree(HTreeNode):
       - path 指向
     """
 
+    __slots__ = ()
+
     def __init__(self, cache: typing.Any = ..., /, _entry: Entry = None, _parent: HTreeNode = None, **kwargs):
         """Initialize a HTree object."""
-        if not (isinstance(cache, (dict, list)) or cache is _not_found_):
+        if not (isinstance(cache, (dict, list, SparseList)) or cache is _not_found_):
             raise TypeError(
                 f"Invalid cache type, cache must be a dict or _not_found_ not {type(cache)} {self.__class__}!"
             )
@@ -282,15 +647,21 @@ class HTree(HTreeNode):
 
     def update(self, *args, **kwargs) -> None:
         """Update 更新元素的value、属性，或者子元素的树状结构"""
-        Path(*args[:-1]).update(self, *args[-1:], **kwargs)
+        path = Path(*args[:-1])
+        self._own(path)
+        path.update(self, *args[-1:], **kwargs)
 
     def insert(self, *args, **kwargs) -> None:
         """插入（Insert） 在树中插入一个子节点。插入操作是非幂等操作"""
-        Path(*args[:-1]).insert(self, *args[-1:], **kwargs)
+        path = Path(*args[:-1])
+        self._own(path)
+        path.insert(self, *args[-1:], **kwargs)
 
     def delete(self, *args, **kwargs) -> None:
         """删除（delete）节点。"""
-        Path(*args).delete(self, **kwargs)
+        path = Path(*args)
+        self._own(path[:-1])
+        path.delete(self, **kwargs)
 
     def search(self, *args, **kwargs) -> typing.Generator[typing.Any, None, None]:
         """搜索（Search ）符合条件节点或属性。查询是一个幂等操作，它不会改变树的状态。
@@ -317,6 +688,20 @@ class HTree(HTreeNode):
         """Get , alias of query"""
         return self.find(path, default_value=default_value)
 
+    def get_many(self, paths: typing.Iterable[PathLike], default_value: typing.Any = _not_found_) -> list:
+        """批量获取，共同前缀只访问一次，按请求顺序返回结果"""
+        return Path.find_many(self, paths, default_value=default_value)
+
+    def gather(self, path: PathLike, default_value: typing.Any = _not_found_, **kwargs) -> typing.Any:
+        """收集通配路径（例如 "time_slice/*/global_quantities/ip"）匹配的值，堆叠为一个 ndarray。
+        直接作用于缓存数据，缓存中无匹配时交由 entry 批量读取，不构建子节点。
+        """
+        path = as_path(path)
+        res = path.gather(self._cache, default_value=_not_found_, **kwargs)
+        if res is _not_found_ and self._entry is not None:
+            res = self._entry.gather(path, default_value=_not_found_, **kwargs)
+        return res if res is not _not_found_ else default_value
+
     def pop(self, path, default_value: typing.Any = _not_found_) -> typing.Any:
         """Pop , query and delete"""
         node = self.find(path, default_value=_not_found_)
@@ -383,46 +768,63 @@ class HTree(HTreeNode):
         if parent is None:
             parent = self
 
-        if type_hint is _not_found_:
-            type_hint = None
-
-        if type_hint is None and isinstance(key, str) and key.isidentifier():
-            orig_cls = typing.get_origin(self.__class__) or self.__class__
-            type_hint = typing.get_type_hints(orig_cls).get(key, None)
-
-        if type_hint is None:
-            type_hint = getattr(self.__class__, "__args__", None)
-
-        if isinstance(type_hint, tuple):
-            type_hint = type_hint[-1]
+        if type_hint is None or type_hint is _not_found_:
+            schema = self.__class__.__schema__()
+            node_schema = schema.get(key, None) if isinstance(key, str) else None
+            if node_schema is None or node_schema.type_hint is None:
+                node_schema = schema[None]
+        else:
+            node_schema = resolve_type_hint(type_hint)
 
-        orig_tp = typing.get_origin(type_hint) or type_hint
+        type_hint, orig_tp, is_node, *_ = node_schema
 
-        if inspect.isclass(orig_tp) and issubclass(orig_tp, HTreeNode):
+        if is_node:
+            shared = self._cow is not None  # value 与快照共享
             if (value is _not_found_) and (entry is None or not entry.exists):
                 entry = None
-                if isinstance(default_value, dict):
-                    value = Path().update(copy(default_value), value)
-                else:
-                    value = default_value
+                value = default_value
+                # 类的默认值不复制，作为只读数据与节点共享，首次写入时复制（见 _own）
+                shared = shared or isinstance(default_value, HTreeNode._cow_types)
                 default_value = _not_found_
 
             if value is _not_found_ and entry is None:
                 node = value
             elif isinstance(value, orig_tp):
-                node = value
+                node = value if value._parent is None else self._adopt(value)
+                if node is not value and key is not None:
+                    self._own()
+                    self._cache[key] = node
             else:
                 node = type_hint(value, _entry=entry, _parent=parent)
+                node._dirty = None  # 数据来自本节点的缓存或 entry，不是修改
+                if shared:
+                    node._cow = {}
+                if entry is not None and len(prefetch := node.__prefetch__()) > 0:
+                    HTreeNode.fetch(node, prefetch, missing_only=True)
 
         else:
+            if (
+                self._cow is not None
+                and key is not None
+                and isinstance(value, HTreeNode._cow_types)
+                and id(value) not in self._cow
+                and Path([key]).get(self._cache, _not_found_) is value
+            ):
+                # 与快照共享的 dict/list/ndarray 在首次读出时复制，之后经由它的修改不影响快照（反之亦然）
+                value = deepcopy(value)
+                self._own()
+                self._cache[key] = value
+                self._cow[id(value)] = value
+
             if value is _not_found_ and entry is not None:
                 value = entry.get()
 
             if value is _not_found_:
                 value = default_value
 
-            elif isinstance(default_value, dict):
-                value = Path().update(copy(default_value), value)
+            elif isinstance(default_value, dict) and isinstance(value, collections.abc.Mapping):
+                # 默认值逐层合并，复制默认值，不修改类的默认值
+                value = Path().update(deepcopy(default_value), value)
                 default_value = _not_found_
 
             if value is _not_found_:
@@ -434,9 +836,10 @@ class HTree(HTreeNode):
             if node._parent is None:
                 node._parent = self
         if isinstance(node, HTree) and metadata is not None and len(metadata) > 0:
-            node._metadata = Path().update(deepcopy(getattr(node, "_metadata", {})), metadata)
+            node._metadata = merge_metadata(getattr(node, "_metadata", None), metadata)
 
         if node is not _not_found_ and key is not None:
+            self._own()
             self._cache = Path([key]).update(self._cache, node)
 
         return node
@@ -455,6 +858,24 @@ class HTree(HTreeNode):
         if key is None:
             return self
 
+        hashable = key.__class__ is str or key.__class__ is int
+
+        # 子节点缓存只记录 key 与 type_hint；指定 getter/entry/default_value/metadata 时结果可能不同，不使用缓存
+        # （SpProperty 的参数由属性确定，在 SpProperty.__get__ 中直接查找缓存）
+        if (
+            hashable
+            and self._node_cache is not None
+            and getter is None
+            and entry is None
+            and default_value is _not_found_
+            and metadata is None
+        ):
+            node = self._node_cache.get(key, None)
+            if node is not None and (
+                type_hint is None or type_hint is _not_found_ or _is_node_of(node, type_hint)
+            ):
+                return node
+
         value = Path([key]).get(self._cache, _not_found_)
 
         if value is _not_found_ and callable(getter):
@@ -463,7 +884,7 @@ class HTree(HTreeNode):
         if entry is None and self._entry is not None:
             entry = self._entry.child(key)
 
-        return self.__as_node__(
+        node = self.__as_node__(
             key,
             value,
             type_hint=type_hint,
@@ -473,15 +894,56 @@ class HTree(HTreeNode):
             metadata=metadata,
         )
 
+        if hashable and isinstance(node, HTreeNode):
+            if self._node_cache is None:
+                self._node_cache = weakref.WeakValueDictionary()
+            self._node_cache[key] = node
+
+        return node
+
     def __set_node__(self, key, *args, setter=None, **kwargs) -> None:
+        # 子节点原地修改后被写回（例如 Path.update 逐层写回），修改已由子节点自身记录
+        unchanged = (
+            len(args) == 1
+            and (key.__class__ is str or key.__class__ is int)
+            and self._node_cache is not None
+            and self._node_cache.get(key, None) is args[0]
+        )
+        if not unchanged:
+            self._invalidate(key)
+
+        is_append = key is Path.tags.append or key is Path.tags.extend
+        if not unchanged:
+            self._own(key if isinstance(key, Path) else () if key is None or is_append else (key,))
+        start = len(self._cache) if is_append and isinstance(self._cache, collections.abc.Sequence) else 0
+
         if callable(setter):
             setter(self, key, *args, **kwargs)
         else:
             self._cache = Path([key] if key is not None else []).update(self._cache, *args, **kwargs)
 
+        if self._cow is not None and not unchanged:
+            for value in args:  # 新写入的值属于本节点
+                self._cow[id(value)] = value
+
+        if unchanged:
+            pass
+        elif is_append and isinstance(self._cache, collections.abc.Sequence):
+            for idx in range(start, len(self._cache)):
+                self._touch((idx,))
+        elif key is None:
+            self._touch()
+        elif isinstance(key, Path):
+            self._touch(key)
+        else:
+            self._touch((key,))
+
         return self
 
     def __del_node__(self, key: str | int, deleter=None) -> bool:
+        self._invalidate(key)
+        self._own()
+        self._touch((key,))
         if callable(deleter):
             return deleter(self, key)
         elif (isinstance(self._cache, collections.abc.MutableMapping) and key in self._cache) or (
@@ -521,6 +983,8 @@ class HTree(HTreeNode):
 class Dict(Generic[_T], HTree):
     """Dict 类型的 HTree 对象"""
 
+    __slots__ = ()
+
     def __init__(self, cache: dict = _not_found_, /, **kwargs):
         if cache is _not_found_:
             cache = {}
@@ -540,8 +1004,9 @@ class Dict(Generic[_T], HTree):
         if isinstance(self._cache, collections.abc.Mapping):
             yield from self._cache.keys()
 
-        if self._entry is not None:
-            for key in self._entry.keys():
+        index = self._index()
+        if isinstance(index, tuple):
+            for key in index:
                 if key not in self._cache:
                     yield key
 
@@ -581,12 +1046,17 @@ collections.abc.MutableMapping.register(Dict)
 
 
 class List(Generic[_T], HTree):
-    """List 类型的 HTree 对象"""
+    """List 类型的 HTree 对象
+    自行创建的存储为 IndexedList，按 Path.id_tag_name（name）查找子节点时使用索引；
+    传入的 list 与其所有者共享，保持原样（不带索引），可以传入 IndexedList/as_indexed(...) 启用索引。
+    """
+
+    __slots__ = ()
 
     def __init__(self, cache: list = _not_found_, **kwargs):
         if cache is _not_found_:
-            cache = []
-        elif isinstance(cache, list):
+            cache = IndexedList()
+        elif isinstance(cache, (list, SparseList)):
             pass
         elif isinstance(cache, collections.abc.Iterable):
             cache = list(cache)
@@ -624,8 +1094,11 @@ class List(Generic[_T], HTree):
         if isinstance(self._cache, collections.abc.Sequence):
             length = len(self._cache)
 
-        if self._entry is not None:
-            length = max(length, self._entry.count)
+        index = self._index()
+        if isinstance(index, int):
+            length = max(length, index)
+        elif isinstance(index, tuple):
+            length = max(length, len(index))
 
         return length
 
@@ -659,6 +1132,8 @@ collections.abc.MutableSequence.register(List)
 class Set(Generic[_T], HTree):
     """hashable 对象的容器"""
 
+    __slots__ = ()
+
     def __init__(self, cache: dict = _not_found_, /, **kwargs):
         super().__init__({}, **kwargs)
         if isinstance(cache, list):
@@ -686,11 +1161,15 @@ class Set(Generic[_T], HTree):
     def update(self, key, *args, **kwargs) -> None:
         if isinstance(key, str):
             kwargs["metadata"] = {"label": key}
+        self._own()
         super().__as_node__(hash(key), *args, **kwargs)
+        self._touch((hash(key),))
 
     def insert(self, value, *args, **kwargs) -> None:
         node = super().__as_node__(None, value, *args, **kwargs)
+        self._own()
         self._cache = Path([hash(node)]).update(self._cache, node, *args, **kwargs)
+        self._touch((hash(node),))
 
     def delete(self, key, *args, **kwargs) -> None:
         return super().delete(hash(key), *args, **kwargs)
@@ -0,0 +1,257 @@
+""" IndexedList: 带有二级索引的 list，用于按 id/name/time 等字段快速定位元素 """
+
+import bisect
+import collections.abc
+import typing
+
+from spdm.utils.tags import _not_found_
+from spdm.core.query import Query
+
+
+class IndexedList(list):
+    """带有二级索引（secondary index）的 list
+    ==============================================
+    - 索引按字段（field）惰性构建，首次按该字段查找时建立
+        - hash 索引: value -> [idx,...]，用于等值查找，O(1)
+        - 有序索引: sorted [(value, idx),...]，用于按 time 等字段查找不大于 value 的元素，O(log n)
+    - 索引建立后由 list 的修改操作增量维护：append/extend/pop() 及对单个元素的赋值为 O(1)（有序索引为 O(log n)
+      查找加插入），insert/del 只平移其后元素的序号，不重新读取字段；切片赋值、sort、reverse 使索引失效
+    - 索引建立后，未命中直接返回空结果，不再线性查找
+    - 元素被原地修改（例如 node["name"] = ...）时 list 无法感知：命中时校验字段值，发现过期时重建索引；
+      原地修改元素的索引字段后，应调用 invalidate() 使索引失效
+    - index_fields 声明的字段（以及 Path.id_tag_name）在按 Query 等值查找时使用索引
+
+    索引为可选功能（opt-in）：以 IndexedList/as_indexed 创建，HTree 的 List 在自行创建存储时使用 IndexedList，
+    普通 list 不带索引。FileXML 的 @id 匹配由 XPath 在 lxml 中完成，不使用此索引。
+
+    字段取值规则与 Query 相同：`@attr` 优先取属性，否则取 mapping 中的 key。
+    """
+
+    def __init__(self, *args, index_fields: typing.Iterable[str] = None):
+        super().__init__(*args)
+        self._index_fields = set(index_fields or [])
+        self._indices: typing.Dict[str, dict] = {}
+        self._sorted: typing.Dict[str, list] = {}
+        self._getters: typing.Dict[str, typing.Callable] = {}
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),), {"_index_fields": self._index_fields})
+
+    def __setstate__(self, state):
+        self._index_fields = state.get("_index_fields", set())
+        self._indices = {}
+        self._sorted = {}
+        self._getters = {}
+
+    @property
+    def index_fields(self) -> typing.Set[str]:
+        return self._index_fields
+
+    def _getter(self, field: str) -> typing.Callable:
+        getter = self._getters.get(field, None)
+        if getter is None:
+            getter = self._getters[field] = Query._compile_getter(field)
+        return getter
+
+    def _key(self, field: str, node) -> typing.Any:
+        """元素 node 在 field 处可以索引的值，不可索引时返回 _not_found_"""
+        value = self._getter(field)(node)
+        return value if isinstance(value, collections.abc.Hashable) else _not_found_
+
+    def invalidate(self) -> None:
+        """使所有索引失效"""
+        self._indices.clear()
+        self._sorted.clear()
+
+    def _build(self, field: str) -> dict:
+        index = {}
+        for idx, node in enumerate(self):
+            value = self._key(field, node)
+            if value is not _not_found_:
+                index.setdefault(value, []).append(idx)
+        self._indices[field] = index
+        self._index_fields.add(field)
+        return index
+
+    def _build_sorted(self, field: str) -> list:
+        getter = self._getter(field)
+        keys = sorted(
+            (v, idx) for idx, v in ((idx, getter(node)) for idx, node in enumerate(self)) if v is not _not_found_
+        )
+        self._sorted[field] = keys
+        return keys
+
+    # ---------------------------------------------------------------------------------
+    # 增量维护
+
+    def _index_add(self, idx: int, node) -> None:
+        for field, index in self._indices.items():
+            value = self._key(field, node)
+            if value is not _not_found_:
+                bisect.insort(index.setdefault(value, []), idx)
+        for field, keys in list(self._sorted.items()):
+            value = self._getter(field)(node)
+            if value is _not_found_:
+                continue
+            try:
+                bisect.insort(keys, (value, idx))
+            except TypeError:  # 不可比较的值，下次查找时重建
+                del self._sorted[field]
+
+    def _index_remove(self, idx: int, node) -> None:
+        for field, index in self._indices.items():
+            value = self._key(field, node)
+            indices = index.get(value, None) if value is not _not_found_ else None
+            if indices is not None and idx in indices:
+                indices.remove(idx)
+                if len(indices) == 0:
+                    del index[value]
+        for field, keys in list(self._sorted.items()):
+            value = self._getter(field)(node)
+            if value is _not_found_:
+                continue
+            try:
+                pos = bisect.bisect_left(keys, (value, idx))
+            except TypeError:
+                pos = len(keys)
+            if pos < len(keys) and keys[pos][1] == idx:
+                del keys[pos]
+            else:  # 元素已被原地修改，无法定位
+                del self._sorted[field]
+
+    def _shift(self, start: int, delta: int) -> None:
+        """序号不小于 start 的元素的序号加 delta（insert/del 之后的元素）"""
+        if start > len(self):
+            return
+        for index in self._indices.values():
+            for indices in index.values():
+                for pos in range(bisect.bisect_left(indices, start), len(indices)):
+                    indices[pos] += delta
+        for field, keys in self._sorted.items():
+            self._sorted[field] = [(v, idx + delta if idx >= start else idx) for v, idx in keys]
+
+    def _normalize(self, idx: int) -> int:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("list index out of range")
+        return idx
+
+    # ---------------------------------------------------------------------------------
+    # 查找
+
+    def _linear(self, field: str, value) -> typing.List[int]:
+        getter = self._getter(field)
+        return [idx for idx, node in enumerate(self) if Query._q_eq(getter(node), value)]
+
+    def lookup_all(self, field: str, value) -> typing.List[int]:
+        """返回字段 field 等于 value 的所有元素的序号"""
+        if not isinstance(value, collections.abc.Hashable):
+            return self._linear(field, value)
+
+        index = self._indices.get(field, None)
+        if index is None:
+            index = self._build(field)
+
+        indices = index.get(value, None)
+
+        if indices is None:
+            return []
+
+        getter = self._getter(field)
+        if any(idx >= len(self) or not Query._q_eq(getter(list.__getitem__(self, idx)), value) for idx in indices):
+            # 元素已被原地修改，索引过期
+            indices = self._build(field).get(value, [])
+
+        return list(indices)
+
+    def lookup(self, field: str, value, default_value=_not_found_) -> typing.Any:
+        """返回第一个字段 field 等于 value 的元素"""
+        indices = self.lookup_all(field, value)
+        return list.__getitem__(self, indices[0]) if len(indices) > 0 else default_value
+
+    def floor(self, field: str, value, default_value=_not_found_) -> typing.Any:
+        """返回字段 field 不大于 value 的元素中字段值最大者，例如按时间查找当前 time slice。O(log n)"""
+        keys = self._sorted.get(field, None)
+        if keys is None:
+            keys = self._build_sorted(field)
+        pos = bisect.bisect_right(keys, (value, len(self)))
+        return list.__getitem__(self, keys[pos - 1][1]) if pos > 0 else default_value
+
+    # ---------------------------------------------------------------------------------
+    # list 修改操作，维护索引
+
+    def append(self, value) -> None:
+        super().append(value)
+        self._index_add(len(self) - 1, value)
+
+    def extend(self, values) -> None:
+        start = len(self)
+        super().extend(values)
+        for idx in range(start, len(self)):
+            self._index_add(idx, list.__getitem__(self, idx))
+
+    def __iadd__(self, values) -> typing.Self:
+        self.extend(values)
+        return self
+
+    def __setitem__(self, key, value) -> None:
+        if not isinstance(key, int):
+            super().__setitem__(key, value)
+            self.invalidate()
+            return
+        key = self._normalize(key)
+        self._index_remove(key, list.__getitem__(self, key))
+        super().__setitem__(key, value)
+        self._index_add(key, value)
+
+    def __delitem__(self, key) -> None:
+        if not isinstance(key, int):
+            super().__delitem__(key)
+            self.invalidate()
+            return
+        key = self._normalize(key)
+        self._index_remove(key, list.__getitem__(self, key))
+        super().__delitem__(key)
+        self._shift(key + 1, -1)
+
+    def insert(self, idx, value) -> None:
+        idx = min(max(idx + len(self) if idx < 0 else idx, 0), len(self))
+        self._shift(idx, 1)
+        super().insert(idx, value)
+        self._index_add(idx, value)
+
+    def pop(self, idx: int = -1) -> typing.Any:
+        idx = self._normalize(idx)
+        value = list.__getitem__(self, idx)
+        del self[idx]
+        return value
+
+    def remove(self, value) -> None:
+        del self[self.index(value)]
+
+    def clear(self) -> None:
+        super().clear()
+        for field in self._indices:
+            self._indices[field] = {}
+        for field in self._sorted:
+            self._sorted[field] = []
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self.invalidate()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self.invalidate()
+
+
+def as_indexed(target: typing.Any, *index_fields: str) -> IndexedList | typing.Any:
+    """将 list 转换为 IndexedList，非 list 原样返回"""
+    if isinstance(target, IndexedList):
+        target.index_fields.update(index_fields)
+        return target
+    elif isinstance(target, list):
+        return IndexedList(target, index_fields=index_fields)
+    else:
+        return target
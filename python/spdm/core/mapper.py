@@ -1,3 +1,4 @@
+import asyncio
 import pathlib
 import typing
 from importlib import resources
@@ -7,13 +8,20 @@ import os
 from spdm.utils.logger import logger
 from spdm.utils.tags import _not_found_
 from spdm.utils.uri_utils import URITuple, uri_split
-from spdm.core.entry import Entry, as_entry
+from spdm.core.entry import Entry, as_entry, _projection_args, _projections
 from spdm.core.file import File
 
 
 path = "spdm/mapping/{schema}"
 
 
+class _Pending(typing.NamedTuple):
+    """Mapper 中等待批量读取的叶节点：handler 的 id 及其在该 handler 请求中的序号"""
+
+    nid: str
+    idx: int
+
+
 class Mapper(Entry):
 
     _mappers = {}
@@ -44,26 +52,79 @@ class Mapper(Entry):
         other._handler = self._handler
         return other
 
-    def _do_map(self, req):
+    @property
+    def revision(self) -> typing.Hashable:
+        """经本 mapper 修改的次数、映射表及各数据源（handler）的版本，任一个为 None 时为 None"""
+        revisions = (
+            self._version.value,
+            self._mapper.revision,
+            *(self._handler[nid].revision for nid in sorted(self._handler)),
+        )
+        return None if None in revisions else revisions
+
+    def _collect(self, req, requests: typing.Dict[str, list]):
+        """将 req 中的叶节点请求（"@spdm"）按 handler 收集到 requests，原处替换为 (handler, 序号)"""
         if isinstance(req, dict):
             if "@spdm" not in req:
-                res = {k: self._do_map(v) for k, v in req.items()}
+                res = {k: self._collect(v, requests) for k, v in req.items()}
             else:
-                entry = self._handler.get(req.get("@spdm", None), None)
-                if not isinstance(entry, Entry):
+                nid = req.get("@spdm", None)
+                if not isinstance(self._handler.get(nid, None), Entry):
                     # raise RuntimeError(f"Can not find entry for {req}")
                     res = _not_found_
                 else:
-                    res = entry.find(req.get("_text"))
+                    batch = requests.setdefault(nid, [])
+                    batch.append(req.get("_text"))
+                    res = _Pending(nid, len(batch) - 1)
         elif isinstance(req, list) and any(isinstance(i, dict) for i in req):
-            res = [self._do_map(i) for i in req]
+            res = [self._collect(i, requests) for i in req]
         elif isinstance(req, tuple):
             k, req = req
-            res = (k, self._do_map(req))
+            res = (k, self._collect(req, requests))
         else:
             res = req
         return res
 
+    @staticmethod
+    def _resolve(req, values: typing.Dict[str, list]):
+        if isinstance(req, _Pending):
+            return values[req.nid][req.idx]
+        elif isinstance(req, dict):
+            return {k: Mapper._resolve(v, values) for k, v in req.items()}
+        elif isinstance(req, list):
+            return [Mapper._resolve(i, values) for i in req]
+        elif isinstance(req, tuple):
+            k, req = req
+            return (k, Mapper._resolve(req, values))
+        else:
+            return req
+
+    def _do_map_many(self, reqs: typing.List[typing.Any]) -> typing.List[typing.Any]:
+        """映射一批请求，每个 handler 只调用一次 find_many"""
+        requests: typing.Dict[str, list] = {}
+        reqs = [self._collect(req, requests) for req in reqs]
+        values = {
+            nid: self._handler[nid].find_many([[]] * len(batch), projection=batch, default_value=_not_found_)
+            for nid, batch in requests.items()
+        }
+        return [self._resolve(req, values) for req in reqs]
+
+    def _do_map(self, req):
+        return self._do_map_many([req])[0]
+
+    async def _ado_map_many(self, reqs: typing.List[typing.Any]) -> typing.List[typing.Any]:
+        """_do_map_many 的异步版本，同时读取各 handler"""
+        requests: typing.Dict[str, list] = {}
+        reqs = [self._collect(req, requests) for req in reqs]
+        results = await asyncio.gather(
+            *[
+                self._handler[nid].afind_many([[]] * len(batch), projection=batch, default_value=_not_found_)
+                for nid, batch in requests.items()
+            ]
+        )
+        values = dict(zip(requests.keys(), results))
+        return [self._resolve(req, values) for req in reqs]
+
     def _map(self, *args) -> Entry:
         value = self._mapper.child(self._path).find(*args, default_value=_not_found_)
         value = self._do_map(value)
@@ -72,17 +133,68 @@ class Mapper(Entry):
         return Entry(value)
 
     def insert(self, *args, **kwargs) -> typing.Self:
+        self._version.value += 1
         return self._map(*args[:-1]).insert(*args[-1:], **kwargs)
 
     def update(self, *args, **kwargs) -> typing.Self:
+        self._version.value += 1
         return self._map(*args[:-1]).update(*args[-1:], **kwargs)
 
     def delete(self, *args, **kwargs) -> int:
+        self._version.value += 1
         return self._map(*args[:1]).delete(*args[1:], **kwargs)
 
     def find(self, *args, **kwargs) -> typing.Any:
         return self._map(*args[:1]).find(*args[1:], **kwargs)
 
+    def find_many(
+        self, paths, *args, projection=None, default_value=_not_found_, **kwargs
+    ) -> typing.List[typing.Any]:
+        """批量映射：映射表只查找一次，各数据源的请求分别合并为一次 find_many"""
+        paths = list(paths)
+        values = self._do_map_many(self._mapper.child(self._path).find_many(paths, default_value=_not_found_))
+
+        missing = [idx for idx, v in enumerate(values) if v is _not_found_]
+        if len(missing) > 0:
+            for idx, value in zip(
+                missing,
+                self._handler["*"].child(self._path).find_many([paths[i] for i in missing], default_value=_not_found_),
+            ):
+                values[idx] = value
+
+        return [
+            Entry(value).find(*_projection_args(q), *args, default_value=default_value, **kwargs)
+            for value, q in zip(values, _projections(projection, len(paths)))
+        ]
+
+    async def afind(self, *args, **kwargs) -> typing.Any:
+        """find 的异步版本，映射到多个数据源时同时读取"""
+        value = self._mapper.child(self._path).find(*args[:1], default_value=_not_found_)
+        value = (await self._ado_map_many([value]))[0]
+        if value is _not_found_:
+            value = await self._handler["*"].child(self._path).afind(*args[:1], default_value=_not_found_)
+        return Entry(value).find(*args[1:], **kwargs)
+
+    async def afind_many(
+        self, paths, *args, projection=None, default_value=_not_found_, **kwargs
+    ) -> typing.List[typing.Any]:
+        """find_many 的异步版本，映射到多个数据源时同时读取"""
+        paths = list(paths)
+        values = await self._ado_map_many(self._mapper.child(self._path).find_many(paths, default_value=_not_found_))
+
+        missing = [idx for idx, v in enumerate(values) if v is _not_found_]
+        if len(missing) > 0:
+            fallback = await self._handler["*"].child(self._path).afind_many(
+                [paths[i] for i in missing], default_value=_not_found_
+            )
+            for idx, value in zip(missing, fallback):
+                values[idx] = value
+
+        return [
+            Entry(value).find(*_projection_args(q), *args, default_value=default_value, **kwargs)
+            for value, q in zip(values, _projections(projection, len(paths)))
+        ]
+
     def search(self, *args, **kwargs) -> typing.Generator[typing.Any, None, None]:
         """Return a generator of the results."""
         for value in self._mapper.child(self._path).search(*args[:1], default_value=_not_found_):
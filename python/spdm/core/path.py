@@ -1,5 +1,6 @@
 import ast
 import collections.abc
+import functools
 import re
 import itertools
 import typing
@@ -9,11 +10,14 @@ import pathlib
 import numpy as np
 
 
+from spdm.utils.envs import SP_PATH_CACHE_SIZE, SP_SPARSE_LIST_THRESHOLD
 from spdm.utils.logger import logger
 from spdm.utils.tags import _not_found_
 from spdm.utils.type_hint import is_int
 
 from spdm.core.query import Query, as_query
+from spdm.core.indexed_list import IndexedList
+from spdm.core.sparse_list import SparseList
 
 
 PathLike = str | int | slice | dict | list | Query.tags | None
@@ -23,6 +27,17 @@ PathItemLike = str | int | slice | dict | Query.tags
 path_like = tuple([int, str, slice, list, tuple, set, dict, Query.tags])
 
 
+_dict_members = frozenset(dir(dict))
+
+_leaf_types = frozenset([int, float, complex, bool, str, bytes, np.ndarray])
+
+
+def _is_immutable_item(p) -> bool:
+    if isinstance(p, tuple):
+        return all(map(_is_immutable_item, p))
+    return p is None or isinstance(p, (str, int, slice, Flag))
+
+
 class PathError(Exception):
     def __init__(self, path: typing.List[PathLike], message: str | None = None) -> None:
         if message is None:
@@ -121,6 +136,8 @@ class Path(list):
 
     # fmt:on
 
+    __slots__ = ()  # 不创建实例 __dict__，Path 大量存在于 Entry 中
+
     def __init__(self, *args):
         super().__init__(Path.parser(*args))
 
@@ -134,7 +151,18 @@ class Path(list):
         return self.__str__().__hash__()
 
     def __copy__(self) -> typing.Self:
-        return self.__class__(deepcopy(self[:]))
+        return self._from_items(self[:] if all(map(_is_immutable_item, self)) else deepcopy(self[:]))
+
+    @classmethod
+    def _from_items(cls, items: typing.Iterable[PathItemLike]) -> typing.Self:
+        """由已解析的 items 直接构建 Path，跳过 parser"""
+        other = list.__new__(cls)
+        list.__init__(other, items)
+        return other
+
+    def freeze(self) -> "FrozenPath":
+        """返回不可变的 FrozenPath"""
+        return FrozenPath._from_items(self[:] if all(map(_is_immutable_item, self)) else deepcopy(self[:]))
 
     def as_url(self) -> str:
         return Path._to_str(self)
@@ -395,39 +423,62 @@ class Path(list):
         return item
 
     @staticmethod
-    def _parser_iter(path: typing.Any) -> typing.Generator[PathLike, None, None]:
-        if isinstance(path, str):
-            if path.startswith("/"):
-                yield Path.tags.root
-                path = path[1:]
-            elif path.isidentifier():
-                yield path
-                return
+    def _parser_str_iter(path: str) -> typing.Generator[PathLike, None, None]:
+        """词法解析字符串路径 (无缓存)"""
+        if path.startswith("/"):
+            yield Path.tags.root
+            path = path[1:]
 
-            for match in Path.PATH_PATTERN.finditer(path):
-                key = match.group("key")
+        for match in Path.PATH_PATTERN.finditer(path):
+            key = match.group("key")
 
-                if key is None:
-                    pass
+            if key is None:
+                pass
 
-                elif (tmp := is_int(key)) is not False:
-                    yield tmp
+            elif (tmp := is_int(key)) is not False:
+                yield tmp
 
-                elif key == "*":
-                    yield Path.tags.children
+            elif key == "*":
+                yield Path.tags.children
 
-                elif key == "..":
-                    yield Path.tags.parent
+            elif key == "**":
+                yield Path.tags.descendants
 
-                elif key == "...":
-                    yield Path.tags.ancestors
+            elif key == "..":
+                yield Path.tags.parent
 
-                else:
-                    yield key
+            elif key == "...":
+                yield Path.tags.ancestors
+
+            else:
+                yield key
+
+            selector = match.group("selector")
+            if selector is not None:
+                yield Path._parser_selector(selector)
 
-                selector = match.group("selector")
-                if selector is not None:
-                    yield Path._parser_selector(selector)
+    @staticmethod
+    @functools.lru_cache(maxsize=SP_PATH_CACHE_SIZE)
+    def _parser_cached(path: str) -> typing.Tuple[tuple, bool]:
+        """解析字符串路径，结果按字符串缓存 (LRU)。
+        返回 (items, immutable)，immutable 为 False 时 items 中含有可变对象（Query,set,list...），使用前需复制。
+        """
+        items = tuple(Path._parser_str_iter(path))
+        return items, all(map(_is_immutable_item, items))
+
+    @staticmethod
+    def _parser_str(path: str) -> list:
+        """解析字符串路径，返回新的 list"""
+        items, immutable = Path._parser_cached(path)
+        return list(items) if immutable else deepcopy(list(items))
+
+    @staticmethod
+    def _parser_iter(path: typing.Any) -> typing.Generator[PathLike, None, None]:
+        if isinstance(path, str):
+            if path.isidentifier():
+                yield path
+            else:
+                yield from Path._parser_str(path)
 
         elif isinstance(path, Path.tags):
             yield path
@@ -523,6 +574,157 @@ class Path(list):
         """alias of find"""
         return self.find(target, *p_args, **p_kwargs)
 
+    @staticmethod
+    def find_many(target, paths: typing.Iterable[PathLike], *p_args, **p_kwargs) -> typing.List[typing.Any]:
+        """批量查找，按请求顺序返回结果。
+        将 paths 中由 str/int 组成的前缀构建为前缀树（trie），共同前缀只访问一次；
+        前缀之后的剩余路径（slice, Query 等）交由 Path._find 处理。
+        p_args,p_kwargs: project 参数，作用于每个结果
+        """
+        paths = [as_path(p) for p in paths]
+
+        res = [_not_found_] * len(paths)
+
+        trie = ({}, [])  # (children, [(idx, rest of path)])
+
+        for idx, path in enumerate(paths):
+            node = trie
+            for pos, key in enumerate(path):
+                if key.__class__ is not str and key.__class__ is not int:
+                    break
+                node = node[0].setdefault(key, ({}, []))
+            else:
+                pos = len(path)
+            node[1].append((idx, path[pos:]))
+
+        stack = [(trie, target)]
+
+        while len(stack) > 0:
+            (children, leaves), value = stack.pop()
+
+            for idx, rest in leaves:
+                res[idx] = Path._find(value, rest, *p_args, **p_kwargs)
+
+            for key, child in children.items():
+                stack.append((child, Path._walk(value, [key])[0]))
+
+        return res
+
+    def gather(self, target, *p_args, fill_value=np.nan, **p_kwargs) -> typing.Any:
+        """收集通配路径匹配的值，堆叠为一个 ndarray。
+        例如 Path("time_slice/*/global_quantities/ip").gather(target) 返回形状为 (n,) 的数组，
+        Path("time_slice/*/profiles_1d/psi").gather(target) 返回形状为 (n, m) 的数组。
+        - "*" 或 slice（例如 ["time_slice", slice(0, 10), ...]）可以出现多次，结果的前几维依次对应各层通配
+        - 缺失值以 fill_value 填充（数组值以同形状数组填充）
+        - 各值形状不一致（ragged）时，返回 dtype=object 的一维数组
+        - 无匹配时返回 default_value
+        """
+        return Path._project(Path._stack(Path._gather(target, self[:]), fill_value), *p_args, **p_kwargs)
+
+    @staticmethod
+    def _wildcard(path: typing.List[PathItemLike]) -> int | None:
+        """返回路径中第一个通配符（Path.tags.children 或 slice）的位置，无通配符时返回 None"""
+        for pos, p in enumerate(path):
+            if p is Path.tags.children or isinstance(p, slice):
+                return pos
+        return None
+
+    @staticmethod
+    def _static_prefix(path: typing.Iterable[PathItemLike]) -> typing.Tuple[str | int, ...]:
+        """返回路径中第一个非 str/int 项（查询、通配符、append 等）之前的部分，可用作 dict 的 key"""
+        prefix = []
+        for p in path:
+            if not isinstance(p, (str, int)):
+                break
+            prefix.append(p)
+        return tuple(prefix)
+
+    @staticmethod
+    def _gather(target, path: typing.List[PathItemLike]) -> typing.Any:
+        pos = Path._wildcard(path)
+
+        if pos is None:
+            return Path._find(target, path)
+
+        container = Path._find(target, path[:pos]) if pos > 0 else target
+
+        if container is _not_found_ or container is None:
+            return _not_found_
+
+        rest = path[pos + 1 :]
+
+        if isinstance(path[pos], slice):
+            children = Path._get(container, path[pos])
+            if not isinstance(children, collections.abc.Sequence):
+                return _not_found_
+            return [Path._gather(child, rest) for child in children]
+
+        return [Path._gather(child, rest) for _, child in Path._children(container)]
+
+    @staticmethod
+    def _stack(values: typing.Any, fill_value=np.nan) -> np.ndarray | typing.Any:
+        """将 _gather 返回的嵌套 list 堆叠为 ndarray"""
+        if not isinstance(values, list):
+            return values
+
+        leaves = []
+        stack = [values]
+        while len(stack) > 0:
+            v = stack.pop()
+            if isinstance(v, list):
+                stack.extend(v)
+            elif v is not _not_found_:
+                leaves.append(v)
+
+        if len(leaves) == 0:
+            return _not_found_
+
+        ref = np.asarray(leaves[-1])
+        missing = np.full(ref.shape, fill_value) if ref.ndim > 0 else fill_value
+
+        def _fill(v):
+            if isinstance(v, list):
+                return [_fill(d) for d in v]
+            return missing if v is _not_found_ else v
+
+        values = _fill(values)
+
+        try:
+            res = np.asarray(values)
+        except ValueError:
+            res = None
+
+        if res is None or (res.dtype == object and ref.dtype != object):
+            res = np.empty(len(values), dtype=object)
+            for idx, v in enumerate(values):
+                res[idx] = v
+
+        return res
+
+    def compile(self) -> typing.Callable[..., typing.Any]:
+        """将路径编译为访问函数 accessor(target, default_value=_not_found_)。
+        - 当路径只包含 str/int 时，返回直接调用 Path._walk 的闭包，不再解析路径
+        - 否则退化为 Path._find
+        """
+        return Path._compile(tuple(self))
+
+    @staticmethod
+    def _compile(items: tuple) -> typing.Callable[..., typing.Any]:
+        if not all(isinstance(p, (str, int)) for p in items):
+            items = list(items)
+
+            def accessor(target, *p_args, **p_kwargs):
+                return Path._find(target, items[:], *p_args, **p_kwargs)
+
+        else:
+
+            def accessor(target, *p_args, default_value=_not_found_, **p_kwargs):
+                target, _ = Path._walk(target, items)
+                return Path._project(target, *p_args, default_value=default_value, **p_kwargs)
+
+        accessor.__qualname__ = f"Path.accessor[{Path._to_str(list(items))}]"
+        return accessor
+
     ###########################################################
 
     @staticmethod
@@ -542,6 +744,9 @@ class Path(list):
             elif target is _not_found_:
                 if key is None:
                     target = value
+                elif isinstance(key, int) and key > SP_SPARSE_LIST_THRESHOLD:
+                    target = SparseList(length=key)
+                    target.append(value)
                 elif isinstance(key, int):
                     target = [_not_found_] * (key) + [value]
                 elif isinstance(key, slice):
@@ -556,7 +761,13 @@ class Path(list):
                 if key is None:
                     target = value
                 elif isinstance(key, int):
-                    if len(target) < key + 1:
+                    if len(target) >= key + 1:
+                        pass
+                    elif isinstance(target, SparseList):
+                        target.resize(key + 1)
+                    elif Path._is_sparse(len(target), key + 1) and target.__class__ is list:
+                        target = SparseList(target, length=key + 1)
+                    else:
                         target.extend([_not_found_] * (key + 1 - len(target)))
                     target[key] = value
                 elif isinstance(key, slice):
@@ -567,6 +778,12 @@ class Path(list):
                     target.append(value)
                 elif key is Path.tags.extend:
                     target.extend(value)
+                elif isinstance(target, IndexedList) and isinstance(key, str):
+                    for idx in target.lookup_all(Path.id_tag_name, key):
+                        node = target[idx]
+                        new_node = Path._update(node, [], value)
+                        if new_node is not node:
+                            target[idx] = new_node
                 elif isinstance(key, (str, dict)):
                     query = as_query(key)
                     for idx, node in enumerate(target):
@@ -624,7 +841,10 @@ class Path(list):
             args = tuple()
             kwargs = {}
         elif isinstance(target, collections.abc.Mapping):
-            res = target.get(key, _not_found_)
+            if isinstance(key, Query) and Query._is_columnar(target):
+                res = key.filter(target)
+            else:
+                res = target.get(key, _not_found_)
         elif isinstance(target, collections.abc.Sequence) and isinstance(key, int):
             if key >= len(target):
                 res = _not_found_
@@ -634,15 +854,19 @@ class Path(list):
             res = target[*key]
         elif isinstance(target, collections.abc.Sequence) and isinstance(key, slice):
             res = target[key]
+        elif isinstance(target, IndexedList) and isinstance(key, str):
+            res = target.lookup(Path.id_tag_name, key)
         elif isinstance(target, collections.abc.Sequence) and isinstance(key, (str)):
             query = as_query(name=key)
             try:
                 res = next(filter(query.check, target))
             except StopIteration:
                 res = _not_found_
+        elif isinstance(target, IndexedList) and isinstance(key, Query) and Path._indexed_field(target, key):
+            field, value = key.equality()
+            res = [target[idx] for idx in target.lookup_all(field, value)]
         elif isinstance(target, collections.abc.Sequence) and isinstance(key, Query):
-            query = as_query(key)
-            res = [*filter(query.check, target)]
+            res = key.filter(target)
         elif isinstance(target, object) and isinstance(key, str) and key.isidentifier():
             res = getattr(target, key, _not_found_)
         elif isinstance(target, np.ndarray) and isinstance(key, (int, slice)):
@@ -653,6 +877,17 @@ class Path(list):
         res = Path._project(res, *args, **kwargs)
         return res
 
+    @staticmethod
+    def _is_sparse(filled: int, length: int) -> bool:
+        """扩展到 length 需要填充的空位超过 SP_SPARSE_LIST_THRESHOLD，且有效元素不足一半时，改用 SparseList"""
+        return length - filled > SP_SPARSE_LIST_THRESHOLD and filled * 2 < length
+
+    @staticmethod
+    def _indexed_field(target: IndexedList, query: Query) -> bool:
+        """query 是否为可以使用 target 索引的等值查询"""
+        eq = query.equality()
+        return eq is not None and (eq[0] == Path.id_tag_name or eq[0] in target.index_fields)
+
     @staticmethod
     def _insert(target, path: typing.List[PathItemLike], *args, **kwargs):
         return Path._update(target, path + [Path.tags.append], *args, **kwargs)
@@ -736,8 +971,11 @@ class Path(list):
 
     @staticmethod
     def _project(target: typing.Any, *p_args, **p_kwargs):
-        """
-        TODO: 更多操作，例如，排序，过滤，分组，聚合等
+        """对查找结果进行投影。
+        - Query.tags.reduce: 聚合，例如 Path("time_slice").find(target, Query.tags.reduce, op="max", key="ip")
+            支持 count/sum/min/max/mean/std/argmin/argmax/first/last，以及 group_by 分组
+        - Query.tags.sort: 按 key 排序，例如 Path("coil").find(target, Query.tags.sort, key="current")
+        - Query.tags.count: 计数
         """
 
         if len(p_args) == 0:
@@ -778,9 +1016,37 @@ class Path(list):
 
         return res
 
+    @staticmethod
+    def _walk(target, path: typing.List[PathItemLike]) -> typing.Tuple[typing.Any, int]:
+        """快速路径：非递归地逐级访问 str/int/None 节点，遇到其他类型的 key 时停止。
+        返回 (当前节点, 停止位置)，剩余路径 path[pos:] 交由通用逻辑处理。
+        """
+        pos = 0
+        for key in path:
+            tp = key.__class__
+            if key is None:
+                pass
+            elif tp is not str and tp is not int:
+                break
+            elif target is _not_found_ or target is None:
+                pass
+            elif target.__class__ is dict and (tp is int or key not in _dict_members):
+                target = target.get(key, _not_found_)
+            elif target.__class__ is list and tp is int:
+                target = target[key] if key < len(target) else _not_found_
+            else:
+                target = Path._get(target, key)
+            pos += 1
+        return target, pos
+
     @staticmethod
     def _find(target, path: typing.List[PathItemLike], *p_args, **p_kwargs):
 
+        target, pos = Path._walk(target, path)
+
+        if pos > 0:
+            path = path[pos:]
+
         key = path[0] if len(path) > 0 else _not_found_
 
         sub_path = path[1:]
@@ -835,6 +1101,65 @@ class Path(list):
 
         return value
 
+    @staticmethod
+    def _children(target) -> typing.Iterable[typing.Tuple[PathItemLike, typing.Any]]:
+        """枚举子节点 (key, value)，叶节点返回空。
+        - Mapping (dict, Dict): key 和 value
+        - Sequence (list, List): 序号和元素
+        - Entry: key 和 child entry
+        """
+        cls = target.__class__
+        if cls is dict:
+            return target.items()
+        elif cls is list:
+            return enumerate(target)
+        elif target is _not_found_ or target is None or cls in _leaf_types or isinstance(target, (str, np.ndarray)):
+            return ()
+        elif isinstance(target, collections.abc.Mapping):
+            return target.items()
+        elif isinstance(target, collections.abc.Sequence):
+            return enumerate(target)
+        elif hasattr(target.__class__, "child") and hasattr(target.__class__, "keys"):
+            if target.is_leaf:
+                return ()
+            return ((k, target.child(k)) for k in target.keys())
+        else:
+            return ()
+
+    @staticmethod
+    def _descendants(
+        target,
+        max_depth: int | None = None,
+        prune: typing.Callable[[list, typing.Any], bool] | None = None,
+        with_path: bool = True,
+    ) -> typing.Generator[typing.Tuple[list | None, typing.Any], None, None]:
+        """非递归遍历所有子孙节点 (深度优先，前序)，每个节点只访问一次，返回 (相对路径, 节点)
+
+        Args:
+            max_depth: 最大深度，子节点深度为 1。None 表示不限制
+            prune: 剪枝谓词 prune(path, node)，返回 True 时跳过该节点及其子树
+            with_path: 为 False 且没有 prune 时不构建相对路径（返回 None），遍历深树时避免复制路径
+        """
+        with_path = with_path or prune is not None
+        stack = [(0, [], iter(Path._children(target)))]
+        while len(stack) > 0:
+            depth, prefix, it = stack[-1]
+            try:
+                key, node = next(it)
+            except StopIteration:
+                stack.pop()
+                continue
+
+            path = prefix + [key] if with_path else None
+
+            if prune is not None and prune(path, node):
+                continue
+
+            yield path, node
+
+            if max_depth is None or depth + 1 < max_depth:
+                stack.append((depth + 1, path, iter(Path._children(node))))
+
     @staticmethod
     def _search(
         target, path: typing.List[PathItemLike], *p_args, **p_kwargs
@@ -848,7 +1173,7 @@ class Path(list):
             - level 参数，用于实现多层遍历，尚未实现
         """
         if target is _not_found_ or target is None:
-            yield path, Path._project(target, *p_args, **p_kwargs)
+            return
 
         elif path is None or len(path) == 0:
 
@@ -925,17 +1250,104 @@ class Path(list):
                     yield from Path._search(child, sub_path, *p_args, **p_kwargs)
 
             elif key is Path.tags.descendants:
-                for child in Path._search(target, Path.tags.children):
-                    yield from Path._search(child, sub_path, *p_args, **p_kwargs)
-                    yield from Path._search(child, [Path.tags.children] + sub_path, *p_args, **p_kwargs)
+                max_depth = p_kwargs.pop("max_depth", None)
+                prune = p_kwargs.pop("prune", None)
+                for _, child in Path._descendants(target, max_depth=max_depth, prune=prune, with_path=False):
+                    if len(sub_path) == 0:
+                        yield Path._project(child, *p_args, **p_kwargs)
+                    else:
+                        yield from Path._search(child, sub_path, *p_args, **p_kwargs)
 
             elif isinstance(key, (str, int)):
                 yield from Path._search(Path._get(target, key), sub_path, *p_args, **p_kwargs)
 
+            elif isinstance(key, Query) and isinstance(target, collections.abc.Sequence):
+                if isinstance(target, IndexedList) and Path._indexed_field(target, key):
+                    nodes = Path._get(target, key)
+                else:
+                    nodes = key.filter(target)
+                for node in nodes:
+                    if len(sub_path) == 0:
+                        yield Path._project(node, *p_args, **p_kwargs)
+                    else:
+                        yield from Path._search(node, sub_path, *p_args, **p_kwargs)
+
             else:
                 raise KeyError(f"Can not search {target} by {key}")
 
 
+class FrozenPath(Path):
+    """不可变（immutable）的 Path
+    - 创建后不可修改，append/extend/__truediv__ 返回新的 FrozenPath，不改变自身
+    - 缓存 __str__ 和 __hash__
+    - copy/deepcopy 返回自身
+    用于 Entry 等频繁派生子路径的场合，避免每一步导航都复制路径。
+    """
+
+    __slots__ = ("_str", "_hash")  # 惰性缓存，未计算时不存在
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"'{self.__class__.__name__}' is immutable!")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    clear = _readonly
+    sort = _readonly
+    reverse = _readonly
+    remove = _readonly
+
+    def __str__(self) -> str:
+        try:
+            return self._str
+        except AttributeError:
+            self._str = Path._to_str(self)
+            return self._str
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(self.__str__())
+            return self._hash
+
+    def __copy__(self) -> typing.Self:
+        return self
+
+    def __deepcopy__(self, memo=None) -> typing.Self:
+        return self
+
+    def __reduce__(self):
+        return (self.__class__._from_items, (self[:],))
+
+    def freeze(self) -> typing.Self:
+        return self
+
+    def as_url(self) -> str:
+        return self.__str__()
+
+    @property
+    def parent(self) -> typing.Self:
+        if len(self) == 0:
+            logger.warning("Root node hasn't parents")
+            return self
+        return self._from_items(self[:-1])
+
+    def append(self, d) -> typing.Self:
+        return self._from_items(Path._resolve(Path._parser_iter(d), self[:]))
+
+    def extend(self, d: list) -> typing.Self:
+        return self._from_items(Path._resolve(d, self[:]))
+
+    def __iadd__(self, p) -> typing.Self:
+        return self.append(p)
+
+    def with_suffix(self, pth: str) -> typing.Self:
+        return Path._from_items(self[:]).with_suffix(pth).freeze()
+
+
 _T = typing.TypeVar("_T")
 
 
@@ -947,6 +1359,18 @@ def merge_tree(*args, **kwargs) -> _T:
     return update_tree({}, *args, **kwargs)
 
 
+@functools.lru_cache(maxsize=SP_PATH_CACHE_SIZE)
+def _compile_str(path: str) -> typing.Callable[..., typing.Any]:
+    return Path(path).compile()
+
+
+def compile_path(path: PathLike) -> typing.Callable[..., typing.Any]:
+    """返回路径的访问函数，字符串路径的编译结果被缓存"""
+    if isinstance(path, str):
+        return _compile_str(path)
+    return as_path(path).compile()
+
+
 def as_path(*args):
     if len(args) == 0:
         return Path()
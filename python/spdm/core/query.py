@@ -1,4 +1,5 @@
 import collections.abc
+import operator
 import typing
 from enum import Flag, auto
 import numpy as np
@@ -50,13 +51,16 @@ class Query:
         else:
             self._query = Query._parser(query, **kwargs)
 
+        self._predicate = None
+        self._columns = _not_found_
+
     def __str__(self) -> str:
         p = self._query
 
         if not isinstance(p, dict):
             return str(p)
         else:
-            m_str = ",".join([f"{k}={Path._to_str(v)}" for k, v in p.items()])
+            m_str = ",".join([f"{k}={v}" for k, v in p.items()])
             return f"?{m_str} "
 
     def __equal__(self, other: typing.Self) -> bool:
@@ -77,7 +81,7 @@ class Query:
             query = {"@id": query}
 
         elif isinstance(query, dict):
-            query = {k: Query._parser(v) for k, v in query.items()}
+            query = {k: (v if not isinstance(v, Query.tags) else f"${v.name}") for k, v in query.items()}
 
         elif isinstance(query, slice):
             pass
@@ -92,35 +96,257 @@ class Query:
     def __call__(self, target, *args, **kwargs) -> typing.Any:
         return self.check(target, *args, **kwargs)
 
+    def check(self, target) -> bool:
+        """判断 target 是否满足查询条件"""
+        if self._predicate is None:
+            self._predicate = Query._compile(self._query)
+        return self._predicate(target)
+
+    def mask(self, target: typing.Sequence | typing.Mapping) -> np.ndarray | None:
+        """向量化地计算查询条件，返回布尔掩码。
+        - target 为元素均为 dict 的 list 时，按 key 收集为列后一次比较
+        - target 为列存储（columnar）的 dict，即 {key: ndarray} 且各数组长度相同时，直接在列上比较
+        条件不可向量化（例如嵌套查询、属性查询）或列不是简单数组时返回 None。
+        """
+        if self._columns is _not_found_:
+            self._columns = Query._compile_columns(self._query)
+
+        if self._columns is None:
+            return None
+
+        if Query._is_columnar(target):
+            columns = {k: np.asarray(target.get(k)) for k, _ in self._columns if k in target}
+            size = len(next(iter(target.values()))) if len(target) > 0 else 0
+        elif isinstance(target, list) and all(d.__class__ is dict for d in target):
+            columns = {k: np.asarray([d.get(k, None) for d in target]) for k, _ in self._columns}
+            size = len(target)
+        else:
+            return None
+
+        mask = np.ones(size, dtype=bool)
+        for key, ops in self._columns:
+            column = columns.get(key, None)
+            if column is None or column.dtype == object or column.shape != (size,):
+                return None
+            for op, value in ops:
+                try:
+                    mask &= op(column, value)
+                except TypeError:  # 类型不可比较（包括 numpy 的 UFuncTypeError），交由逐个元素判断
+                    return None
+        return mask
+
+    def filter(self, target: typing.Sequence | typing.Mapping) -> list | dict:
+        """返回满足条件的元素。列存储 target 返回各列被选中的部分"""
+        mask = self.mask(target)
+        if mask is None and Query._is_columnar(target):
+            size = len(next(iter(target.values())))
+            mask = np.array([self.check({k: v[idx] for k, v in target.items()}) for idx in range(size)], dtype=bool)
+        if mask is None:
+            return [v for v in target if self.check(v)]
+        elif isinstance(target, collections.abc.Mapping):
+            return {k: np.asarray(v)[mask] for k, v in target.items()}
+        else:
+            return [target[idx] for idx in np.flatnonzero(mask)]
+
+    def equality(self) -> typing.Tuple[str, typing.Any] | None:
+        """若查询为单一字段的等值条件 {field: value} 或 {field: {"$eq": value}}，返回 (field, value)，否则返回 None"""
+        if not isinstance(self._query, dict) or len(self._query) != 1:
+            return None
+        field, value = next(iter(self._query.items()))
+        if not isinstance(field, str) or field == "." or "/" in field:
+            return None
+        if isinstance(value, dict):
+            if len(value) != 1 or "$eq" not in value:
+                return None
+            value = value["$eq"]
+        if isinstance(value, (dict, Query.tags)) or (isinstance(value, str) and value.startswith("$")):
+            return None
+        return field, value
+
     @staticmethod
-    def _eval_one(target, k, v) -> typing.Any:
-        res = False
-        if isinstance(k, str):
-            if k.startswith("@") and hasattr(target.__class__, k[1:]):
-                res = Query._q_equal(getattr(target, k[1:], _not_found_), v)
+    def _is_columnar(target) -> bool:
+        if not isinstance(target, collections.abc.Mapping) or len(target) == 0:
+            return False
+        size = None
+        for v in target.values():
+            if not isinstance(v, np.ndarray) or v.ndim == 0:
+                return False
+            elif size is None:
+                size = v.shape[0]
+            elif v.shape[0] != size:
+                return False
+        return True
 
-            elif isinstance(target, collections.abc.Mapping):
-                res = Query._q_equal(target.get(k, _not_found_), v)
+    ####################################################
+    # compile
 
-        return res
+    @staticmethod
+    def _q_eq(target, value) -> bool:
+        if target is _not_found_:
+            return False
+        elif isinstance(target, np.ndarray) or isinstance(value, np.ndarray):
+            return bool(np.array_equal(target, value))
+        elif isinstance(target, (list, tuple)) and not isinstance(value, (list, tuple)):
+            return value in target
+        else:
+            return bool(target == value)
 
-    def _eval(self, target) -> bool:
-        return all([Query._eval_one(target, k, v) for k, v in self._query.items()])
+    @staticmethod
+    def _q_cmp(op):
+        def _cmp(target, value) -> bool:
+            if target is _not_found_ or target is None:
+                return False
+            try:
+                return bool(op(target, value))
+            except TypeError:
+                return False
+
+        return _cmp
+
+    _ops = {
+        "$eq": lambda x, v: Query._q_eq(x, v),
+        "$ne": lambda x, v: not Query._q_eq(x, v),
+        "$lt": _q_cmp(operator.lt),
+        "$le": _q_cmp(operator.le),
+        "$gt": _q_cmp(operator.gt),
+        "$ge": _q_cmp(operator.ge),
+        "$in": lambda x, v: x is not _not_found_ and x in v,
+        "$nin": lambda x, v: x is _not_found_ or x not in v,
+        "$exists": lambda x, v: (x is not _not_found_) == bool(v),
+    }
+
+    _vector_ops = {
+        "$eq": np.equal,
+        "$ne": np.not_equal,
+        "$lt": np.less,
+        "$le": np.less_equal,
+        "$gt": np.greater,
+        "$ge": np.greater_equal,
+        "$in": np.isin,
+        "$nin": lambda x, v: ~np.isin(x, v),
+    }
 
-    def check(self, target) -> bool:
-        res = self._eval(target)
+    @staticmethod
+    def _is_op_dict(value) -> bool:
+        return isinstance(value, dict) and len(value) > 0 and all(isinstance(k, str) and k.startswith("$") for k in value)
+
+    @staticmethod
+    def _compile(query) -> typing.Callable[[typing.Any], bool]:
+        """将解析后的查询编译为谓词函数 predicate(target) -> bool"""
+        if not isinstance(query, dict):
+            raise TypeError(f"Can not compile query {query}")
+
+        preds = [p for p in (Query._compile_item(k, v) for k, v in query.items()) if p is not None]
 
-        if isinstance(res, list):
-            return all(res)
+        if len(preds) == 0:
+            return lambda target: True
+        elif len(preds) == 1:
+            return preds[0]
         else:
-            return bool(res)
+            return lambda target: all(p(target) for p in preds)
 
     @staticmethod
-    def _q_equal(target, value) -> bool:
-        if isinstance(target, collections.abc.Sequence):
-            return value in target
+    def _compile_item(key, value) -> typing.Callable[[typing.Any], bool] | None:
+        test = Query._compile_value(value)
+        if test is None:
+            return None
+
+        if key == ".":
+            return test
+
+        getter = Query._compile_getter(key)
+        return lambda target: test(getter(target))
+
+    @staticmethod
+    def _compile_getter(key) -> typing.Callable[[typing.Any], typing.Any]:
+        if isinstance(key, str) and key.startswith("@"):
+            attr = key[1:]
+
+            def getter(target):
+                if hasattr(target.__class__, attr):
+                    return getattr(target, attr, _not_found_)
+                elif isinstance(target, collections.abc.Mapping):
+                    return target.get(key, _not_found_)
+                else:
+                    return _not_found_
+
+        elif isinstance(key, str) and "/" in key:
+            keys = [k for k in key.split("/") if k != ""]
+
+            def getter(target):
+                for k in keys:
+                    if not isinstance(target, collections.abc.Mapping):
+                        return _not_found_
+                    target = target.get(k, _not_found_)
+                return target
+
+        else:
+
+            def getter(target):
+                if target.__class__ is dict or isinstance(target, collections.abc.Mapping):
+                    return target.get(key, _not_found_)
+                else:
+                    return _not_found_
+
+        return getter
+
+    @staticmethod
+    def _compile_value(value) -> typing.Callable[[typing.Any], bool] | None:
+        if isinstance(value, Query.tags):
+            value = f"${value.name}"
+
+        if isinstance(value, str) and value.startswith("$"):
+            if value == "$get_value":
+                return None
+            func = getattr(Query, value[1:], None)
+            if not callable(func):
+                raise ValueError(f"Unknown query operator {value}")
+            return lambda target: bool(func(target))
+
+        elif Query._is_op_dict(value):
+            tests = []
+            for op, v in value.items():
+                func = Query._ops.get(op, None)
+                if func is None:
+                    raise ValueError(f"Unknown query operator {op}")
+                tests.append((func, v))
+            if len(tests) == 1:
+                func, v = tests[0]
+                return lambda target: func(target, v)
+            return lambda target: all(func(target, v) for func, v in tests)
+
+        elif isinstance(value, dict):
+            sub = Query._compile(value)
+            return lambda target: target is not _not_found_ and sub(target)
+
         else:
-            return target == value
+            return lambda target: Query._q_eq(target, value)
+
+    @staticmethod
+    def _compile_columns(query) -> typing.List[typing.Tuple[str, list]] | None:
+        """将查询编译为列上的向量操作 [(key, [(ufunc, value), ...])]，不可向量化时返回 None"""
+        if not isinstance(query, dict) or len(query) == 0:
+            return None
+
+        columns = []
+        for key, value in query.items():
+            if not isinstance(key, str) or key == "." or "/" in key:
+                return None
+            elif key.startswith("@") and hasattr(dict, key[1:]):
+                return None
+
+            if Query._is_op_dict(value):
+                if not all(op in Query._vector_ops for op in value):
+                    return None
+                ops = [(Query._vector_ops[op], v) for op, v in value.items()]
+            elif isinstance(value, (str, int, float, np.generic)):
+                ops = [(np.equal, value)]
+            else:
+                return None
+
+            columns.append((key, ops))
+
+        return columns
 
     # fmt: off
     _q_neg         =np.negative   
@@ -170,7 +396,7 @@ class Query:
 
     @staticmethod
     def is_leaf(source: typing.Any, *args, **kwargs) -> bool:
-        return not isinstance(source, (collections.abc.Mapping, collections.abc.Sequence))
+        return isinstance(source, str) or not isinstance(source, (collections.abc.Mapping, collections.abc.Sequence))
 
     @staticmethod
     def is_list(source: typing.Any, *args, **kwargs) -> bool:
@@ -195,6 +421,197 @@ class Query:
         else:
             return 1
 
+    _op_count = count
+
+    ####################################################
+    # aggregation
+
+    _reducers = {
+        "count": len,
+        "sum": np.sum,
+        "min": np.min,
+        "max": np.max,
+        "mean": np.mean,
+        "std": np.std,
+        "argmin": np.argmin,
+        "argmax": np.argmax,
+        "first": lambda v: v[0],
+        "last": lambda v: v[-1],
+    }
+
+    @staticmethod
+    def _gather(source: typing.Any, key=None) -> list | np.ndarray:
+        """收集 source 各元素在 key 处的值，与元素一一对应，缺失值为 _not_found_。
+        - 列存储（columnar）dict 直接返回 key 对应的列
+        - 其他 Mapping 按 values() 收集
+        """
+        if source is _not_found_ or source is None:
+            return []
+        elif Query._is_columnar(source):
+            return source.get(key, []) if key is not None else next(iter(source.values()))
+        elif isinstance(source, collections.abc.Mapping):
+            source = list(source.values())
+        elif isinstance(source, np.ndarray) and key is None:
+            return source
+        elif not isinstance(source, collections.abc.Sequence) or isinstance(source, str):
+            source = [source]
+
+        if key is None:
+            return source if isinstance(source, list) else list(source)
+
+        getter = Query._compile_getter(key)
+        return [getter(v) for v in source]
+
+    @staticmethod
+    def _as_array(values: list | np.ndarray, kinds: str = "biufcmMU") -> np.ndarray | None:
+        """转换为 ndarray，含缺失值或 dtype.kind 不在 kinds 中（例如非数值）时返回 None"""
+        if isinstance(values, np.ndarray):
+            return values if values.dtype.kind in kinds else None
+        try:
+            array = np.asarray(values)
+        except (ValueError, TypeError):
+            return None
+        return array if array.dtype.kind in kinds else None
+
+    # 非数值列的聚合，逐个比较元素
+    _py_reducers = {
+        "min": min,
+        "max": max,
+        "argmin": lambda v: min(range(len(v)), key=v.__getitem__),
+        "argmax": lambda v: max(range(len(v)), key=v.__getitem__),
+        "first": lambda v: v[0],
+        "last": lambda v: v[-1],
+    }
+
+    @staticmethod
+    def _reduce(values: list | np.ndarray, op, default_value=_not_found_) -> typing.Any:
+        """聚合 values。缺失值（_not_found_, None）不参与计算，argmin/argmax 返回在 values 中的序号"""
+        kept = None
+        if not isinstance(values, np.ndarray):
+            kept = [idx for idx, v in enumerate(values) if v is not _not_found_ and v is not None]
+            values = [values[idx] for idx in kept]
+
+        if op == "count":
+            return len(values)
+        elif len(values) == 0:
+            return default_value
+
+        reducer = Query._reducers.get(op, op) if isinstance(op, str) else op
+
+        if not callable(reducer):
+            raise ValueError(f"Unknown reduce operator {op}")
+
+        array = Query._as_array(values, kinds="biufc")
+
+        if array is not None:
+            res = reducer(array)
+        elif not isinstance(op, str):
+            res = reducer(values)
+        elif op in Query._py_reducers:
+            try:
+                res = Query._py_reducers[op](list(values))
+            except TypeError:  # 元素不可比较
+                return default_value
+        else:
+            return default_value
+
+        if kept is not None and op in ("argmin", "argmax"):
+            res = kept[int(res)]
+
+        return res
+
+    @staticmethod
+    def _op_reduce(
+        source: typing.Any, op="sum", key=None, group_by=None, default_value=_not_found_, **kwargs
+    ) -> typing.Any:
+        """聚合 source 各元素在 key 处的值。
+        op: "count", "sum", "min", "max", "mean", "std", "argmin", "argmax", "first", "last" 或函数
+        group_by: 按 group_by 处的值分组，返回 {group: 聚合值}；op 为 None 时返回 {group: [元素,...]}
+        数值列以 numpy 向量化计算。若 source 定义了 __aggregate__，则交由其完成（例如在后端完成聚合）。
+        """
+        if hasattr(source.__class__, "__aggregate__"):
+            return source.__aggregate__(
+                Query.tags.reduce, op=op, key=key, group_by=group_by, default_value=default_value, **kwargs
+            )
+
+        if group_by is None:
+            return Query._reduce(Query._gather(source, key), op, default_value=default_value)
+
+        groups = Query._gather(source, group_by)
+
+        if op is None:
+            values = Query._gather(source)
+        else:
+            values = Query._gather(source, key)
+
+        g_array = Query._as_array(groups)
+
+        if g_array is not None and g_array.ndim == 1:
+            labels, inverse = np.unique(g_array, return_inverse=True)
+            if op is None or not isinstance(values, np.ndarray):
+                members = [[] for _ in labels]
+                for idx, g in enumerate(inverse):
+                    members[g].append(values[idx])
+            else:
+                members = [values[inverse == g] for g in range(len(labels))]
+            labels = labels.tolist()
+        else:
+            labels = []
+            members = []
+            positions = {}
+            for g, v in zip(groups, values):
+                if g is _not_found_:
+                    continue
+                pos = positions.get(g, None)
+                if pos is None:
+                    pos = positions[g] = len(labels)
+                    labels.append(g)
+                    members.append([])
+                members[pos].append(v)
+
+        if op is None:
+            return dict(zip(labels, members))
+        else:
+            return {g: Query._reduce(m, op, default_value=default_value) for g, m in zip(labels, members)}
+
+    @staticmethod
+    def _op_sort(source: typing.Any, key=None, reverse: bool = False, **kwargs) -> typing.Any:
+        """按 key 处的值排序（稳定排序），缺失值排在最后。列存储 dict 对各列按同一顺序重排"""
+        if hasattr(source.__class__, "__aggregate__"):
+            return source.__aggregate__(Query.tags.sort, key=key, reverse=reverse, **kwargs)
+
+        if source is _not_found_ or source is None:
+            return source
+
+        values = Query._gather(source, key)
+
+        array = Query._as_array(values)
+
+        if array is not None and array.ndim == 1:
+            if not reverse:
+                order = np.argsort(array, kind="stable")
+            else:  # 稳定的降序：对逆序的数组排序后再逆序，相等的元素保持原来的顺序
+                order = len(array) - 1 - np.argsort(array[::-1], kind="stable")[::-1]
+            if array.dtype.kind in "fc":  # NaN 视为缺失值，排在最后
+                nan = np.isnan(array[order])
+                order = np.concatenate([order[~nan], order[nan]])
+        else:
+            missing = [v is _not_found_ or v is None for v in values]
+            present = sorted(
+                (idx for idx in range(len(values)) if not missing[idx]), key=lambda idx: values[idx], reverse=reverse
+            )
+            order = present + [idx for idx in range(len(values)) if missing[idx]]
+
+        if Query._is_columnar(source):
+            return {k: v[order] for k, v in source.items()}
+        elif isinstance(source, np.ndarray):
+            return source[order]
+        elif isinstance(source, collections.abc.Mapping):
+            items = list(source.items())
+            return dict(items[idx] for idx in order)
+        else:
+            return [source[idx] for idx in order]
+
     @staticmethod
     def fetch(source: typing.Any, *args, default_value=_not_found_, **kwargs) -> bool:
         if source is _not_found_:
@@ -1,8 +1,7 @@
 import typing
 
 from spdm.utils.tags import _not_found_
-from spdm.core.path import Path
-from spdm.core.entry import as_entry
+from spdm.core.entry import Entry, EntryOverlay, as_entry
 from spdm.core.htree import HTreeNode
 from spdm.core.sp_tree import SpTree
 from spdm.core.pluggable import Pluggable
@@ -28,24 +27,29 @@ class SpObject(Pluggable, SpTree):
         return super().__new__(cls, *args, _plugin_name=plugin_name, **kwargs)
 
     def __init__(self, *args, _entry=None, _parent=None, **kwargs):
-
+        """参数 args 作为只读的覆盖层（overlay, 见 EntryOverlay），在缓存未命中时查找，
+        后面的参数优先，dict 逐层递归合并，不复制、不修改参数。kwargs 作为本对象的缓存，写入只修改缓存。
+        """
+        layers = []
         entries = []
-        cache = {}
         for a in args:
             if isinstance(a, HTreeNode):
+                a._share()  # a 此后写入时复制，覆盖层中的数据保持不变
+                if a._cache is not _not_found_:
+                    layers.append(Entry(a._cache))
                 entries.append(a._entry)
-                cache = Path().update(cache, a._cache)
             elif isinstance(a, dict):
                 entries.append(a.pop("$entry", _not_found_))
-                cache = Path().update(cache, a)
+                layers.append(Entry(a))
             elif a is not _not_found_:
                 entries.append(a)
 
         entries.append(_entry)
 
-        cache = Path().update(cache, kwargs)
+        if len(layers) > 1:
+            layers = [EntryOverlay(*reversed(layers))]
 
-        super().__init__(cache, _entry=as_entry(entries), _parent=_parent)
+        super().__init__(kwargs, _entry=as_entry([*layers, *entries]), _parent=_parent)
 
     name: str
 
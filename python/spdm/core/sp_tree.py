@@ -44,14 +44,47 @@ import inspect
 import typing
 import collections.abc
 from copy import deepcopy
-from _thread import RLock
+from _thread import RLock, allocate_lock
 
 from spdm.utils.logger import logger
 from spdm.utils.tags import _not_found_, _undefined_
-from spdm.core.htree import HTree, HTreeNode, List
+from spdm.core.htree import HTree, HTreeNode, List, class_type_hints, _is_node_of
 from spdm.core.path import Path, as_path
 
 
+class _InstanceLock:
+    """实例级的锁，只在需要时（首次创建子节点、赋值、删除）存在。
+    锁登记在 _locks {id(instance): [lock, count]} 中，持有者全部释放后即移除，
+    因此不占用节点的内存；不同实例的属性访问互不阻塞。
+    """
+
+    _locks: typing.Dict[int, list] = {}
+    _guard = allocate_lock()
+
+    __slots__ = ("_key", "_item")
+
+    def __init__(self, instance) -> None:
+        self._key = id(instance)  # 持有期间 instance 存活，id 不会被复用
+        self._item = None
+
+    def __enter__(self) -> None:
+        with _InstanceLock._guard:
+            item = _InstanceLock._locks.get(self._key, None)
+            if item is None:
+                item = _InstanceLock._locks[self._key] = [RLock(), 0]
+            item[1] += 1
+        self._item = item
+        item[0].acquire()
+
+    def __exit__(self, *args) -> None:
+        item = self._item
+        item[0].release()
+        with _InstanceLock._guard:
+            item[1] -= 1
+            if item[1] == 0:
+                del _InstanceLock._locks[self._key]
+
+
 def _copy(obj, *args, **kwargs):
     if isinstance(obj, dict):
         return {k: _copy(v, *args, **kwargs) for k, v in obj.items()}
@@ -62,7 +95,7 @@ def _copy(obj, *args, **kwargs):
     elif isinstance(obj, SpTree):
         cache = {}
 
-        for k, attr in inspect.getmembers(obj.__class__, lambda c: isinstance(c, SpProperty)):
+        for k, attr in obj.__class__.__sp_properties__.items():
             if attr.getter is None and attr.alias is None:
 
                 value = getattr(obj, k, _not_found_)
@@ -147,12 +180,10 @@ class SpProperty:
         strict : bool
             用于指定是否严格检查属性的值是否已经被赋值
         kwargs : typing.Any
-            用于指定属性的元数据
+            用于指定属性的元数据，例如 prefetch=True 声明节点创建时预取该属性（见 HTreeNode.__prefetch__）
 
         """
 
-        self.lock = RLock()
-
         self.getter = getter
         self.setter = setter
         self.deleter = deleter
@@ -189,7 +220,7 @@ class SpProperty:
 
         if tp is None:
             try:
-                tp = typing.get_type_hints(owner_cls).get(name, None)
+                tp = class_type_hints(owner_cls).get(name, None)
             except Exception as error:
                 logger.exception(owner_cls)
                 raise error
@@ -225,7 +256,7 @@ class SpProperty:
     def __set__(self, instance: HTree, value: typing.Any) -> None:
         assert instance is not None
 
-        with self.lock:
+        with _InstanceLock(instance):
             if self.alias is not None:
                 instance.__set_node__(self.alias, value)
             elif self.property_name is not None:
@@ -233,6 +264,20 @@ class SpProperty:
             else:
                 logger.error("Can not use sp_property instance without calling __set_name__ on it.")
 
+    def _cached(self, instance: HTree):
+        """instance 中已创建的子节点。子节点缓存只保存本属性创建的节点（属性名不会以其他参数访问）。
+        只返回属于 instance 的子节点（_parent 为 instance），快照共享的子节点由加锁路径复制（见 HTreeNode._adopt）"""
+        node_cache = instance._node_cache
+        if node_cache is not None:
+            value = node_cache.get(self.property_name, None)
+            if (
+                value is not None
+                and value._parent is instance
+                and (self.type_hint is None or self.type_hint is _not_found_ or _is_node_of(value, self.type_hint))
+            ):
+                return value
+        return None
+
     def __get__(self, instance: HTree, owner_cls=None):
         if instance is None:
             # 当调用 getter(cls, <name>) 时执行
@@ -240,7 +285,25 @@ class SpProperty:
         elif not isinstance(instance, HTree):
             raise TypeError(f"Class '{instance.__class__.__name__}' must be a subclass of 'HTree'.")
 
-        with self.lock:
+        # 快速路径（无锁）：子节点已创建，或叶节点的值已是目标类型。
+        # 只读取 dict，在 GIL 下是原子的；读到的是赋值前或赋值后的值，与加锁时的结果一致。
+        # 缓存与快照共享（_cow 不为 None）时不使用，由加锁路径复制共享的子节点。
+        if self.alias is None and instance._cow is None:
+            if (value := self._cached(instance)) is not None:
+                return value
+
+            cache = instance._cache
+            if cache.__class__ is dict and not isinstance(self.default_value, dict):
+                value = cache.get(self.property_name, _not_found_)
+                if (
+                    value is not _not_found_
+                    and value.__class__ is self.type_hint
+                    and (not isinstance(value, HTreeNode) or value._parent is instance)
+                ):
+                    return value
+
+        # 首次访问：创建子节点并写回缓存，同一实例上串行执行
+        with _InstanceLock(instance):
             value = _not_found_
             if self.alias is not None:
                 value = self.alias.get(instance, _not_found_)
@@ -256,7 +319,7 @@ class SpProperty:
                         metadata=self.metadata,
                     )
 
-            else:
+            elif (value := self._cached(instance)) is None:  # 等待锁期间其他线程可能已创建
                 value = instance.__get_node__(
                     self.property_name,
                     type_hint=self.type_hint,
@@ -273,7 +336,7 @@ class SpProperty:
         return value
 
     def __delete__(self, instance: HTree) -> None:
-        with self.lock:
+        with _InstanceLock(instance):
             instance.__del_node__(self.property_name, deleter=self.deleter)
 
 
@@ -298,6 +361,8 @@ class WithProperty:
     ==============================================
     根据 type hint 在创建子类时自动添加 SpProperty"""
 
+    __sp_properties__ = {}
+
     def __init_subclass__(cls, default_value: typing.Any = _not_found_, final: bool = True, **kwargs) -> None:
         """根据 cls 的 type hint，为 cls 属性"""
 
@@ -307,7 +372,7 @@ class WithProperty:
         if default_value is _not_found_:
             default_value = {}
 
-        for name, type_hint in typing.get_type_hints(cls).items():
+        for name, type_hint in class_type_hints(cls).items():
             attr = getattr(cls, name, default_value.get(name, _not_found_))
 
             if isinstance(attr, property):
@@ -327,13 +392,13 @@ class WithProperty:
 
         super().__init_subclass__(**kwargs)
 
-        cls.__properties__ = set(
-            [
-                name
-                for name, _ in inspect.getmembers(cls, lambda a: isinstance(a, SpProperty))
-                if not name.startswith("_")
-            ]
-        )
+        members = {}
+        for base in reversed(cls.__mro__):
+            members.update(base.__dict__)
+
+        cls.__sp_properties__ = {name: attr for name, attr in members.items() if isinstance(attr, SpProperty)}
+
+        cls.__properties__ = set(name for name in cls.__sp_properties__ if not name.startswith("_"))
 
     def __getstate__(self) -> dict:
         state = super().__getstate__()
@@ -412,7 +477,7 @@ class WithAttribute:
 
         node = super().__as_node__(*args, **kwargs)
         if node.__class__ is HTree:
-            node = node._entry.get()
+            node = node._entry.get() if node._entry is not None else _not_found_
 
         if node is _not_found_:
             pass
@@ -477,7 +542,7 @@ def sp_tree(cls: _T = None, /, **metadata) -> _T:
 
 class AsDataclass:
     def __init__(self, *args, **kwargs):
-        keys = [*typing.get_type_hints(self.__class__).keys()]
+        keys = [*class_type_hints(self.__class__).keys()]
 
         for idx, value in enumerate(args):
             key = keys[idx]
@@ -507,7 +572,7 @@ def sp_dataclass(cls=None, /, **metadata):
     """
 
     def wrapper(*args, _entry=None, _parent=None, **kwargs):
-        keys = [*typing.get_type_hints(cls).keys()]
+        keys = [*class_type_hints(cls).keys()]
 
         n_cls = _make_sptree(cls, **metadata)
 
@@ -0,0 +1,134 @@
+""" SparseList: 以 dict 存储的稀疏 list，用于按大整数序号写入的稀疏序列 """
+
+import collections.abc
+import typing
+
+from spdm.utils.tags import _not_found_
+
+
+class SparseList(collections.abc.MutableSequence):
+    """稀疏 list
+    ==============================================
+    - 仅存储有效元素 {idx: value}，空位不占用内存
+    - 与以 _not_found_ 填充的 list 语义相同：len 为最大序号+1，空位读取和遍历时返回 _not_found_
+    - 写入 _not_found_ 等价于清空该位置
+    - insert/del 需要平移其后元素的序号，代价为 O(有效元素数)
+    """
+
+    __slots__ = ("_data", "_length")
+
+    def __init__(self, values: typing.Iterable = None, /, length: int = 0):
+        self._data: typing.Dict[int, typing.Any] = {}
+        self._length = 0
+        if values is not None:
+            self.extend(values)
+        if length > self._length:
+            self._length = length
+
+    def __copy__(self) -> typing.Self:
+        other = object.__new__(self.__class__)
+        other._data = dict(self._data)
+        other._length = self._length
+        return other
+
+    def __reduce__(self):
+        return (self.__class__, ((), self._length), (None, {"_data": self._data}))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(length={self._length}, {self._data})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SparseList):
+            return self._length == other._length and self._data == other._data
+        elif isinstance(other, collections.abc.Sequence) and not isinstance(other, str):
+            return len(other) == self._length and all(a is b or a == b for a, b in zip(self, other))
+        else:
+            return False
+
+    def _index(self, idx: int) -> int:
+        if idx < 0:
+            idx += self._length
+        if idx < 0 or idx >= self._length:
+            raise IndexError(f"SparseList index {idx} out of range!")
+        return idx
+
+    @property
+    def fill_ratio(self) -> float:
+        """有效元素所占比例"""
+        return len(self._data) / self._length if self._length > 0 else 1.0
+
+    def items(self) -> typing.Generator[typing.Tuple[int, typing.Any], None, None]:
+        """按序号遍历有效元素 (idx, value)"""
+        for idx in sorted(self._data):
+            yield idx, self._data[idx]
+
+    def resize(self, length: int) -> None:
+        """调整长度，增长时空位为 _not_found_，缩短时丢弃超出的元素"""
+        if length < self._length:
+            self._data = {k: v for k, v in self._data.items() if k < length}
+        self._length = length
+
+    def to_list(self) -> list:
+        """转换为以 _not_found_ 填充的 list"""
+        return list(self)
+
+    # ---------------------------------------------------------------------------------
+    # Sequence API
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> typing.Generator[typing.Any, None, None]:
+        data = self._data
+        for idx in range(self._length):
+            yield data.get(idx, _not_found_)
+
+    def __getitem__(self, idx: int | slice) -> typing.Any:
+        if isinstance(idx, slice):
+            return [self._data.get(i, _not_found_) for i in range(self._length)[idx]]
+        return self._data.get(self._index(idx), _not_found_)
+
+    def __setitem__(self, idx: int | slice, value) -> None:
+        if isinstance(idx, slice):
+            for i, v in zip(range(self._length)[idx], value):
+                self[i] = v
+            return
+
+        idx = self._index(idx)
+        if value is _not_found_:
+            self._data.pop(idx, None)
+        else:
+            self._data[idx] = value
+
+    def __delitem__(self, idx: int | slice) -> None:
+        if isinstance(idx, slice):
+            for i in sorted(range(self._length)[idx], reverse=True):
+                del self[i]
+            return
+
+        idx = self._index(idx)
+        self._data = {(k if k < idx else k - 1): v for k, v in self._data.items() if k != idx}
+        self._length -= 1
+
+    def insert(self, idx: int, value) -> None:
+        if idx < 0:
+            idx = max(idx + self._length, 0)
+        idx = min(idx, self._length)
+        self._data = {(k if k < idx else k + 1): v for k, v in self._data.items()}
+        self._length += 1
+        if value is not _not_found_:
+            self._data[idx] = value
+
+    def append(self, value) -> None:
+        if value is not _not_found_:
+            self._data[self._length] = value
+        self._length += 1
+
+    def extend(self, values: typing.Iterable) -> None:
+        if isinstance(values, SparseList):
+            offset = self._length
+            self._data.update({k + offset: v for k, v in values._data.items()})
+            self._length += values._length
+        else:
+            for value in values:
+                self.append(value)
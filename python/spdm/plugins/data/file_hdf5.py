@@ -8,6 +8,7 @@ import numpy
 
 from spdm.core.file import File
 from spdm.core.path import Path
+from spdm.core.query import Query
 
 from spdm.utils.tags import _not_found_
 
@@ -85,7 +86,26 @@ def h5_put_value(grp, path, value):
     return res
 
 
-def h5_get_value(obj, path=None, projection=None, default_value=_not_found_, **kwargs):
+def h5_delete(grp, path) -> None:
+    """删除 path 处的 group/dataset/attribute，不存在时忽略"""
+    path = path[:] if isinstance(path, Path) else list(path)
+    if len(path) == 0:
+        raise KeyError("Empty path!")
+    try:
+        parent = h5_get_object(grp, path[:-1])
+    except KeyError:
+        return
+    key = f"__index__{path[-1]}" if isinstance(path[-1], int) else path[-1]
+    if not isinstance(parent, h5py.Group):
+        return
+    elif key in parent:
+        del parent[key]
+    elif key in parent.attrs:
+        del parent.attrs[key]
+
+
+def h5_get_object(obj, path=None):
+    """返回 path 处的 group/dataset/attribute，不读取数据"""
     if path is None:
         path = []
     elif isinstance(path, Path):
@@ -97,29 +117,72 @@ def h5_get_value(obj, path=None, projection=None, default_value=_not_found_, **k
         raise RuntimeError("None group")
 
     prefix = []
-    if path is not None:
-        for p in path:
-            if isinstance(p, str):
-                pass
-            elif isinstance(p, int):
-                if p < 0:
-                    num = len(grp)
-                    p = p % num
-                p = f"__index__{p}"
-
-            prefix.append(p)
-
-            if p in obj:
-                obj = obj[p]
-            elif p in obj.attrs:
-                obj = obj.attrs[p]
-            else:
-                raise KeyError(f"Can not search element at {'/'.join(prefix)} !")
+    for p in path:
+        if isinstance(p, str):
+            pass
+        elif isinstance(p, int):
+            if p < 0:
+                num = len(obj)
+                p = p % num
+            p = f"__index__{p}"
+
+        prefix.append(p)
+
+        if p in obj:
+            obj = obj[p]
+        elif p in obj.attrs:
+            obj = obj.attrs[p]
+        else:
+            raise KeyError(f"Can not search element at {'/'.join(prefix)} !")
+
+    return obj
+
+
+def h5_list_keys(grp) -> typing.List[str]:
+    """__is_list__ group 的元素按序号排序"""
+    return sorted(grp, key=lambda k: int(k[len("__index__") :]) if k.startswith("__index__") else -1)
+
+
+def h5_list_items(grp, keys, path) -> list:
+    """__is_list__ group 各元素 path 处的 dataset/attribute，不读取数据，不存在时为 _not_found_"""
+    items = []
+    for k in keys:
+        try:
+            items.append(h5_get_object(grp[k], path))
+        except KeyError:
+            items.append(_not_found_)
+    return items
+
+
+def h5_stack(items) -> numpy.ndarray | None:
+    """items（dataset 或属性值）形状相同且均为数值时，按各项 dtype 的 result_type 一次分配结果数组并逐项读入，
+    否则返回 None。h5py 不能在一次调用中读取多个 dataset，dataset 逐个以 read_direct 读入结果数组的对应行"""
+    if len(items) == 0 or any(d is _not_found_ or isinstance(d, (h5py.Group, h5py.AttributeManager)) for d in items):
+        return None
+
+    items = [d if isinstance(d, h5py.Dataset) else numpy.asarray(d) for d in items]
+    shapes = {d.shape for d in items}
+    dtypes = {d.dtype for d in items}
+    if len(shapes) != 1 or any(dtype.kind not in "biufc" for dtype in dtypes):
+        return None
+
+    shape = shapes.pop()
+    res = numpy.empty((len(items), *shape), dtype=numpy.result_type(*dtypes))
+    for idx, d in enumerate(items):
+        if isinstance(d, h5py.Dataset) and len(shape) > 0:
+            d.read_direct(res, dest_sel=numpy.s_[idx])
+        else:
+            res[idx] = d[()]
+    return res
+
+
+def h5_get_value(obj, path=None, projection=None, default_value=_not_found_, **kwargs):
+    obj = h5_get_object(obj, path)
 
     if projection is None:
         if isinstance(obj, h5py.Group):
             if obj.attrs.get("__is_list__", False):
-                res = [h5_get_value(obj[k]) for k in obj]
+                res = [h5_get_value(obj[k]) for k in h5_list_keys(obj)]
             else:
                 res = {**(h5_get_value(obj.attrs)), **{k: h5_get_value(obj[k]) for k in obj}}
         elif isinstance(obj, h5py.AttributeManager):
@@ -158,6 +221,8 @@ def h5_dump(grp):
 
 class FileHDF5(File, plugin_name=["h5", "hdf5"]):
 
+    _partial_write = True
+
     MOD_MAP = {
         File.Mode.read: "r",
         File.Mode.read | File.Mode.write: "r+",
@@ -207,6 +272,70 @@ class FileHDF5(File, plugin_name=["h5", "hdf5"]):
     def write(self, *args, **kwargs):
         return h5_put_value(self._fid, *args, **kwargs)
 
+    def delete(self, path) -> None:
+        h5_delete(self._fid, path)
+
+    def key_index(self, path) -> tuple | int:
+        """直接列出 group 的成员与属性，不读取数据"""
+        try:
+            obj = h5_get_object(self._fid, path)
+        except KeyError:
+            return _not_found_
+
+        if not isinstance(obj, h5py.Group):
+            return super().key_index(path)
+        elif obj.attrs.get("__is_list__", False):
+            return len(obj)
+        else:
+            return (*(k for k in obj.attrs if not k.startswith("__")), *obj)
+
+    def gather(self, path, *args, fill_value=numpy.nan, **kwargs) -> typing.Any:
+        """单层通配路径，且通配符对应列表（__is_list__ group）时，直接定位各元素的 dataset，
+        形状相同的数值数据一次分配结果数组后逐个读入（见 h5_stack），不读入列表的其他数据"""
+        pos = Path._wildcard(path)
+
+        if (
+            pos is None
+            or Path._wildcard(path[pos + 1 :]) is not None
+            or not all(isinstance(p, (str, int)) for i, p in enumerate(path) if i != pos)
+        ):
+            return super().gather(path, *args, fill_value=fill_value, **kwargs)
+
+        try:
+            obj = h5_get_object(self._fid, path[:pos])
+        except KeyError:
+            obj = None
+
+        if not (isinstance(obj, h5py.Group) and obj.attrs.get("__is_list__", False)):
+            return super().gather(path, *args, fill_value=fill_value, **kwargs)
+
+        keys = h5_list_keys(obj)
+        if isinstance(path[pos], slice):
+            keys = keys[path[pos]]
+
+        items = h5_list_items(obj, keys, path[pos + 1 :])
+
+        res = h5_stack(items)
+
+        if res is None:
+            values = [(h5_get_value(d) if d is not _not_found_ else d) for d in items]
+            res = Path._stack(values, fill_value)
+
+        return Path._project(res, *args, **kwargs)
+
+    def aggregate(self, path, projection, *args, key=None, group_by=None, **kwargs) -> typing.Any:
+        """在列表上按 key 聚合时，只读取各元素 key 处的数据，不读入整个列表"""
+        if projection is Query.tags.reduce and isinstance(key, str) and group_by is None:
+            obj = h5_get_object(self._fid, path)
+            if isinstance(obj, h5py.Group) and obj.attrs.get("__is_list__", False):
+                items = h5_list_items(obj, h5_list_keys(obj), [k for k in key.split("/") if k != ""])
+                values = h5_stack(items)  # 数值列读入一个数组，向量化聚合
+                if values is None:
+                    values = [(h5_get_value(d) if d is not _not_found_ else d) for d in items]
+                return Path._project(values, projection, *args, **kwargs)
+
+        return super().aggregate(path, projection, *args, key=key, group_by=group_by, **kwargs)
+
 
 # class HDF5Collection(FileCollection):
 #     def __init__(self, uri, *args, **kwargs):
@@ -108,10 +108,8 @@ class FileMDSplus(File, plugin_name=["mdsplus", "mds", "MDSplus"]):
 
         return tree
 
-    def read(self, path, request, prefix=None, **kwargs) -> typing.Any:
-        if request is None:
-            return _not_found_
-
+    def _parse(self, request, prefix=None, **kwargs) -> typing.Tuple[str, str, str]:
+        """解析请求，返回 (tree_name, tree_path, tdi)"""
         if isinstance(request, str):
             request = {"query": request}
 
@@ -132,6 +130,27 @@ class FileMDSplus(File, plugin_name=["mdsplus", "mds", "MDSplus"]):
         except KeyError as error:
             raise KeyError(f"Can not format tdi! {error} tdi={tdi} envs={self._envs} prefix={prefix}") from error
 
+        return tree_name, tree_path, tdi
+
+    @staticmethod
+    def _reshape(res):
+        if not isinstance(res, np.ndarray):
+            pass
+        elif len(res.shape) == 2:
+            if res.shape[1] == 1:
+                res = res[:, 0]
+            elif res.shape[0] == 1:
+                res = res[0]
+            else:
+                res = res.transpose(1, 0)
+        return res
+
+    def read(self, path, request=None, prefix=None, **kwargs) -> typing.Any:
+        if request is None:
+            return _not_found_
+
+        tree_name, tree_path, tdi = self._parse(request, prefix=prefix, **kwargs)
+
         res = None
         tree = self.get_tree(tree_name, tree_path)
         try:
@@ -151,15 +170,37 @@ class FileMDSplus(File, plugin_name=["mdsplus", "mds", "MDSplus"]):
             raise RuntimeError(f'mds.mdsExceptions! tree_name={tree_name} shot={self._shot} tdi="{tdi}"') from error
             # raise error
 
-        if not isinstance(res, np.ndarray):
-            pass
-        elif len(res.shape) == 2:
-            if res.shape[1] == 1:
-                res = res[:, 0]
-            elif res.shape[0] == 1:
-                res = res[0]
-            else:
-                res = res.transpose(1, 0)
+        return self._reshape(res)
+
+    def read_many(self, paths, *args, projection=None, prefix=None, **kwargs) -> typing.List[typing.Any]:
+        """同一个 tree 的请求合并为一个 TDI 表达式 List(*, tdi_0, tdi_1, ...)，一次 tdiExecute 完成。
+        合并的表达式出错时逐个读取，以便报告出错的请求"""
+        if projection is None or len(args) > 0:
+            return super().read_many(paths, *args, projection=projection, prefix=prefix, **kwargs)
+
+        projection = list(projection)
+        res = [_not_found_] * len(paths)
+
+        groups = {}
+        for idx, request in enumerate(projection):
+            if request is not None:
+                tree_name, tree_path, tdi = self._parse(request, prefix=prefix, **kwargs)
+                groups.setdefault((tree_name, tree_path), []).append((idx, tdi))
+
+        for (tree_name, tree_path), items in groups.items():
+            if len(items) > 1:
+                tree = self.get_tree(tree_name, tree_path)
+                try:
+                    values = [v.data() for v in tree.tdiExecute(f"List(*, {', '.join(tdi for _, tdi in items)})")]
+                except Exception:
+                    pass
+                else:
+                    for (idx, _), value in zip(items, values):
+                        res[idx] = self._reshape(value)
+                    continue
+            for idx, _ in items:
+                res[idx] = self.read(paths[idx], projection[idx], prefix=prefix, **kwargs)
+
         return res
 
     def write(self, *args, envs=None, **kwargs):
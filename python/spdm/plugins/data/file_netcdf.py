@@ -83,6 +83,84 @@ def nc_get_value(grp, path, projection=None, default=_not_found_, **kwargs):
     return res
 
 
+def nc_get_object(grp, path):
+    """返回 path 处的 group/variable/attribute，不读取数据"""
+    obj = grp
+    for pos, p in enumerate(Path(path)[:]):
+        p = str(p)
+        if isinstance(obj, (nc.Group, nc.Dataset)) and p in obj.groups:
+            obj = obj.groups[p]
+        elif isinstance(obj, (nc.Group, nc.Dataset)) and p in obj.variables:
+            obj = obj.variables[p]
+        elif isinstance(obj, (nc.Group, nc.Dataset)) and p in obj.ncattrs():
+            obj = obj.getncattr(p)
+        else:
+            raise KeyError(path[: pos + 1])
+    return obj
+
+
+def nc_read(grp, path):
+    """读取 path 处的 group（递归）、variable 或 attribute"""
+    obj = nc_get_object(grp, path)
+    if isinstance(obj, (nc.Group, nc.Dataset)):
+        return nc_get_value(obj, [])
+    elif isinstance(obj, nc.Variable):
+        return obj[:]
+    else:
+        return obj
+
+
+def nc_gather(grp, path, fill_value=np.nan):
+    """收集通配路径匹配的值。
+    单层通配且通配符对应以序号命名的子 group 时，变量形状相同时一次分配结果数组，逐个变量整体读入；
+    其他情况（无通配符、多层通配等）读取第一个通配符之前的数据后由 Path.gather 收集"""
+    path = Path(path)[:]
+    pos = Path._wildcard(path)
+
+    if pos is None or Path._wildcard(path[pos + 1 :]) is not None:
+        return _nc_gather_slow(grp, path, pos, fill_value)
+
+    try:
+        container = nc_get_object(grp, path[:pos])
+    except KeyError:
+        return _not_found_
+
+    if not isinstance(container, (nc.Group, nc.Dataset)) or not all(k.isdigit() for k in container.groups):
+        return _nc_gather_slow(grp, path, pos, fill_value)
+
+    children = sorted(container.groups.items(), key=lambda kv: int(kv[0]) if kv[0].isdigit() else -1)
+    if isinstance(path[pos], slice):
+        children = children[path[pos]]
+
+    items = []
+    for _, child in children:
+        try:
+            items.append(nc_get_object(child, path[pos + 1 :]))
+        except KeyError:
+            items.append(_not_found_)
+
+    shapes = {v.shape for v in items if isinstance(v, nc.Variable)}
+
+    if len(items) > 0 and len(shapes) == 1 and all(isinstance(v, nc.Variable) for v in items):
+        res = np.empty((len(items), *shapes.pop()), dtype=items[0].dtype)
+        for idx, v in enumerate(items):
+            res[idx] = v[:]
+    else:
+        res = Path._stack([(v[:] if isinstance(v, nc.Variable) else v) for v in items], fill_value)
+
+    return res
+
+
+def _nc_gather_slow(grp, path, pos, fill_value):
+    if pos is None:
+        pos = len(path)
+    try:
+        target = nc_read(grp, path[:pos])
+    except KeyError:
+        return _not_found_
+    return Path(path[pos:]).gather(target, fill_value=fill_value)
+
+
 def nc_dump(grp):
     return nc_get_value(grp, [])
 
@@ -103,6 +181,9 @@ class NetCDFEntry(Entry):
     def find(self, *args, **kwargs) -> typing.Any:
         return nc_get_value(self._cache, self._path, *args, **kwargs)
 
+    def gather(self, path=None, *args, fill_value=np.nan, **kwargs) -> typing.Any:
+        return Path._project(nc_gather(self._cache, self._path.extend(Path(path)), fill_value), *args, **kwargs)
+
     def dump(self):
         return nc_dump(self._cache)
 
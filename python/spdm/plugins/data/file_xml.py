@@ -14,9 +14,9 @@ from lxml.etree import Element as Element
 
 from lxml.etree import fromstring, tostring
 from lxml.etree import parse as parse_xml
-from spdm.core.entry import Entry
+from spdm.core.entry import Entry, _key_index, _merge_key_index, _projection_args, _projections
 from spdm.core.file import File
-from spdm.core.path import Path, PathLike, Query
+from spdm.core.path import Path, PathLike, Query, as_path
 from spdm.utils.logger import logger
 from spdm.utils.misc import normalize_path, serialize
 from spdm.utils.path_traverser import PathTraverser
@@ -243,6 +243,84 @@ class FileXML(File, plugin_name="xml"):
 
             return res
 
+        def find_many(
+            self, paths: typing.Iterable[PathLike], *args, projection=None, default_value=_not_found_, **kwargs
+        ) -> typing.List[typing.Any]:
+            """批量读取：共同前缀的 XPath 只求值一次，各路径的剩余部分相对于前缀节点求值。
+            有 projection 或 op 时逐个调用 find"""
+            paths = [as_path(p) for p in paths]
+
+            if projection is not None or len(args) > 0:
+                return [
+                    self.child(p).find(*_projection_args(q), *args, default_value=default_value, **kwargs)
+                    for p, q in zip(paths, _projections(projection, len(paths)))
+                ]
+
+            relative, paths = paths, [self._path.extend(p) for p in paths]
+
+            if self._cache is not _not_found_:
+                res = Path.find_many(self._cache, paths, default_value=_not_found_)
+            else:
+                res = [_not_found_] * len(paths)
+
+            missing = [idx for idx, v in enumerate(res) if v is _not_found_]
+
+            if len(missing) == 0:
+                return res
+
+            # 共同前缀，不以列表元素的 tag 结尾（其后的序号需要与 tag 一起求值）
+            prefix = Path._static_prefix(paths[missing[0]])
+            for idx in missing[1:]:
+                other = Path._static_prefix(paths[idx])
+                pos = 0
+                while pos < min(len(prefix), len(other)) and prefix[pos] == other[pos]:
+                    pos += 1
+                prefix = prefix[:pos]
+            while len(prefix) > 0 and any(
+                len(paths[idx]) > len(prefix) and isinstance(paths[idx][len(prefix)], int) for idx in missing
+            ):
+                prefix = prefix[:-1]
+
+            xp, _ = self.xpath(prefix)
+            parents: typing.List[_XMLElement] = xp(self._data)
+
+            for idx in missing:
+                if len(parents) != 1:
+                    res[idx] = self.child(relative[idx]).find(default_value=_not_found_, **kwargs)
+                    continue
+                path = paths[idx][:]
+                _, envs = self._xpath(path)
+                rest, _ = self._xpath(path[len(prefix) :])
+                res[idx] = self._dump(parents[0].xpath(rest), path=path, envs=envs, **kwargs)
+
+            return [(v if v is not _not_found_ else default_value) for v in res]
+
+        def key_index(self) -> tuple | int:
+            """由 XML 节点直接列出子元素的 tag 与属性，不解析子元素的内容"""
+            xp, _ = self.xpath(self._path[:])
+            obj: typing.List[_XMLElement] = xp(self._data)
+
+            if len(obj) == 0:
+                res = _not_found_
+            elif len(obj) > 1 or obj[0].attrib.get("id", None) is not None:
+                res = len(obj)
+            else:
+                res = tuple(
+                    dict.fromkeys(
+                        [child.tag for child in obj[0] if child.tag is not _XMLComment]
+                        + [f"@{k}" for k in obj[0].attrib]
+                    )
+                )
+
+            if self._cache is not _not_found_:
+                res = _merge_key_index(_key_index(self._path.get(self._cache, _not_found_)), res)
+
+            return res
+
+        @property
+        def revision(self) -> typing.Hashable:
+            return 0  # XML 文件只读（flush 未实现），修改只写入缓存，见 key_index
+
         def search(self, *args, **kwargs) -> typing.Generator[typing.Tuple[int, typing.Any], None, None]:
             """Return a generator of the results."""
 
@@ -10,6 +10,10 @@ if SP_DEBUG in (True, "true", "on"):
 
 SP_LABEL = os.environ.get("SP_LABEL", __package__[: __package__.find(".")])
 
+SP_PATH_CACHE_SIZE = int(os.environ.get("SP_PATH_CACHE_SIZE", 4096))
+
+SP_SPARSE_LIST_THRESHOLD = int(os.environ.get("SP_SPARSE_LIST_THRESHOLD", 1024))
+
 SP_MPI = None
 SP_MPI_RANK = 0
 SP_MPI_SIZE = 0
@@ -0,0 +1,140 @@
+""" Reader/writer locks with subtree granularity.
+
+    按子树加锁（multiple granularity locking）：锁住一个节点即锁住以它为根的子树。
+    - 读（共享，S）：多个读者可以并行
+    - 写（独占，X）：与该子树上的所有读者、写者互斥
+    加锁时从根到目标节点依次获取锁，祖先节点上获取意向锁（IS/IX），因此
+    - 对子树 a/b 的写与对 a 的读互斥（IX 与 S 不兼容）
+    - 对兄弟子树 a/b 与 a/c 的读写互不阻塞（IX 与 IS/IX 兼容）
+
+    锁登记在 LockTable 中，按 key（例如 id(node)）在首次获取时创建、全部释放后移除，
+    未加锁的节点不占用额外内存。
+
+    锁是可重入的：持有锁的线程可以再次获取同一个锁的任意模式（已持有读锁时升级为写锁，
+    需要等待其他读者释放）。同一线程嵌套加锁时应保持从根到叶的顺序，以免死锁。
+"""
+
+import typing
+from contextlib import contextmanager
+from threading import Condition, get_ident
+
+IS, IX, S, X = range(4)  # 意向读，意向写，读，写
+
+# _compatible[a][b]: 模式 a 与其他线程持有的模式 b 是否兼容
+_compatible = (
+    (True, True, True, False),
+    (True, True, False, False),
+    (True, False, True, False),
+    (False, False, False, False),
+)
+
+
+class RWLock:
+    """可重入的读写锁，支持意向锁模式（IS/IX/S/X）。写优先：有写者等待时，新的读者等待。"""
+
+    __slots__ = ("_cond", "_count", "_owners", "_writers_waiting")
+
+    def __init__(self) -> None:
+        self._cond = Condition()
+        self._count = [0, 0, 0, 0]
+        self._owners: typing.Dict[int, typing.List[int]] = {}  # {thread id: [count of IS, IX, S, X]}
+        self._writers_waiting = 0
+
+    def _grantable(self, mode: int, own: typing.List[int] | None) -> bool:
+        if own is None and self._writers_waiting > 0 and mode in (IS, S):
+            return False
+        for m, count in enumerate(self._count):
+            if count - (own[m] if own is not None else 0) > 0 and not _compatible[mode][m]:
+                return False
+        return True
+
+    def acquire(self, mode: int = S) -> None:
+        tid = get_ident()
+        with self._cond:
+            own = self._owners.get(tid, None)
+            if not self._grantable(mode, own):
+                is_writer = mode in (IX, X)
+                if is_writer:
+                    self._writers_waiting += 1
+                try:
+                    while not self._grantable(mode, own):
+                        self._cond.wait()
+                finally:
+                    if is_writer:
+                        self._writers_waiting -= 1
+                        self._cond.notify_all()
+            if own is None:
+                own = self._owners[tid] = [0, 0, 0, 0]
+            own[mode] += 1
+            self._count[mode] += 1
+
+    def release(self, mode: int = S) -> None:
+        tid = get_ident()
+        with self._cond:
+            own = self._owners.get(tid, None)
+            if own is None or own[mode] == 0:
+                raise RuntimeError("Release an unheld lock!")
+            own[mode] -= 1
+            self._count[mode] -= 1
+            if sum(own) == 0:
+                del self._owners[tid]
+            self._cond.notify_all()
+
+    @property
+    def is_locked(self) -> bool:
+        return sum(self._count) > 0
+
+
+class LockTable:
+    """按 key 登记的读写锁表，锁在首次获取时创建，全部释放后移除"""
+
+    def __init__(self) -> None:
+        self._locks: typing.Dict[typing.Hashable, list] = {}  # {key: [RWLock, count]}
+        self._guard = Condition()
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def acquire(self, key: typing.Hashable, mode: int = S) -> None:
+        with self._guard:
+            item = self._locks.get(key, None)
+            if item is None:
+                item = self._locks[key] = [RWLock(), 0]
+            item[1] += 1
+        try:
+            item[0].acquire(mode)
+        except BaseException:
+            self._unref(key, item)
+            raise
+
+    def release(self, key: typing.Hashable, mode: int = S) -> None:
+        item = self._locks[key]
+        item[0].release(mode)
+        self._unref(key, item)
+
+    def _unref(self, key, item) -> None:
+        with self._guard:
+            item[1] -= 1
+            if item[1] == 0:
+                del self._locks[key]
+
+    @contextmanager
+    def locking(self, keys: typing.Sequence[typing.Hashable], exclusive: bool = False):
+        """依次锁住 keys（从根到目标节点），祖先上获取意向锁，目标上获取读锁（exclusive=True 时为写锁）"""
+        if len(keys) == 0:
+            yield
+            return
+
+        modes = [IX if exclusive else IS] * (len(keys) - 1) + [X if exclusive else S]
+        acquired = []
+        try:
+            for key, mode in zip(keys, modes):
+                self.acquire(key, mode)
+                acquired.append((key, mode))
+            yield
+        finally:
+            for key, mode in reversed(acquired):
+                self.release(key, mode)
+
+
+lock_table = LockTable()
@@ -0,0 +1,320 @@
+""" Micro-benchmarks of HTree / SpTree node access.
+
+    python tests/python/benchmark/bench_htree.py
+"""
+
+import asyncio
+import gc
+import pathlib
+import tempfile
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy, deepcopy
+import tracemalloc
+
+import numpy as np
+
+from spdm.core.entry import Entry, EntryChain
+from spdm.core.file import File
+from spdm.core.htree import Dict, List
+from spdm.core.path import Path
+from spdm.core.sp_tree import SpTree
+from spdm.core.sp_object import SpObject
+
+
+class GlobalQuantities(SpTree):
+    ip: float
+    beta_pol: float
+    li_3: float
+
+
+class Profiles1D(SpTree):
+    psi: List[float]
+    q: List[float]
+
+
+class TimeSlice(SpTree):
+    time: float
+    global_quantities: GlobalQuantities
+    profiles_1d: Profiles1D
+
+
+class Equilibrium(SpTree):
+    time_slice: List[TimeSlice]
+
+
+DATA = {
+    "time_slice": [
+        {
+            "time": i * 0.1,
+            "global_quantities": {"ip": 1.0e6 * i, "beta_pol": 0.5, "li_3": 1.0},
+            "profiles_1d": {"psi": [0.0, 1.0], "q": [1.0, 2.0]},
+        }
+        for i in range(10)
+    ]
+}
+
+
+def bench(number=2000):
+    """属性访问：eq.time_slice[i].global_quantities.ip"""
+
+    # 节点会写回缓存，每次使用一份新的数据，不修改共享的 DATA
+    data = iter([deepcopy(DATA) for _ in range(number // 10)])
+
+    def _access():
+        eq = Equilibrium(next(data))
+        for i in range(10):
+            eq.time_slice[i].global_quantities.ip
+
+    t = timeit.timeit(_access, number=number // 10)
+    print(f"{'SpTree attr x10':<24} {t/(number//10)*1e6:10.2f} us")
+
+    d = Dict({f"k{i}": {"a": i} for i in range(100)})
+    t = timeit.timeit(lambda: [d[f"k{i}"] for i in range(100)], number=number // 10)
+    print(f"{'Dict[key] x100':<24} {t/(number//10)*1e6:10.2f} us")
+
+
+class Coil(SpTree):
+    name: str
+    r: float
+    z: float
+    turns: int
+
+
+class PFActive(SpTree):
+    coil: List[Coil]
+
+
+def _measure(func, num, unit="node"):
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    res = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{func.__doc__:<24} {(current-start)/num:10.1f} bytes/{unit}")
+    return res
+
+
+def bench_memory(num=100000):
+    """内存占用：大量小节点（coil）的树，每个节点的字节数"""
+
+    data = {"coil": [{"name": f"c{i}", "r": 1.0 + i, "z": 0.5 * i, "turns": i % 10} for i in range(num)]}
+
+    pf = PFActive(data)
+
+    def _nodes():
+        """SpTree node"""
+        return [pf.coil[i] for i in range(num)]
+
+    coils = List[Dict]([{"name": f"c{i}", "r": 1.0 + i} for i in range(num)])
+
+    def _dict_nodes():
+        """List[Dict] node"""
+        return [coils[i] for i in range(num)]
+
+    def _paths():
+        """Path"""
+        return [Path(["coil", i, "r"]) for i in range(num)]
+
+    def _entries():
+        """Entry"""
+        return [Entry(data, ["coil", i]) for i in range(num)]
+
+    nodes = _measure(_nodes, num)
+    _measure(_dict_nodes, num)
+    _measure(_paths, num)
+    _measure(_entries, num)
+    del nodes
+
+
+def bench_snapshot(num=100000):
+    """快照：copy (写时复制) 与 deepcopy 的耗时，以及修改一个叶节点后快照增加的内存"""
+
+    data = {f"g{j}": {f"c{i}": {"r": 1.0 + i, "z": 0.5 * i} for i in range(num // 100)} for j in range(100)}
+
+    tree = Dict[Dict](deepcopy(data))
+
+    t = timeit.timeit(lambda: copy(tree), number=100)
+    print(f"{'copy':<24} {t/100*1e6:10.2f} us")
+
+    t = timeit.timeit(lambda: deepcopy(data), number=1)
+    print(f"{'deepcopy':<24} {t*1e6:10.2f} us")
+
+    def _modify():
+        """snapshot + modify"""
+        other = copy(tree)
+        other.update(f"g50/c{num//200}/r", 0.0)
+        return other
+
+    _measure(_modify, 1, unit="snapshot")
+
+
+def bench_threads(number=20000):
+    """多线程读：各线程反复读取已缓存的属性 time_slice.global_quantities.ip，统计总吞吐量"""
+
+    slices = [Equilibrium(deepcopy(DATA)).time_slice[0] for _ in range(8)]
+    for time_slice in slices:
+        time_slice.global_quantities.ip  # 预先创建子节点，只测缓存命中
+
+    def _read(time_slice):
+        for _ in range(number):
+            time_slice.global_quantities.ip
+
+    for num_threads in (1, 2, 4, 8):
+        with ThreadPoolExecutor(num_threads) as pool:
+            start = time.perf_counter()
+            list(pool.map(_read, slices[:num_threads]))
+            t = time.perf_counter() - start
+        print(f"{f'read x{num_threads} threads':<24} {num_threads*number/t/1e6:10.2f} M reads/s")
+
+
+def bench_gc(num=2000):
+    """遍历时间片：逐个创建、读取、丢弃 time_slice，统计 GC 暂停时间与峰值内存"""
+
+    pauses = []
+
+    def _on_gc(phase, info):
+        if phase == "start":
+            pauses.append(time.perf_counter())
+        else:
+            pauses[-1] = time.perf_counter() - pauses[-1]
+
+    def _iterate():
+        for i in range(num):
+            time_slice = TimeSlice(
+                {
+                    "time": i * 0.1,
+                    "global_quantities": {"ip": 1.0e6 * i, "beta_pol": 0.5, "li_3": 1.0},
+                    "profiles_1d": {"psi": [0.0, 1.0], "q": [1.0, 2.0]},
+                }
+            )
+            time_slice.global_quantities.ip
+            time_slice.profiles_1d.psi
+
+    gc.collect()
+    gc.callbacks.append(_on_gc)
+    tracemalloc.start()
+    start = time.perf_counter()
+    _iterate()
+    t = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.callbacks.remove(_on_gc)
+
+    print(f"{'iterate time slices':<24} {t*1e3:10.2f} ms")
+    print(f"{'GC pauses':<24} {sum(pauses)*1e3:10.2f} ms ({len(pauses)} collections)")
+    print(f"{'peak memory':<24} {peak/1024:10.1f} KB")
+
+
+class Machine(SpObject):
+    name: str
+    pf_active: PFActive
+    equilibrium: Equilibrium = deepcopy(DATA)
+
+
+def bench_defaults(number=2000):
+    """构建对象：参数与默认值作为覆盖层，每个对象的构建开销与参数/默认值的大小无关"""
+
+    for size in (10, 1000):
+        config = {
+            "pf_active": {"coil": [{"name": f"c{i}", "r": 1.0 + i, "z": 0.5 * i, "turns": i % 10} for i in range(size)]},
+            "equilibrium": deepcopy(DATA),
+        }
+
+        def _build():
+            machine = Machine(config, name="east")
+            machine.name
+
+        t = timeit.timeit(_build, number=number)
+        print(f"{f'SpObject ({size} coils)':<24} {t/number*1e6:10.2f} us")
+
+    t = timeit.timeit(lambda: Machine().equilibrium.time_slice[0].global_quantities.ip, number=number)
+    print(f"{'default child node':<24} {t/number*1e6:10.2f} us")
+
+
+def bench_chain(number=20000, layers=8):
+    """EntryChain：数据只在最后一层时重复读取，以及读取不存在的路径。
+    各层为内存中的 Entry，或本地缓存之后的 Mapper（数据在 Mapper 的数据源中）；
+    查找结果按各层的版本缓存，与每次清空缓存（逐层查找）比较"""
+
+    from spdm.core import mapper
+    from spdm.utils.uri_utils import uri_split
+
+    # 直接登记映射表与数据源，不读取映射文件
+    mapper.Mapper._mappers[hash((mapper.path.format(schema="bench"), uri_split("bench://data")))] = (
+        Entry({}),
+        {"*": Entry({f"k{i}": i for i in range(layers)})},
+    )
+
+    chains = {
+        f"{layers} layers": EntryChain(*[Entry({f"k{i}": i}) for i in range(layers)]),
+        "cache + mapper": EntryChain(*[Entry({}) for _ in range(layers - 1)], mapper.Mapper("bench://data", schema="bench")),
+    }
+
+    for name, chain in chains.items():
+        hit = chain.child(f"k{layers-1}")
+        miss = chain.child("missing")
+
+        for label, clear in [("", False), (" uncached", True)]:
+            t = timeit.timeit(lambda: (clear and chain._resolved.clear(), hit.get()), number=number)
+            print(f"{f'hit ({name}){label}':<32} {t/number*1e6:10.2f} us")
+
+            t = timeit.timeit(lambda: (clear and chain._resolved.clear(), miss.get(default_value=None)), number=number)
+            print(f"{f'miss ({name}){label}':<32} {t/number*1e6:10.2f} us")
+
+
+def bench_read_cache(number=2000, num=64, size=100000):
+    """HDF5 文件的读缓存：num 个数组轮流读取，其中 80% 的读取落在 4 个热点数组上"""
+
+    rng = np.random.default_rng(0)
+    order = [f"p{i}" if rng.random() > 0.8 else f"p{i%4}" for i in rng.integers(0, num, number)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        f_name = pathlib.Path(temp_dir) / "bench_read_cache.h5"
+        with File(f_name, mode="w", scheme="hdf5") as f_out:
+            f_out.write({f"p{i}": np.zeros(size) for i in range(num)})
+
+        for cache in [None, {"max_bytes": 8 * size * 8}, {"policy": "lfu", "max_bytes": 8 * size * 8}]:
+            with File(f_name, mode="r", scheme="hdf5", cache=cache) as f_in:
+                t = timeit.timeit(lambda: [f_in.child(k).get() for k in order], number=1)
+                stats = f_in._doc.cache.stats()
+                label = "unbounded" if cache is None else cache.get("policy", "lru")
+                print(
+                    f"{f'read cache ({label})':<24} {t/number*1e6:10.2f} us"
+                    f"  hits={stats['hits']} misses={stats['misses']} evictions={stats['evictions']}"
+                    f" {stats['nbytes']/2**20:.1f} MB"
+                )
+
+
+def bench_async(latency=0.05, sources=3):
+    """EntryChain 中多个有延迟的数据源：同步逐个读取与异步同时读取的耗时"""
+
+    class _Remote(Entry):
+        __slots__ = ()
+
+        def find_many(self, *args, **kwargs):
+            time.sleep(latency)
+            return super().find_many(*args, **kwargs)
+
+    chain = EntryChain(*[_Remote({f"k{i}": i}) for i in range(sources)])
+    paths = [f"k{i}" for i in range(sources)]
+
+    t = timeit.timeit(lambda: (chain._resolved.clear(), chain.find_many(paths)), number=5) / 5
+    print(f"{f'find_many ({sources} sources)':<24} {t*1e3:10.2f} ms")
+
+    t = timeit.timeit(lambda: (chain._resolved.clear(), asyncio.run(chain.afind_many(paths))), number=5) / 5
+    print(f"{f'afind_many ({sources} sources)':<24} {t*1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    bench()
+    bench_memory()
+    bench_snapshot()
+    bench_threads()
+    bench_gc()
+    bench_defaults()
+    bench_chain()
+    bench_read_cache()
+    bench_async()
@@ -0,0 +1,129 @@
+""" Micro-benchmarks of Path parsing and lookup.
+
+    python tests/python/benchmark/bench_path.py
+"""
+
+import timeit
+import tracemalloc
+
+from spdm.core.path import Path, compile_path
+from spdm.core.entry import Entry
+
+IMAS_PATHS = [
+    "time_slice/0/profiles_1d/psi",
+    "time_slice/12/profiles_2d/0/grid/dim1",
+    "equilibrium/time_slice/3/global_quantities/ip",
+    "core_profiles/profiles_1d/0/electrons/temperature",
+    "pf_active/coil/PF1/element/0/geometry/rectangle/r",
+    "wall/description_2d/0/limiter/unit/0/outline/z",
+    "/equilibrium/vacuum_toroidal_field/b0",
+    "coil[{'name':'PF1'}]/current/data",
+]
+
+DATA = {"time_slice": [{"profiles_1d": {"psi": i}} for i in range(20)]}
+
+
+def _parse_uncached():
+    for p in IMAS_PATHS:
+        [*Path._parser_str_iter(p)]
+
+
+def _parse_cached():
+    for p in IMAS_PATHS:
+        Path.parser(p)
+
+
+def bench(number=2000):
+    res = {}
+    res["parse (uncached)"] = timeit.timeit(_parse_uncached, number=number)
+    Path._parser_cached.cache_clear()
+    res["parse (cached)"] = timeit.timeit(_parse_cached, number=number)
+
+    res["find   Path(str).get"] = timeit.timeit(
+        lambda: Path("time_slice/0/profiles_1d/psi").get(DATA), number=number * len(IMAS_PATHS)
+    )
+    accessor = compile_path("time_slice/0/profiles_1d/psi")
+    res["find   compiled"] = timeit.timeit(lambda: accessor(DATA), number=number * len(IMAS_PATHS))
+
+    for k, v in res.items():
+        print(f"{k:<24} {v/number*1e6:10.2f} us / {len(IMAS_PATHS)} paths")
+
+    info = Path._parser_cached.cache_info()
+    print(f"parse cache: hits={info.hits} misses={info.misses} size={info.currsize}/{info.maxsize}")
+    return res
+
+
+def _navigate(entry: Entry):
+    for p in ("time_slice", 0, "profiles_1d", "psi"):
+        entry = entry.child(p)
+    return entry
+
+
+def bench_entry_child(number=20000):
+    """Entry.child 每步导航的耗时与内存分配"""
+    entry = Entry(DATA)
+    t = timeit.timeit(lambda: _navigate(entry), number=number)
+
+    tracemalloc.start()
+    snapshot0 = tracemalloc.take_snapshot()
+    keep = [_navigate(entry) for _ in range(1000)]
+    snapshot1 = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in snapshot1.compare_to(snapshot0, "filename"))
+    count = sum(s.count_diff for s in snapshot1.compare_to(snapshot0, "filename"))
+    del keep
+
+    print(f"{'Entry.child x4':<24} {t/number*1e6:10.2f} us / navigation")
+    print(f"{'':<24} {size/1000:10.1f} bytes, {count/1000:.1f} blocks retained / navigation")
+
+
+def _make_tree(depth=5, width=10):
+    if depth == 0:
+        return 1.0
+    return {f"n{i}": _make_tree(depth - 1, width) for i in range(width)}
+
+
+def bench_descendants():
+    """`**` 遍历 10^5 节点的合成树，以及深度 10^4 的链"""
+    tree = _make_tree(5, 10)
+    num = 0
+    t = timeit.timeit(lambda: sum(1 for _ in Path("**").search(tree)), number=1)
+    num = sum(1 for _ in Path("**").search(tree))
+    print(f"{'** (10^5 nodes)':<24} {t*1e3:10.2f} ms  nodes={num}")
+
+    t = timeit.timeit(lambda: [*Path("**/n0").search(tree, max_depth=3)], number=1)
+    print(f"{'** max_depth=3':<24} {t*1e3:10.2f} ms")
+
+    t = timeit.timeit(lambda: [*Path("**").search(tree, prune=lambda p, n: p[-1] != "n0")], number=1)
+    print(f"{'** prune':<24} {t*1e3:10.2f} ms")
+
+    chain = leaf = {}
+    for _ in range(10000):
+        leaf["n"] = {}
+        leaf = leaf["n"]
+    t = timeit.timeit(lambda: sum(1 for _ in Path("**").search(chain)), number=1)
+    print(f"{'** (depth 10^4 chain)':<24} {t*1e3:10.2f} ms")
+
+
+def bench_gather(number=20):
+    """time_slice/*/profiles_1d/psi：逐个 find 后 np.stack 与 Path.gather 的对比"""
+    import numpy as np
+
+    data = {"time_slice": [{"profiles_1d": {"psi": np.random.rand(100)}} for _ in range(1000)]}
+
+    def _loop():
+        return np.stack([Path(["time_slice", i, "profiles_1d", "psi"]).get(data) for i in range(1000)])
+
+    path = Path("time_slice/*/profiles_1d/psi")
+
+    t0 = timeit.timeit(_loop, number=number)
+    t1 = timeit.timeit(lambda: path.gather(data), number=number)
+    print(f"{'gather loop+stack':<24} {t0/number*1e3:10.2f} ms / 1000 slices")
+    print(f"{'gather Path.gather':<24} {t1/number*1e3:10.2f} ms / 1000 slices")
+
+
+if __name__ == "__main__":
+    bench()
+    bench_entry_child()
+    bench_descendants()
+    bench_gather()
@@ -0,0 +1,32 @@
+""" Benchmark of Query predicates over lists of named nodes.
+
+    python tests/python/benchmark/bench_query.py
+"""
+
+import timeit
+
+import numpy as np
+
+from spdm.core.query import Query
+
+N = 10000
+
+SLICES = [{"time": 0.001 * i, "name": f"slice{i}", "ip": float(i)} for i in range(N)]
+
+COLUMNS = {"time": np.array([s["time"] for s in SLICES]), "ip": np.array([s["ip"] for s in SLICES])}
+
+
+def bench(number=20):
+    query = Query({"time": {"$ge": 2.0, "$lt": 4.0}})
+
+    res = {}
+    res["per-element check"] = timeit.timeit(lambda: [s for s in SLICES if query.check(s)], number=number)
+    res["mask (list of dict)"] = timeit.timeit(lambda: query.filter(SLICES), number=number)
+    res["mask (columnar)"] = timeit.timeit(lambda: query.filter(COLUMNS), number=number)
+
+    for k, v in res.items():
+        print(f"{k:<24} {v/number*1e3:10.3f} ms / {N} elements")
+
+
+if __name__ == "__main__":
+    bench()
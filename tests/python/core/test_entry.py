@@ -1,9 +1,11 @@
+import asyncio
+import time
 import unittest
 from copy import deepcopy
 
 from spdm.utils.tags import _not_found_
 from spdm.utils.logger import logger
-from spdm.core.entry import Entry, open_entry
+from spdm.core.entry import Entry, EntryChain, open_entry
 from spdm.core.query import Query
 
 
@@ -53,6 +55,19 @@ class TestEntry(unittest.TestCase):
         self.assertEqual(cache["c"][2]["a"], "hello world")
         self.assertEqual(cache["c"][2]["b"], 3.141567)
 
+    def test_child_path(self):
+        d = Entry(deepcopy(self.data))
+        d_d = d.child("d")
+        d_e = d_d.child("e")
+        self.assertEqual(str(d_d.path), "d")
+        self.assertEqual(str(d_e.path), "d/e")
+        self.assertEqual(d_e.parent.path, d_d.path)
+        self.assertEqual(d_e.get(), self.data["d"]["e"])
+
+    def test_find_many(self):
+        d = Entry(deepcopy(self.data)).child("d")
+        self.assertListEqual(d.find_many(["e", "f", "g"]), [self.data["d"]["e"], self.data["d"]["f"], _not_found_])
+
     def test_update(self):
         cache = deepcopy(self.data)
 
@@ -102,6 +117,98 @@ class TestEntry(unittest.TestCase):
         d3 = Entry(data3)
         self.assertSetEqual({k for k in d3.child("*/name").search()}, {"John", "Jane", "Jack"})
 
+    def test_chain_resolution(self):
+        probes = []
+
+        class _Probed(Entry):
+            __slots__ = ()
+
+            def find(self, *args, **kwargs):
+                probes.append(self._cache)
+                return super().find(*args, **kwargs)
+
+        layers = [{"x": 1}, {"y": 2}, {"z": 3}]
+        chain = EntryChain(*[_Probed(d) for d in layers])
+
+        self.assertEqual(chain.child("z").get(), 3)
+        self.assertEqual(len(probes), 3)
+
+        probes.clear()
+        self.assertEqual(chain.child("z").get(), 3)  # 记住命中的 entry
+        self.assertListEqual(probes, [layers[2]])
+
+        probes.clear()
+        self.assertIs(chain.child("w").get(default_value=_not_found_), _not_found_)
+        self.assertIs(chain.child("w").get(default_value=_not_found_), _not_found_)  # 负缓存
+        self.assertEqual(len(probes), 3)
+
+        layers[0]["w"] = 0
+        chain.child("v").update(4)  # 写入时失效
+        probes.clear()
+        self.assertEqual(chain.child("w").get(), 0)
+        self.assertEqual(len(probes), 1)
+
+    def test_chain_external_update(self):
+        data = {}
+        chain = EntryChain(Entry({"b": 2}), Entry(data))
+
+        self.assertIs(chain.child("a").find(), _not_found_)
+        self.assertListEqual(chain.find_many(["a"]), [_not_found_])
+
+        self.assertEqual(chain._resolved[None], (0, 0))  # 内存中的数据有版本，缓存查找结果（包括未命中）
+
+        Entry(data).child("a").update(1)  # 经包装同一数据的其他 entry 修改，版本随之改变
+
+        self.assertEqual(chain.child("a").find(), 1)
+        self.assertListEqual(chain.find_many(["a"]), [1])
+
+        chain._entries[0].child("b").delete()
+        self.assertIs(chain.child("b").find(), _not_found_)
+
+    def test_chain_find_many(self):
+        calls = []
+
+        class _Batched(Entry):
+            __slots__ = ()
+
+            def find_many(self, paths, *args, **kwargs):
+                calls.append(len(paths))
+                return super().find_many(paths, *args, **kwargs)
+
+        layers = [{"a": {"x": 1}}, {"a": {"y": 2, "z": 3}}, {"b": [10, 20]}]
+        chain = EntryChain(*[_Batched(d) for d in layers])
+
+        paths = ["a/x", "a/y", "b/1", "a/z", "c"]
+        self.assertListEqual(chain.find_many(paths, default_value=None), [1, 2, 20, 3, None])
+        self.assertListEqual(calls, [5, 4, 2])  # 每个 entry 只调用一次，只传入尚未找到的路径
+
+        calls.clear()
+        self.assertListEqual(chain.find_many(paths, default_value=None), [1, 2, 20, 3, None])
+        self.assertListEqual(sorted(calls), [1, 1, 2])  # 直接交给命中过的 entry，不存在的路径不再查找
+
+        self.assertListEqual(chain.find_many(["a", "b"], projection=[Query.tags.count, None]), [1, [10, 20]])
+
+    def test_async(self):
+        class _Slow(Entry):
+            __slots__ = ()
+
+            def find_many(self, *args, **kwargs):
+                time.sleep(0.2)
+                return super().find_many(*args, **kwargs)
+
+        chain = EntryChain(_Slow({"a": 1}), _Slow({"b": 2}), _Slow({"c": 3, "d": [4, 5]}))
+
+        start = time.perf_counter()
+        self.assertListEqual(asyncio.run(chain.afind_many(["a", "b", "c", "e"], default_value=None)), [1, 2, 3, None])
+        self.assertLess(time.perf_counter() - start, 0.5)  # 三个 entry 同时读取
+
+        self.assertEqual(asyncio.run(chain.child("c").afind()), 3)
+
+        async def _search():
+            return [v async for v in chain.child("d").asearch()]
+
+        self.assertListEqual(asyncio.run(_search()), [4, 5])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,11 +2,15 @@ import pathlib
 import shutil
 import tempfile
 import unittest
+import unittest.mock
 
 import h5py
 import numpy as np
+from spdm.core.document import ReadCache
 from spdm.core.file import File
 from spdm.core.entry import Entry
+from spdm.core.htree import Dict, List
+from spdm.core.query import Query
 from spdm.utils.logger import logger
 
 SP_TEST_DATA_DIRECTORY = pathlib.Path("../data")
@@ -52,6 +56,179 @@ class TestFileHDF5(unittest.TestCase):
 
         self.assertTrue(np.allclose(data_in, data_out))
 
+    def test_read_many(self):
+        f_name = self.temp_dir / "test_hdf5_in.h5"
+
+        with h5py.File(f_name, mode="x") as h5file:
+            grp = h5file.create_group("profiles_1d")
+            psi = np.random.rand(10)
+            q = np.random.rand(10)
+            grp.create_dataset("psi", data=psi)
+            grp.create_dataset("q", data=q)
+
+        with File(f_name, mode="r", scheme="hdf5") as f_in:
+            res = f_in.child("profiles_1d").find_many(["q", "psi"])
+
+        self.assertTrue(np.allclose(res[0], q))
+        self.assertTrue(np.allclose(res[1], psi))
+
+    def test_aggregate(self):
+        f_name = self.temp_dir / "test_hdf5_aggregate.h5"
+
+        time_slice = [{"time": i * 0.1, "global_quantities": {"ip": float(i % 7)}} for i in range(12)]
+
+        with File(f_name, mode="w", scheme="hdf5") as f_out:
+            f_out.write({"time_slice": time_slice})
+
+        with File(f_name, mode="r", scheme="hdf5") as f_in:
+            entry = f_in.child("time_slice")
+            self.assertEqual(entry.find(Query.tags.reduce, op="max", key="global_quantities/ip"), 6.0)
+            self.assertEqual(entry.find(Query.tags.reduce, op="last", key="time"), time_slice[-1]["time"])
+
+    def test_gather(self):
+        f_name = self.temp_dir / "test_hdf5_gather.h5"
+
+        time_slice = [{"time": i * 0.1, "profiles_1d": {"psi": np.random.rand(10)}} for i in range(12)]
+
+        with File(f_name, mode="w", scheme="hdf5") as f_out:
+            f_out.write({"time_slice": time_slice})
+
+        with File(f_name, mode="r", scheme="hdf5") as f_in:
+            psi = f_in.child("time_slice").gather("*/profiles_1d/psi")
+            time = f_in.child("time_slice").gather("*/time")
+
+        self.assertTrue(np.allclose(psi, np.stack([d["profiles_1d"]["psi"] for d in time_slice])))
+        self.assertTrue(np.allclose(time, [d["time"] for d in time_slice]))
+
+        # 各元素 dtype 不同时按 result_type 分配结果数组
+        with File(f_name, mode="w", scheme="hdf5") as f_out:
+            f_out.write({"time_slice": [{"psi": np.arange(3)}, {"psi": np.arange(3) + 0.5}]})
+
+        with File(f_name, mode="r", scheme="hdf5") as f_in:
+            psi = f_in.child("time_slice").gather("*/psi")
+            self.assertEqual(f_in.child("time_slice").find(Query.tags.reduce, op="max", key="psi"), 2.5)
+
+        self.assertEqual(psi.dtype, np.float64)
+        self.assertTrue(np.allclose(psi, [np.arange(3), np.arange(3) + 0.5]))
+
+    def test_flush(self):
+        f_name = self.temp_dir / "test_hdf5_flush.h5"
+
+        data = {"c": "I'm {age}!", "d": {"g": {"a": 1, "b": 2}}, "h": np.random.random([7, 9])}
+
+        with File(f_name, mode="w", scheme="hdf5") as f_out:
+            f_out.write(data)
+
+            with unittest.mock.patch.object(f_out._doc, "write", wraps=f_out._doc.write) as write:
+                f_out.child("d/g/a").update(10)
+                f_out.child("c").update("changed")
+                f_out.flush()
+                self.assertListEqual(sorted(str(c.args[0]) for c in write.call_args_list), ["c", "d/g/a"])
+
+                write.reset_mock()
+                f_out.flush()
+                write.assert_not_called()
+
+                f_out.child("d/g/b").delete()  # 删除也写入文件
+                f_out.flush()
+                write.assert_not_called()
+
+        with h5py.File(f_name, mode="r") as h5file:
+            self.assertEqual(h5file["d/g"].attrs["a"], 10)
+            self.assertNotIn("b", h5file["d/g"].attrs)
+            self.assertEqual(h5file.attrs["c"], "changed")
+            self.assertTrue(np.allclose(h5file["h"], data["h"]))
+
+    def test_flush_full(self):
+        """不支持按路径写入的文档，有修改时整体写入"""
+        f_name = self.temp_dir / "test_hdf5_flush_full.h5"
+
+        with File(f_name, mode="w", scheme="hdf5") as f_out:
+            with unittest.mock.patch.object(f_out._doc, "_partial_write", False):
+                with unittest.mock.patch.object(f_out._doc, "write") as write:
+                    f_out.update({"a": 1})
+                    f_out.child("b").update(2)
+                    f_out.flush()
+                    write.assert_called_once_with({"a": 1, "b": 2})
+
+                    f_out.flush()
+                    write.assert_called_once()
+
+    def test_key_index(self):
+        f_name = self.temp_dir / "test_hdf5_key_index.h5"
+
+        time_slice = [{"time": i * 0.1, "global_quantities": {"ip": float(i)}} for i in range(5)]
+
+        with File(f_name, mode="w", scheme="hdf5") as f_out:
+            f_out.write({"time_slice": time_slice, "code": {"name": "spdm", "version": "1.0"}})
+
+        with File(f_name, mode="r", scheme="hdf5") as f_in:
+            with unittest.mock.patch.object(f_in._doc, "key_index", wraps=f_in._doc.key_index) as key_index:
+                slices = List[Dict](_entry=f_in.child("time_slice"))
+                code = Dict(_entry=f_in.child("code"))
+
+                self.assertEqual(len(slices), 5)
+                self.assertEqual(len(slices), 5)
+                self.assertListEqual(sorted(code.keys()), ["name", "version"])
+                self.assertListEqual(sorted(code), ["name", "version"])
+                self.assertEqual(key_index.call_count, 2)  # 索引缓存在节点上
+
+                f_in.load()  # 重新载入后失效
+                self.assertEqual(len(slices), 5)
+                self.assertEqual(key_index.call_count, 3)
+
+    def test_read_cache(self):
+        f_name = self.temp_dir / "test_hdf5_read_cache.h5"
+
+        with File(f_name, mode="w", scheme="hdf5") as f_out:
+            f_out.write({f"p{i}": np.full(100, float(i)) for i in range(4)})
+
+        with File(f_name, mode="r", scheme="hdf5", cache={"max_bytes": 2000}) as f_in:
+            cache = f_in._doc.cache
+            cache.pin("p0")
+
+            for i in range(4):
+                self.assertTrue(np.allclose(f_in.child(f"p{i}").get(), i))
+            self.assertTrue(np.allclose(f_in.child("p3").get(), 3))
+            self.assertTrue(np.allclose(f_in.child("p0").get(), 0))
+
+            stats = cache.stats()
+            self.assertEqual((stats["hits"], stats["misses"]), (2, 4))
+            self.assertEqual(stats["evictions"], 2)  # 800 字节的数组只保留两个
+            self.assertLessEqual(stats["nbytes"], 2000)
+            self.assertIn(("p0",), cache._items)  # 固定的数据不被淘汰
+
+        with File(f_name, mode="r", scheme="hdf5", cache={"ttl": 0}) as f_in:
+            f_in.child("p1").get()
+            f_in.child("p1").get()
+            self.assertEqual(f_in._doc.cache.stats()["hits"], 0)  # 已过期，重新读取
+
+    def test_read_cache_policy(self):
+        cache = ReadCache(policy="lfu", max_bytes=3 * 900)
+        for i in range(3):
+            cache.put((f"p{i}",), np.zeros(100))
+        cache.get(("p0",))
+        cache.get(("p0",))
+        cache.get(("p2",))
+        cache.put(("p3",), np.zeros(100))  # p1 使用次数最少
+        self.assertListEqual(sorted(cache._items), [("p0",), ("p2",), ("p3",)])
+        cache.put(("p4",), np.zeros(100))  # p3、p4 使用次数相同，先淘汰较久未用的 p3
+        self.assertListEqual(sorted(cache._items), [("p0",), ("p2",), ("p4",)])
+
+        cache = ReadCache()
+        cache.put(("a", "b"), {"c": 1})
+        cache.put(("a", "d"), 2)
+        cache.put(("e",), 3)
+        self.assertEqual(cache.get(("a", "b", "c")), 1)
+        cache.invalidate(("a", "b", "c"))  # 删除覆盖 key 的前缀
+        self.assertListEqual(sorted(cache._items), [("a", "d"), ("e",)])
+        cache.put(("a",), {"d": 4})  # 替换被覆盖的子路径
+        self.assertListEqual(sorted(cache._items), [("a",), ("e",)])
+        self.assertEqual(cache.get(("a", "d")), 4)
+        self.assertEqual(cache.pop(("a", "d")), (("a",), {"d": 4}))
+        cache.invalidate()
+        self.assertEqual((len(cache), cache.nbytes, cache._below), (0, 0, {}))
+
     def test_write(self):
         f_name = self.temp_dir / "test_hdf5_out.h5"
         with File(f_name, mode="w", scheme="hdf5") as f_out:
@@ -0,0 +1,44 @@
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+import netCDF4 as nc
+import numpy as np
+from spdm.plugins.data.file_netcdf import NetCDFEntry
+
+
+class TestFileNetCDF(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = pathlib.Path(tempfile.mkdtemp())
+        self.psi = np.random.rand(3, 5)
+
+        self.dataset = nc.Dataset(self.temp_dir / "test_netcdf.nc", "w", format="NETCDF4")
+        for i in range(3):
+            grp = self.dataset.createGroup(f"time_slice/{i}")
+            grp.setncattr("ip", float(i))
+            grp.createDimension("n", 5)
+            grp.createVariable("psi", "f8", ("n",))[:] = self.psi[i]
+            for j in range(2):
+                self.dataset.createGroup(f"time_slice/{i}/coil/{j}").setncattr("current", float(i * 10 + j))
+
+    def tearDown(self) -> None:
+        self.dataset.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_gather(self):
+        entry = NetCDFEntry(self.dataset)
+
+        self.assertTrue(np.allclose(entry.gather("time_slice/*/ip"), [0.0, 1.0, 2.0]))
+        self.assertTrue(np.allclose(entry.gather("time_slice/*/psi"), self.psi))
+        self.assertTrue(np.allclose(entry.child("time_slice").gather(["*", "ip"]), [0.0, 1.0, 2.0]))
+
+    def test_gather_fallback(self):
+        entry = NetCDFEntry(self.dataset)
+
+        self.assertEqual(entry.gather("time_slice/1/ip"), 1.0)  # 无通配符
+        self.assertTrue(np.allclose(entry.gather("time_slice/*/coil/*/current"), [[0, 1], [10, 11], [20, 21]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,16 @@
+import gc
+import threading
 import typing
 import unittest
-from copy import deepcopy
+import weakref
+import unittest.mock
+from copy import copy, deepcopy
 
 import numpy as np
 
-from spdm.core.htree import Dict, List, HTreeNode, HTree
+from spdm.core.entry import Entry
+from spdm.core.htree import Dict, List, HTreeNode, HTree, merge_metadata
+from spdm.utils.rwlock import lock_table
 from spdm.utils.tags import _not_found_
 from spdm.utils.logger import logger
 
@@ -65,6 +71,199 @@ class TestHTree(unittest.TestCase):
 
         # self.assertEqual(len(n) == 0)
 
+    def test_get_many(self):
+        d = Dict(deepcopy(test_data))
+        self.assertListEqual(d.get_many(["c", "d/e", "a/2", "b"]), [test_data["c"], test_data["d"]["e"], 1.0, _not_found_])
+
+    def test_gather(self):
+        d = Dict({"time_slice": [{"ip": float(i), "psi": np.arange(3) * i} for i in range(4)]})
+        self.assertListEqual(d.gather("time_slice/*/ip").tolist(), [0.0, 1.0, 2.0, 3.0])
+        self.assertEqual(d.gather("time_slice/*/psi").shape, (4, 3))
+
+    def test_schema(self):
+        class Foo(Dict):
+            a: Dict
+            b: float
+
+        schema = Foo.__schema__()
+        self.assertIs(schema["a"].type_hint, Dict)
+        self.assertTrue(schema["a"].is_node)
+        self.assertFalse(schema["b"].is_node)
+        self.assertIs(List[Dict].__schema__()[None].type_hint, Dict)
+
+        with unittest.mock.patch("typing.get_type_hints", side_effect=AssertionError("reflection at runtime")):
+            foo = Foo({"a": {"x": 1}, "b": 2})
+            self.assertIsInstance(foo["a"], Dict)
+            self.assertEqual(foo["b"], 2.0)
+
+    def test_compact(self):
+        d = Dict[Dict]({"a": {"x": 1}})
+        self.assertFalse(hasattr(d, "__dict__"))
+        self.assertFalse(hasattr(List[Dict]([{}]), "__dict__"))
+        self.assertIsNone(d._entry)
+        self.assertIsNone(d["a"]._entry)
+        self.assertEqual(d["a"]["x"], 1)
+
+        metadata = {"units": "m"}
+        self.assertIs(merge_metadata(None, metadata), merge_metadata(None, metadata))
+        base = {"label": "r"}
+        merged = merge_metadata(base, metadata)
+        self.assertDictEqual(merged, {"label": "r", "units": "m"})
+        metadata["units"] = "cm"  # 原地修改后重新合并
+        self.assertDictEqual(merge_metadata(base, metadata), {"label": "r", "units": "cm"})
+        self.assertDictEqual(merged, {"label": "r", "units": "m"})
+
+        import spdm.core.htree as htree
+
+        for i in range(htree._MERGED_METADATA_MAXSIZE + 10):
+            merge_metadata(None, {"i": i})
+        self.assertLessEqual(len(htree._merged_metadata), htree._MERGED_METADATA_MAXSIZE)
+
+    def test_node_update(self):
+        node = HTreeNode({"a": 1})
+        node.update("a", 2)
+        self.assertDictEqual(node._cache, {"a": 2})
+
+    def test_default_merge(self):
+        default_value = {"p": {"q": 1, "r": 2}, "s": 3}
+        d = Dict({"c": {"p": {"q": 5}}})
+        c = d.__get_node__("c", default_value=default_value)
+        self.assertIs(c.__class__, dict)
+        self.assertDictEqual(c, {"p": {"q": 5, "r": 2}, "s": 3})
+        self.assertDictEqual(d._cache["c"], {"p": {"q": 5, "r": 2}, "s": 3})
+        self.assertDictEqual(default_value, {"p": {"q": 1, "r": 2}, "s": 3})  # 默认值不被修改
+
+    def test_node_cache(self):
+        d = Dict[Dict]({"a": {"x": 1}})
+        a = d.__get_node__("a")
+        self.assertIs(d.__get_node__("a"), a)
+        b = d.__get_node__("a", metadata={"units": "m"})  # 指定参数时不使用缓存
+        self.assertEqual(b._metadata["units"], "m")
+        self.assertEqual(d.__get_node__("b", getter=lambda _: {"y": 2})["y"], 2)
+
+    def test_flush(self):
+        entry = Entry({})
+        d = Dict[Dict]({"a": {"x": 1}, "b": {"y": 2}}, _entry=entry)
+        d.flush()
+        self.assertEqual(entry.child("b/y").get(), 2)
+
+        with unittest.mock.patch.object(Entry, "update", autospec=True, side_effect=Entry.update) as update:
+            d["a"]["x"] = 10
+            d.update("c", 3)
+            d.flush()
+            self.assertListEqual(sorted(str(c.args[0].path) for c in update.call_args_list), ["a/x", "c"])
+
+            update.reset_mock()
+            d.flush()
+            update.assert_not_called()
+
+        self.assertEqual(entry.child("a/x").get(), 10)
+        self.assertEqual(entry.child("c").get(), 3)
+
+    def test_snapshot(self):
+        d = Dict[Dict]({"a": {"x": 1, "y": [1, 2]}, "b": {"z": 2}, "c": {"w": 3}})
+        a = d["a"]
+
+        s = copy(d)
+        self.assertIs(s._cache, d._cache)
+
+        s["a"]["x"] = 10
+        s.update("b/z", 20)
+        s.insert("a/y", 3)
+        self.assertEqual(d["a"]["x"], 1)
+        self.assertEqual(d["b"]["z"], 2)
+        self.assertListEqual(d["a"]["y"], [1, 2])
+        self.assertEqual(s["a"]["x"], 10)
+        self.assertEqual(s["b"]["z"], 20)
+        self.assertListEqual(s["a"]["y"], [1, 2, 3])
+
+        a["x"] = 100  # 快照之前取得的子节点仍属于原树
+        self.assertEqual(d["a"]["x"], 100)
+        self.assertEqual(s["a"]["x"], 10)
+
+        self.assertIs(s._cache["c"], d._cache["c"])  # 未修改的子树共享
+
+        # 读出的 dict/list（非节点）直接修改，不影响另一方
+        d = Dict({"x": {"y": {"z": 1}}, "l": [{"v": 1}]})
+        s = copy(d)
+        s["x"]["y"]["z"] = 7
+        self.assertEqual(d["x"]["y"]["z"], 1)
+        d["x"]["y"]["w"] = 2
+        self.assertNotIn("w", s["x"]["y"])
+        self.assertEqual(s["x"]["y"]["z"], 7)
+
+        l = List({"v": 1} for _ in range(2))
+        s = copy(l)
+        s[0]["v"] = 3
+        l[1]["v"] = 4
+        self.assertListEqual([e["v"] for e in l], [1, 4])
+        self.assertListEqual([e["v"] for e in s], [3, 1])
+
+    def test_weak_parent(self):
+        gc.disable()
+        try:
+            tree = Dict[Dict]({"a": {"x": 1}})
+            child = tree["a"]
+            self.assertIs(child._parent, tree)
+
+            ref = weakref.ref(tree)
+            del tree
+            self.assertIsNone(ref())  # 没有引用循环，由引用计数直接回收
+            self.assertIsNone(child._parent)
+        finally:
+            gc.enable()
+
+    def test_rwlock(self):
+        tree = Dict[Dict]({"a": {"x": 1}, "b": {"y": 2}})
+        a, b = tree["a"], tree["b"]
+        threads = []
+
+        def _blocked(lock) -> bool:
+            done = threading.Event()
+
+            def _run():
+                with lock:
+                    done.set()
+
+            threads.append(threading.Thread(target=_run))
+            threads[-1].start()
+            return not done.wait(0.1)
+
+        with tree.reading():
+            self.assertFalse(_blocked(tree.reading()))
+            self.assertFalse(_blocked(a.reading()))
+            self.assertTrue(_blocked(a.writing()))
+
+        with a.writing():
+            self.assertFalse(_blocked(b.writing()))
+            self.assertTrue(_blocked(a.reading()))
+            self.assertTrue(_blocked(tree.reading()))
+            with a.reading():  # 可重入
+                a["x"] = 2
+
+        for th in threads:
+            th.join()
+
+        self.assertEqual(len(lock_table), 0)
+
+        data = {"a": {"x": 1}, "b": {"y": 2}}
+        with Entry(data, "a").writing():
+            self.assertFalse(_blocked(Entry(data, "b").writing()))
+            self.assertTrue(_blocked(Entry(data).reading()))
+
+        # 没有缓存的根：各自使用独立的锁，缓存重新赋值后锁不变
+        root = Entry()
+        child = root.child("a")
+        with child.writing():
+            self.assertFalse(_blocked(Entry().child("a").writing()))
+            child.update({"x": 1})
+            self.assertTrue(_blocked(root.reading()))
+
+        for th in threads:
+            th.join()
+
+        self.assertEqual(len(lock_table), 0)
+
     def test_type_hint(self):
         d1 = List[Dict]()
 
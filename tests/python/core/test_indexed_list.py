@@ -0,0 +1,89 @@
+import unittest
+import unittest.mock
+
+from spdm.core.htree import Dict, List
+from spdm.core.indexed_list import IndexedList, as_indexed
+from spdm.core.path import Path
+from spdm.core.query import Query
+from spdm.utils.tags import _not_found_
+
+
+class TestIndexedList(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = as_indexed([{"name": f"PF{i}", "time": i * 0.1} for i in range(10)])
+
+    def test_lookup(self):
+        self.assertEqual(self.data.lookup("name", "PF3")["time"], 0.30000000000000004)
+        self.assertIs(self.data.lookup("name", "PF99"), _not_found_)
+        self.assertListEqual(self.data.lookup_all("name", "PF5"), [5])
+
+    def test_floor(self):
+        self.assertEqual(self.data.floor("time", 0.35)["name"], "PF3")
+        self.assertIs(self.data.floor("time", -1.0), _not_found_)
+
+    def test_maintain(self):
+        self.data.lookup("name", "PF0")
+        self.data.append({"name": "PF10"})
+        self.assertListEqual(self.data.lookup_all("name", "PF10"), [10])
+        del self.data[0]
+        self.assertListEqual(self.data.lookup_all("name", "PF10"), [9])
+        self.data[0] = {"name": "PFx"}
+        self.assertEqual(self.data.lookup_all("name", "PFx"), [0])
+        self.data.insert(1, {"name": "PFi"})
+        self.assertListEqual(self.data.lookup_all("name", "PFi"), [1])
+        self.assertListEqual(self.data.lookup_all("name", "PF10"), [10])
+        self.assertEqual(self.data.pop(1)["name"], "PFi")
+        self.data.remove(self.data[0])
+        self.assertListEqual(self.data.lookup_all("name", "PF10"), [8])
+        self.assertListEqual(self.data.lookup_all("name", "PFx"), [])
+        for idx, node in enumerate(self.data):
+            self.assertListEqual(self.data.lookup_all("name", node["name"]), [idx])
+
+        # 原地修改元素后调用 invalidate() 重建索引
+        self.data[1]["name"] = "PFy"
+        self.data.invalidate()
+        self.assertListEqual(self.data.lookup_all("name", "PF3"), [])
+        self.assertListEqual(self.data.lookup_all("name", "PFy"), [1])
+
+    def test_miss(self):
+        self.data.lookup("name", "PF0")
+        with unittest.mock.patch.object(IndexedList, "_linear") as linear, unittest.mock.patch.object(
+            IndexedList, "_build"
+        ) as build:
+            self.assertIs(self.data.lookup("name", "PF99"), _not_found_)  # 索引已建立，未命中不再线性查找
+            self.data.append({"name": "PF99"})
+            del self.data[0]
+            self.assertEqual(self.data.lookup("name", "PF99")["name"], "PF99")  # 修改后不重建索引
+            linear.assert_not_called()
+            build.assert_not_called()
+
+    def test_floor_maintain(self):
+        self.data.floor("time", 0.0)
+        self.data.insert(0, {"name": "PFa", "time": 0.35})
+        del self.data[5]  # PF4
+        self.assertEqual(self.data.floor("time", 0.45)["name"], "PFa")
+        self.assertEqual(self.data.floor("time", 0.55)["name"], "PF5")
+
+    def test_path(self):
+        self.assertEqual(Path("PF4/time").get(self.data), 0.4)
+        plain = [dict(d) for d in self.data]
+        query = Query({"name": "PF6"})
+        self.assertEqual(Path([query, "time"]).get(self.data), Path([query, "time"]).get(plain))
+        Path("PF7/current").update(self.data, 1.0)
+        self.assertEqual(self.data[7]["current"], 1.0)
+        self.assertIsInstance(self.data, IndexedList)
+
+        Path(300).update(self.data, {"name": "PF300"})  # 稀疏扩展时保持 IndexedList
+        self.assertIsInstance(self.data, IndexedList)
+        self.assertEqual(self.data.lookup("name", "PF300"), {"name": "PF300"})
+
+    def test_htree_list(self):
+        coils = List[Dict]()
+        self.assertIsInstance(coils._cache, IndexedList)
+        for i in range(5):
+            coils.append({"name": f"PF{i}", "current": float(i)})
+        self.assertEqual(coils["PF3"]["current"], 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
-from copy import deepcopy
-from spdm.core.path import Path, Query
+from copy import copy, deepcopy
+from spdm.core.path import Path, Query, compile_path
 from spdm.utils.tags import _not_found_
 
 
@@ -22,6 +22,35 @@ class TestPath(unittest.TestCase):
         # self.assertEqual(Path._parser("a[1:10:-3]/h"),       ["a", slice(1, 10, -3), "h"])
         # self.assertEqual(Path._parser("a[1:10:-3]/$next"),   ["a", slice(1, 10, -3), Path.tags.next])
 
+    def test_parser_cache(self):
+        p0 = Path("a/b/c/0")
+        p0.append("d")
+        self.assertEqual(Path("a/b/c/0")[:], ["a", "b", "c", 0])
+
+        q0 = Path("a[{'name':'x'}]/h")
+        q1 = Path("a[{'name':'x'}]/h")
+        self.assertIsInstance(q0[1], Query)
+        self.assertIsNot(q0[1], q1[1])
+
+    def test_compile(self):
+        accessor = Path("d/e").compile()
+        self.assertEqual(accessor(self.data), self.data["d"]["e"])
+        self.assertEqual(Path("a/1").compile()(self.data), self.data["a"][1])
+        self.assertEqual(Path("d/k").compile()(self.data, default_value=None), None)
+        self.assertEqual(compile_path("a")(self.data, Query.count), 6)
+        self.assertIs(compile_path("d/f"), compile_path("d/f"))
+
+    def test_frozen(self):
+        p0 = Path("a/b").freeze()
+        p1 = p0 / "c"
+        self.assertEqual(p0[:], ["a", "b"])
+        self.assertEqual(p1[:], ["a", "b", "c"])
+        self.assertIs(copy(p0), p0)
+        self.assertEqual(hash(p1), hash(Path("a/b/c")))
+        self.assertEqual(str(p1.parent), "a/b")
+        with self.assertRaises(TypeError):
+            p0[0] = "x"
+
     def test_append(self):
         p = Path()
         p.append("a/b/c")
@@ -45,6 +74,58 @@ class TestPath(unittest.TestCase):
         self.assertEqual(Path("d/k"     ).get(self.data, default_value=None), None)
         # fmt:on
 
+    def test_find_fast_path(self):
+        cache = {"a": [{"b": 1}, {"b": 2}], "n": None, 1: "one"}
+        self.assertEqual(Path("a/1/b").find(cache), 2)
+        self.assertEqual(Path("a/5/b").find(cache, default_value=0), 0)
+        self.assertEqual(Path(["n", "b"]).find(cache), None)
+        self.assertEqual(Path([1]).find(cache), "one")
+
+    def test_descendants(self):
+        cache = {"a": {"b": 1, "x": {"b": 3}}, "c": [1, {"b": 2}]}
+
+        self.assertEqual(len([*Path("**").search(cache)]), 8)
+        self.assertListEqual([*Path("**/b").search(cache)], [1, 3, 2])
+        self.assertListEqual([*Path("**/b").search(cache, max_depth=1)], [1])
+        self.assertListEqual([*Path("**/b").search(cache, prune=lambda p, n: p[0] == "c")], [1, 3])
+
+        deep = leaf = {}
+        for _ in range(5000):
+            leaf["n"] = {}
+            leaf = leaf["n"]
+        self.assertEqual(len([*Path("**").search(deep)]), 5000)
+
+    def test_find_many_trie(self):
+        cache = {
+            "time_slice": [
+                {"profiles_1d": {"psi": [1, 2], "q": [3, 4]}},
+                {"profiles_1d": {"psi": [5, 6], "q": [7, 8]}},
+            ]
+        }
+        res = Path.find_many(
+            cache,
+            ["time_slice/1/profiles_1d/q", "time_slice/1/profiles_1d/psi", "time_slice/0/profiles_1d/psi/1", "x/y"],
+            default_value=None,
+        )
+        self.assertListEqual(res, [[7, 8], [5, 6], 2, None])
+        self.assertListEqual(Path.find_many(cache, ["time_slice", "time_slice/0"], Query.count), [2, 1])
+
+    def test_gather(self):
+        cache = {"time_slice": [{"ip": 1.0, "psi": [1, 2]}, {"psi": [5, 6]}, {"ip": 3.0, "psi": [7, 8, 9]}]}
+
+        ip = Path("time_slice/*/ip").gather(cache)
+        self.assertEqual(ip.shape, (3,))
+        self.assertEqual(ip[2], 3.0)
+        self.assertTrue(ip[1] != ip[1])  # nan
+
+        self.assertListEqual(Path(["time_slice", slice(0, 2), "psi"]).gather(cache).tolist(), [[1, 2], [5, 6]])
+
+        psi = Path("time_slice/*/psi").gather(cache)
+        self.assertEqual(psi.dtype, object)
+        self.assertListEqual(psi[2], [7, 8, 9])
+
+        self.assertIsNone(Path("coil/*/current").gather(cache, default_value=None))
+
     def test_get_many(self):
         cache = deepcopy(self.data)
 
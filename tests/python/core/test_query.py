@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from spdm.core.query import Query
+from spdm.core.path import Path
+from spdm.utils.tags import _not_found_
+
+
+class TestQuery(unittest.TestCase):
+    data = [
+        {"name": "PF1", "time": 0.1, "current": {"data": 1.0}},
+        {"name": "PF2", "time": 0.2, "current": {"data": 2.0}},
+        {"name": "PF3", "time": 0.3, "current": {"data": 3.0}},
+    ]
+
+    def test_check(self):
+        self.assertTrue(Query({"name": "PF1"}).check(self.data[0]))
+        self.assertFalse(Query({"name": "PF1"}).check(self.data[1]))
+        self.assertTrue(Query({"time": {"$gt": 0.15, "$le": 0.2}}).check(self.data[1]))
+        self.assertTrue(Query({"current": {"data": 3.0}}).check(self.data[2]))
+        self.assertTrue(Query({"current/data": {"$ge": 2.0}}).check(self.data[1]))
+        self.assertFalse(Query({"voltage": {"$gt": 0}}).check(self.data[1]))
+        self.assertTrue(Query({"@id": "a"}).check({"@id": "a"}))
+        self.assertTrue(Query(Query.tags.exists).check(1))
+        self.assertFalse(Query(Query.tags.exists).check(_not_found_))
+
+    def test_mask(self):
+        q = Query({"time": {"$ge": 0.2}})
+        self.assertListEqual(q.mask(self.data).tolist(), [False, True, True])
+        self.assertListEqual(q.filter(self.data), self.data[1:])
+
+        self.assertIsNone(Query({"current": {"data": 3.0}}).mask(self.data))
+        self.assertListEqual(Query({"current": {"data": 3.0}}).filter(self.data), self.data[2:])
+
+        columns = {"time": np.array([0.1, 0.2, 0.3]), "ip": np.array([1.0, 2.0, 3.0])}
+        res = Query({"time": {"$lt": 0.25}, "ip": {"$ne": 1.0}}).filter(columns)
+        self.assertTrue(np.allclose(res["ip"], [2.0]))
+
+        names = [{"name": "a"}, {"name": "b"}]  # 不可比较的类型，与逐个元素判断的结果一致
+        self.assertIsNone(Query({"name": {"$lt": 3}}).mask(names))
+        self.assertListEqual(Query({"name": {"$lt": 3}}).filter(names), [])
+        self.assertListEqual(Query({"name": {"$lt": 3}}).filter({"name": np.array(["a", "b"])})["name"].tolist(), [])
+
+    def test_path(self):
+        self.assertEqual(Path(["coil", {"time": {"$gt": 0.15}}, "name"]).find({"coil": self.data}), "PF2")
+        self.assertListEqual([*Path(["coil", {"time": {"$gt": 0.15}}, "name"]).search({"coil": self.data})], ["PF2", "PF3"])
+
+    def test_reduce(self):
+        coil = Path("coil")
+        target = {"coil": self.data + [{"name": "PF1", "time": 0.4, "current": {"data": 4.0}}]}
+        self.assertEqual(coil.find(target, Query.tags.reduce, op="max", key="current/data"), 4.0)
+        self.assertEqual(coil.find(target, Query.tags.reduce, op="count"), 4)
+        self.assertEqual(coil.find(target, Query.tags.count), 4)
+        self.assertDictEqual(
+            coil.find(target, Query.tags.reduce, op="sum", key="current/data", group_by="name"),
+            {"PF1": 5.0, "PF2": 2.0, "PF3": 3.0},
+        )
+        self.assertEqual(Path("voltage").find(target, Query.tags.reduce, op="max", default_value=0), 0)
+
+        columns = {"time": np.array([0.1, 0.2, 0.3]), "ip": np.array([1.0, 3.0, 2.0])}
+        self.assertEqual(Path().find(columns, Query.tags.reduce, op="argmax", key="ip"), 1)
+
+        rows = [{"ip": 1}, {"x": 0}, {"ip": 5}, {"ip": 3}]  # 缺失值不参与计算，序号对应原来的元素
+        self.assertEqual(Path().find(rows, Query.tags.reduce, op="argmax", key="ip"), 2)
+        self.assertEqual(Path().find(rows, Query.tags.reduce, op="argmin", key="ip"), 0)
+
+        names = [{"name": "PF2"}, {"name": "PF1"}]
+        self.assertEqual(Path().find(names, Query.tags.reduce, op="min", key="name"), "PF1")
+        self.assertEqual(Path().find(names, Query.tags.reduce, op="sum", key="name", default_value=None), None)
+
+    def test_sort(self):
+        res = Path("coil").find({"coil": self.data}, Query.tags.sort, key="time", reverse=True)
+        self.assertListEqual([d["name"] for d in res], ["PF3", "PF2", "PF1"])
+
+        columns = {"time": np.array([0.3, 0.1, 0.2]), "ip": np.array([3.0, 1.0, 2.0])}
+        res = Path().find(columns, Query.tags.sort, key="time")
+        self.assertListEqual(res["ip"].tolist(), [1.0, 2.0, 3.0])
+
+        res = Path().find({"k": np.array([0, 2, 1], dtype=np.uint8)}, Query.tags.sort, key="k", reverse=True)
+        self.assertListEqual(res["k"].tolist(), [2, 1, 0])
+
+        flags = [{"f": False, "i": 0}, {"f": True, "i": 1}, {"f": False, "i": 2}, {"f": True, "i": 3}]
+        res = Path().find(flags, Query.tags.sort, key="f", reverse=True)
+        self.assertListEqual([d["i"] for d in res], [1, 3, 0, 2])  # 稳定排序
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import pickle
+import unittest
+
+from spdm.core.htree import List
+from spdm.core.path import Path
+from spdm.core.sparse_list import SparseList
+from spdm.utils.tags import _not_found_
+
+
+class TestSparseList(unittest.TestCase):
+    def test_sequence(self):
+        d = SparseList([1, _not_found_, 3], length=5)
+        self.assertEqual(len(d), 5)
+        self.assertListEqual(list(d), [1, _not_found_, 3, _not_found_, _not_found_])
+        self.assertEqual(d, [1, _not_found_, 3, _not_found_, _not_found_])
+        self.assertEqual(d[-3], 3)
+
+        d[4] = 5
+        del d[0]
+        d.insert(0, 0)
+        self.assertEqual(d, [0, _not_found_, 3, _not_found_, 5])
+        self.assertListEqual([*d.items()], [(0, 0), (2, 3), (4, 5)])
+
+        with self.assertRaises(IndexError):
+            d[5] = 1
+
+        self.assertEqual(pickle.loads(pickle.dumps(d)), d)
+
+    def test_path(self):
+        cache = Path("time_slice/1000000/time").update({}, 1.0)
+        self.assertIsInstance(cache["time_slice"], SparseList)
+        self.assertEqual(len(cache["time_slice"]), 1000001)
+        self.assertEqual(Path("time_slice/1000000/time").get(cache), 1.0)
+        self.assertIs(Path("time_slice/10").get(cache), _not_found_)
+
+        # 稠密写入仍然使用 list
+        self.assertIsInstance(Path([3]).update([0], 1), list)
+
+        d = List([1, 2])
+        d[100000] = 3
+        self.assertEqual(len(d), 100001)
+        self.assertEqual(d[100000], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,13 @@
+import gc
 import unittest
+import unittest.mock
 import typing
+from copy import copy, deepcopy
 import numpy as np
+from spdm.core.entry import Entry
 from spdm.core.htree import List, Dict
-from spdm.core.sp_tree import SpTree, sp_property, Dataclass
+from spdm.core.sp_tree import SpTree, sp_property, annotation, Dataclass, AttributeTree
+from spdm.core.sp_object import SpObject
 
 from spdm.utils.tags import _not_found_
 from spdm.utils.logger import logger
@@ -83,12 +88,135 @@ class TestSpTree(unittest.TestCase):
 
         self.assertEqual(d.foo.a, d._cache["foo"].a)
 
+    def test_node_cache(self):
+        eq = Eq(deepcopy(eq_data))
+        grid = eq.time_slice[0].profiles_2d.grid
+        self.assertIs(eq.time_slice[0].profiles_2d.grid, grid)
+
+        eq.time_slice[0].profiles_2d.grid = {"dim1": 3}
+        self.assertEqual(eq.time_slice[0].profiles_2d.grid.dim1, 3)
+
+        del eq.time_slice[0].profiles_2d.grid
+        self.assertIsNot(eq.time_slice[0].profiles_2d.grid, grid)
+
+        tree = AttributeTree({"a": {"b": 1}})
+        node = tree.a
+        self.assertIs(tree.a, node)
+        del node
+        gc.collect()
+        self.assertEqual(len(tree._node_cache), 0)
+
+    def test_snapshot(self):
+        eq = Eq(deepcopy(eq_data))
+        grid = eq.time_slice[0].profiles_2d.grid  # 复制前已取得的子节点
+        mesh = EquilibriumProfiles2d({"grid": {"dim1": 1}})
+        mesh_grid = mesh.grid
+
+        other = copy(mesh)
+        self.assertIsNot(other.grid, mesh_grid)
+        other.grid.dim1 = 5
+        self.assertEqual(other.grid.dim1, 5)
+        self.assertEqual(mesh.grid.dim1, 1)
+        self.assertIs(mesh.grid, mesh_grid)
+
+        time_slice = copy(eq.time_slice[0])
+        time_slice.profiles_2d.grid.dim1 = 7
+        self.assertEqual(grid.dim1, 129)
+        self.assertEqual(eq.time_slice[0].profiles_2d.grid.dim1, 129)
+
+    def test_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from spdm.core.sp_tree import _InstanceLock
+
+        slices = [EqTimeSlice({"profiles_2d": {"grid": {"dim1": i}}}) for i in range(4)]
+
+        def _read(time_slice):
+            return [time_slice.profiles_2d.grid for _ in range(100)]
+
+        with ThreadPoolExecutor(8) as pool:
+            res = list(pool.map(_read, slices * 4))
+
+        for time_slice, nodes in zip(slices * 4, res):
+            grid = time_slice.profiles_2d.grid
+            self.assertTrue(all(node is grid for node in nodes))  # 每个实例的子节点只创建一次
+
+        self.assertEqual(len(_InstanceLock._locks), 0)
+
+    def test_prefetch(self):
+        class Quantities(SpTree):
+            ip: float = annotation(prefetch=True)
+            li_3: float = annotation(prefetch=True)
+            beta_pol: float
+
+        class Slice(SpTree):
+            time: float = annotation(prefetch=True)
+            global_quantities: Quantities = annotation(prefetch=True)
+            profiles: Dict = annotation(prefetch=["psi"])
+
+        self.assertListEqual(
+            [str(p) for p in Slice.__prefetch__()],
+            ["time", "global_quantities/ip", "global_quantities/li_3", "profiles/psi"],
+        )
+
+        data = {"slice": {"time": 1.0, "global_quantities": {"ip": 2.0, "li_3": 3.0, "beta_pol": 4.0}, "profiles": {"psi": 5.0}}}
+
+        class Root(SpTree):
+            slice: Slice
+
+        root = Root(_entry=Entry(data))
+
+        with unittest.mock.patch.object(Entry, "find_many", autospec=True, side_effect=Entry.find_many) as find_many:
+            node = root.slice
+            find_many.assert_called_once()
+            self.assertEqual(len(find_many.call_args.args[1]), 4)
+
+            with unittest.mock.patch.object(Entry, "find", side_effect=AssertionError("lazy read")):
+                self.assertEqual(node.time, 1.0)
+                self.assertEqual(node.global_quantities.ip, 2.0)
+
+            self.assertEqual(node.global_quantities.beta_pol, 4.0)
+            self.assertEqual(find_many.call_count, 1)
+
+        root.fetch(["slice/profiles/psi"])
+        self.assertEqual(root._cache["slice"]["profiles"]["psi"], 5.0)
+
     def test_default_value(self):
 
         d = Doo()
         self.assertEqual(d.goo.value, 3.14)
         self.assertEqual(d._cache["goo"].value, 3.14)
 
+    def test_default_overlay(self):
+        d0, d1 = Doo(), Doo()
+        d0.goo.value = 1.0
+        self.assertEqual(d0.goo.value, 1.0)
+        self.assertEqual(d1.goo.value, 3.14)
+        self.assertDictEqual(Doo.goo.default_value, {"value": 3.14})  # 默认值不复制，也不被修改
+
+        class Obj(SpObject):
+            grid: Mesh
+            label: str
+
+        base = {"grid": {"dim1": 10}, "label": "base"}
+        obj = Obj(base, {"grid": {"dim2": 20}}, label="kw")
+        self.assertEqual((obj.label, obj.grid.dim1, obj.grid.dim2), ("kw", 10, 20))
+
+        obj.grid.dim1 = 5
+        self.assertEqual(obj.grid.dim1, 5)
+        self.assertDictEqual(base, {"grid": {"dim1": 10}, "label": "base"})  # 参数作为只读的覆盖层
+
+        class Foo(SpObject):
+            a: dict
+            b: int
+
+        first, second = {"a": {"x": 10, "y": {"u": 1}}, "b": 1}, {"a": {"z": 3, "y": {"v": 2}}}
+        foo = Foo(first, second)
+        self.assertDictEqual(foo.a, {"x": 10, "y": {"u": 1, "v": 2}, "z": 3})  # 重叠的参数逐层合并
+        self.assertEqual(foo.b, 1)
+        self.assertEqual(Foo({"b": 1}, {"b": 2}).b, 2)  # 后面的参数优先
+        self.assertDictEqual(first, {"a": {"x": 10, "y": {"u": 1}}, "b": 1})
+        self.assertDictEqual(second, {"a": {"z": 3, "y": {"v": 2}}})
+
     def test_get_list(self):
         cache = {
             "foo_list": [